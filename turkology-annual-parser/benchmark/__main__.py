@@ -0,0 +1,43 @@
+import argparse
+import importlib
+import os
+
+BENCHMARKS = [
+    'wmlparser',
+    'transport',
+    'citation_parsing',
+    'keyword_matching',
+    'type_detection',
+    'author_matching',
+    'reference_parsing',
+    'keyword_normalization',
+    'domain_objects',
+    'json_writing',
+    'serialization',
+    'columnar_loading',
+    'export_bundle',
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run performance benchmarks')
+    parser.add_argument(
+        '--data-dir',
+        default=os.path.join(os.path.dirname(__file__), '../../ta-data'),
+        help='Directory containing the keyword file and the ocr/ directory'
+    )
+    parser.add_argument(
+        'benchmarks', nargs='*', metavar='benchmark',
+        help=f'Benchmarks to run (default: all of {", ".join(BENCHMARKS)})'
+    )
+    args = parser.parse_args()
+    unknown_benchmarks = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown_benchmarks:
+        parser.error(f'unknown benchmarks: {", ".join(sorted(unknown_benchmarks))}')
+    for benchmark_name in args.benchmarks or BENCHMARKS:
+        benchmark = importlib.import_module(f'benchmark.{benchmark_name}')
+        benchmark.run(args.data_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import random
+import re
+import time
+from typing import Set
+
+import regex
+
+from benchmark.helpers import print_table
+from bootstrap.author_matching import KnownAuthorMatcher
+
+AUTHOR_SET_SIZES = [100, 1000, 5000]
+NUMBER_OF_TEXTS = 2000
+LAST_NAMES = [
+    'Kreiser', 'Handžić', 'Bazin', 'Landau', 'Özeğe', 'Eren', 'Kakük', 'Yıldız', 'İnalcık',
+    'Scharlipp', 'Diem', 'Majer', 'Tekin', 'Doerfer', 'Baysal', 'Uçankuş', 'Gökbilgin',
+]
+FIRST_NAMES = [
+    'Klaus', 'Adem', 'Louis', 'Jacob M', 'Seyfettin', 'İsmail', 'Zsuzsa', 'Hanna', 'Halil',
+    'Wolfgang-E', 'Werner', 'Hans Georg', 'Talat', 'Gerhard', 'Jale', 'Hasan T', 'Işık',
+]
+TITLE = 'Lexikon der islamischen Welt. Stuttgart, 1974, 240 S.'
+
+
+def make_authors(rng: random.Random, number_of_authors: int):
+    authors: Set[str] = set()
+    while len(authors) < number_of_authors:
+        suffix = str(len(authors)) if len(authors) >= len(LAST_NAMES) * len(FIRST_NAMES) else ''
+        authors.add(f'{rng.choice(LAST_NAMES)}{suffix}, {rng.choice(FIRST_NAMES)}')
+    return list(authors)
+
+
+def make_texts(rng: random.Random, authors):
+    texts = []
+    for _ in range(NUMBER_OF_TEXTS):
+        author = rng.choice(authors)
+        if rng.random() < 0.5:
+            position = rng.randrange(len(author))
+            author = author[:position] + 'x' + author[position + 1:]
+        texts.append(rng.choice([author, 'Über', '']) + '  ' + TITLE)
+    return texts
+
+
+def match_with_regexes(authors, texts):
+    known_authors_pattern = '|'.join([re.escape(author.strip().lower()) for author in authors])
+    multiple_authors_pattern = regex.compile(
+        f'^({known_authors_pattern}){{e<=1}}(?: +(?:—|-) '
+        fr'+({known_authors_pattern}){{e<=1}})+\.?\s+(\p{{Lu}}[^ .]+ .+)',
+        regex.UNICODE | regex.IGNORECASE | regex.DOTALL
+    )
+    single_author_pattern = regex.compile(
+        r'^({}){{e<=1}}\.?\s+(\p{{Lu}}[^ .]+ )'.format(known_authors_pattern),
+        regex.UNICODE | regex.IGNORECASE
+    )
+    return sum(
+        1 for text in texts
+        if multiple_authors_pattern.findall(text) or single_author_pattern.search(text)
+    )
+
+
+def match_with_trie(authors, texts):
+    matcher = KnownAuthorMatcher(authors)
+    return sum(
+        1 for text in texts
+        if matcher.find_multiple_authors(text) or matcher.find_single_author(text)
+    )
+
+
+def run(data_dir: str):
+    rng = random.Random(0)
+    rows = []
+    for number_of_authors in AUTHOR_SET_SIZES:
+        authors = make_authors(rng, number_of_authors)
+        texts = make_texts(rng, authors)
+        matches = []
+        for engine, match in (('fuzzy regex', match_with_regexes), ('trie', match_with_trie)):
+            start = time.perf_counter()
+            matches.append(match(authors, texts))
+            duration = time.perf_counter() - start
+            rows.append([engine, number_of_authors, len(texts), matches[-1], duration])
+        assert matches[0] == matches[1], 'Engines disagree'
+    print_table(
+        'Known author matching (incl. building the matcher)',
+        ['engine', 'authors', 'texts', 'matches', 'duration (s)'],
+        rows
+    )
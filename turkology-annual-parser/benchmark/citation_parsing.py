@@ -0,0 +1,45 @@
+import time
+from dataclasses import replace
+
+from benchmark.helpers import SYNTHETIC_CITATIONS, print_table
+from citation.citation_parsing import (
+    PARSING_STEPS, number_rest_pattern, parse_citations, pipeline
+)
+from domain.intermediate_citation import IntermediateCitation
+
+SAMPLE_CITATIONS = SYNTHETIC_CITATIONS + [
+    'Kakük, Zsuzsa   Cultural words from the Turkish occupation of Hungary. Budapest, 1977, '
+    '74 S., 2 Karten. (Studia Turco-Hungarica, 4).',
+    'Acta Orientalia Academiae Scientiarum Hungaricae, 27-28. Budapest, 1973-1974.',
+    'Türk Dili Kurultayı. Ankara, 12. IX. 1972.',
+    'Landau, Jacob M.   Radical politics in modern Turkey. Leiden, 1974, XII+302 S. '
+    '[s. TA 1.123]',
+]
+REPETITIONS = 2000
+
+
+def parse_citations_copying(citations):
+    """parse_citations() as it was before, copying the frozen citation in every step"""
+    for citation in citations:
+        number, remaining_text = number_rest_pattern.match(citation.raw_text).groups()
+        citation = replace(citation, number=number, remaining_text=remaining_text)
+        yield pipeline(lambda: citation, *PARSING_STEPS)
+
+
+def run(data_dir: str):
+    rows = []
+    for name, parse in (('copying', parse_citations_copying), ('parse context', parse_citations)):
+        citations = [
+            IntermediateCitation(volume=99, raw_text=f'{number}. {text}')
+            for number, text in enumerate(SAMPLE_CITATIONS * REPETITIONS, start=1)
+        ]
+        start = time.perf_counter()
+        for _ in parse(citations):
+            pass
+        duration = time.perf_counter() - start
+        rows.append([name, len(citations), duration, len(citations) / duration])
+    print_table(
+        'Citation parsing (parse_citations)',
+        ['', 'citations', 'duration (s)', 'citations/s'],
+        rows
+    )
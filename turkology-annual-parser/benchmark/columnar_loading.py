@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+
+from benchmark.helpers import find_ocr_files, print_table, write_synthetic_volume
+from keywords import get_keyword_mapping
+from pipeline import run_isolated_pipeline_on_volume
+from repositories.ColumnarRepository import ColumnarRepository
+from repositories.JsonRepository import JsonRepository
+from repositories.columnar import NULL_INT, ColumnarFile
+
+SYNTHETIC_VOLUME_SIZE = 20000
+CORPUS_SIZE = 80000  # About the number of citations in all volumes
+
+
+def run(data_dir: str):
+    keyword_mapping = get_keyword_mapping(os.path.join(data_dir, 'keywords.csv'))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        volumes = find_ocr_files(data_dir) or [
+            write_synthetic_volume(temp_dir, SYNTHETIC_VOLUME_SIZE)
+        ]
+        citations = [
+            citation
+            for volume in volumes
+            for citation in run_isolated_pipeline_on_volume(volume, keyword_mapping).citations
+        ]
+        citations = (citations * (CORPUS_SIZE // len(citations) + 1))[:CORPUS_SIZE]
+        json_filename = os.path.join(temp_dir, 'ta.json')
+        columnar_filename = os.path.join(temp_dir, 'ta.tacol')
+        JsonRepository(json_filename).write_citations(citations)
+        ColumnarRepository(columnar_filename).write_citations(citations)
+
+        rows = []
+        results = []
+        for name, count, filename in (
+                ('json', count_by_year_and_keyword_from_json, json_filename),
+                ('columnar', count_by_year_and_keyword_from_columnar, columnar_filename),
+        ):
+            start = time.perf_counter()
+            results.append(count(filename))
+            duration = time.perf_counter() - start
+            rows.append([name, len(citations), os.path.getsize(filename) / 1024 / 1024, duration])
+    assert results[0] == results[1], 'Counts differ'
+    print_table(
+        'Counting citations by year and by keyword',
+        ['', 'citations', 'file size (MB)', 'duration (s)'],
+        rows
+    )
+
+
+def count_by_year_and_keyword_from_json(filename):
+    with open(filename) as json_file:
+        citations = json.load(json_file)
+    years = Counter(
+        year for year in map(_year_published, citations) if year is not None
+    )
+    keyword_codes = Counter(
+        keyword['code'] for citation in citations
+        for keyword in citation['keywords'] if keyword.get('code')
+    )
+    return years, keyword_codes
+
+
+def count_by_year_and_keyword_from_columnar(filename):
+    with ColumnarFile(filename) as columnar_file:
+        years = Counter(columnar_file.column('year'))
+        del years[NULL_INT]
+        return years, columnar_file.column('keyword_codes').value_counts()
+
+
+def _year_published(citation):
+    """Like repositories.citation_fields.year_published() for a citation read from JSON"""
+    year = citation.get('datePublished', {}).get('year')
+    if year is None:
+        published_in = citation.get('publishedIn', {})
+        year = published_in.get('year', published_in.get('yearStart'))
+    return year
@@ -0,0 +1,84 @@
+import os
+import pickle
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field, fields, replace
+
+from benchmark.helpers import find_ocr_files, print_table, write_synthetic_volume
+from citation.assembly import assemble_citations
+from citation.citation_parsing import parse_citations
+from citation.field_parsing import parse_citation_fields
+from keywords import get_keyword_mapping
+from paragraph.paragraph_correction import correct_paragraphs
+from paragraph.paragraph_extraction import extract_paragraphs
+from paragraph.type_detection import detect_paragraph_types
+
+SYNTHETIC_VOLUME_SIZE = 20000
+REPLACEMENTS = 12  # About the number of parsing steps replacing each citation
+
+
+def run(data_dir: str):
+    keyword_mapping = get_keyword_mapping(os.path.join(data_dir, 'keywords.csv'))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        volumes = find_ocr_files(data_dir) or [
+            write_synthetic_volume(temp_dir, SYNTHETIC_VOLUME_SIZE)
+        ]
+        paragraphs, intermediate_citations, citations = [], [], []
+        for volume in volumes:
+            volume_paragraphs = list(detect_paragraph_types(
+                correct_paragraphs(extract_paragraphs(volume)), keyword_mapping
+            ))
+            volume_intermediate_citations = list(
+                parse_citations(assemble_citations(volume_paragraphs))
+            )
+            paragraphs.extend(volume_paragraphs)
+            intermediate_citations.extend(volume_intermediate_citations)
+            citations.extend(parse_citation_fields(volume_intermediate_citations))
+    rows = []
+    for objects in (paragraphs, intermediate_citations, citations):
+        slots_class = type(objects[0])
+        dict_class = without_slots(slots_class)
+        for name, cls in (('__dict__', dict_class), ('__slots__', slots_class)):
+            rows.append([
+                slots_class.__name__, name, len(objects), *measure_class(cls, objects)
+            ])
+    print_table(
+        'Domain objects with __dict__ (before) vs. __slots__ (after)',
+        ['class', 'storage', 'objects', 'bytes/object', 'replace (µs)', 'pickled (bytes/object)'],
+        rows
+    )
+
+
+def measure_class(cls, objects):
+    values = [
+        {field_.name: getattr(obj, field_.name) for field_ in fields(obj)} for obj in objects
+    ]
+    # Only the objects themselves are measured, their field values are shared
+    tracemalloc.start()
+    instances = [cls(**object_values) for object_values in values]
+    bytes_per_object = tracemalloc.get_traced_memory()[0] / len(instances)
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for instance in instances:
+        for _ in range(REPLACEMENTS):
+            instance = replace(instance, volume=instance.volume)
+    replace_microseconds = (time.perf_counter() - start) / len(instances) / REPLACEMENTS * 1e6
+    pickled_bytes = len(pickle.dumps(instances, protocol=pickle.HIGHEST_PROTOCOL))
+    return bytes_per_object, replace_microseconds, pickled_bytes / len(instances)
+
+
+def without_slots(slots_class):
+    """Return a frozen dataclass with the same fields as `slots_class`, but without slots"""
+    namespace = {
+        '__annotations__': {field_.name: field_.type for field_ in fields(slots_class)},
+        '__module__': __name__,
+    }
+    for field_ in fields(slots_class):
+        namespace[field_.name] = field(
+            default=field_.default, default_factory=field_.default_factory
+        )
+    dict_class = dataclass(frozen=True)(type(slots_class.__name__, (), namespace))
+    globals()[slots_class.__name__] = dict_class  # For pickling
+    return dict_class
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import time
+import zipfile
+from os.path import basename
+
+from benchmark.helpers import find_ocr_files, print_table, write_synthetic_volume
+from export import ExportBundle
+from keywords import get_keyword_mapping
+from pipeline import run_isolated_pipeline_on_volume
+from repositories.JsonRepository import JsonRepository
+
+SYNTHETIC_VOLUME_SIZE = 20000
+CORPUS_SIZE = 80000  # About the number of citations in all volumes
+
+
+def run(data_dir: str):
+    keyword_mapping = get_keyword_mapping(os.path.join(data_dir, 'keywords.csv'))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        volumes = find_ocr_files(data_dir) or [
+            write_synthetic_volume(temp_dir, SYNTHETIC_VOLUME_SIZE)
+        ]
+        citations = [
+            citation
+            for volume in volumes
+            for citation in run_isolated_pipeline_on_volume(volume, keyword_mapping).citations
+        ]
+        citations = (citations * (CORPUS_SIZE // len(citations) + 1))[:CORPUS_SIZE]
+
+        rows = []
+        contents = []
+        for name, write, options in (
+                ('before', write_bundle_before, {}),
+                ('streaming', write_bundle, {'codec': 'deflate', 'level': 9}),
+                ('streaming', write_bundle, {'codec': 'deflate', 'level': 6}),
+                ('streaming', write_bundle, {'codec': 'bzip2', 'level': 9}),
+        ):
+            json_filename = os.path.join(temp_dir, 'ta.json')
+            zip_filename = os.path.join(temp_dir, 'ta.zip')
+            start = time.perf_counter()
+            write(citations, json_filename, zip_filename, **options)
+            duration = time.perf_counter() - start
+            rows.append([
+                name, options.get('codec', 'deflate'), options.get('level', 9), len(citations),
+                duration, os.path.getsize(zip_filename) / 1024 / 1024
+            ])
+            with zipfile.ZipFile(zip_filename) as zip_file:
+                contents.append({name: zip_file.read(name) for name in zip_file.namelist()})
+    assert all(content == contents[0] for content in contents), 'Bundled files differ'
+    print_table(
+        'Writing JSON, JSON lines and the export bundle',
+        ['', 'codec', 'level', 'citations', 'duration (s)', 'bundle (MB)'],
+        rows
+    )
+
+
+def write_bundle(citations, json_filename, zip_filename, codec, level):
+    with ExportBundle(zip_filename, codec, level) as export_bundle:
+        export_bundle.add_files(
+            JsonRepository(json_filename, export_bundle.open).write_citations(citations)
+        )
+
+
+def write_bundle_before(citations, json_filename, zip_filename):
+    """Writing the output files, then export.create_zip_file() as it was before streaming"""
+    dump_file_names = JsonRepository(json_filename).write_citations(citations)
+    with zipfile.ZipFile(
+            zip_filename, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=9
+    ) as zip_file_handle:
+        for dump_file_name in dump_file_names:
+            zip_file_handle.write(dump_file_name, basename(dump_file_name))
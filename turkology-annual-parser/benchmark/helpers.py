@@ -0,0 +1,85 @@
+import multiprocessing
+import os
+import resource
+import time
+from glob import glob
+from typing import Any, Callable, List, NamedTuple, Sequence
+
+SYNTHETIC_PARAGRAPH = (
+    '<w:p><w:pPr><w:jc w:val="both"/></w:pPr>'
+    '<w:r><w:rPr><w:b/></w:rPr><w:t>{number}. </w:t></w:r><w:r><w:t>{text}</w:t></w:r></w:p>'
+)
+SYNTHETIC_CITATIONS = [
+    'Kreiser, Klaus   Lexikon der islamischen Welt. Stuttgart, 1974, 240 S.',
+    'Handžić, Adem   Problematika sakupljanja i izdavanja turskih istorijskih izvora. '
+    'In: POF 20-21.1970/71 (1974).213-221. [Die Problematik der Erfassung.]',
+    'Lexikon der islamischen Welt. Klaus Kreiser, Werner Diem, Hans Georg Majer ed. '
+    '3 Bde., Stuttgart, 1974 (Urban-Taschenbücher, 200/1-3).',
+    'Bazin, Louis   Les systèmes chronologiques dans le monde turc ancien. In: TA 12.345.',
+    'Scharlipp, Wolfgang-E.   Inverted syntax in early Turkish texts. In: TA 26.314.235-243. '
+    'Rez. Wilhelm Wagner, ÖO 15.4.1973.443-445. — Anton Scherer, SODV 23.3.1974.219-220.',
+]
+SYNTHETIC_KEYWORDS = ['A. Allgemeines', 'AC. Bibliotheken', 'B. Geschichte']
+
+
+class Measurement(NamedTuple):
+    result: Any
+    seconds: float
+    peak_rss_mb: float
+
+
+def find_ocr_files(data_dir: str) -> List[str]:
+    return sorted(glob(os.path.join(data_dir, 'ocr', '*')))
+
+
+def write_synthetic_volume(directory: str, number_of_paragraphs: int) -> str:
+    """Write a WordML file resembling an OCR volume and return its path."""
+    path = os.path.join(directory, f'TA99_{number_of_paragraphs}_synthetic.xml')
+    with open(path, 'w', encoding='utf-8') as volume_file:
+        volume_file.write(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:wordDocument xmlns:w="http://schemas.microsoft.com/office/word/2003/wordml" '
+            'xmlns:wx="http://schemas.microsoft.com/office/word/2003/auxHint"><w:body><wx:sect>'
+        )
+        volume_file.write(_paragraph('ZEITSCHRIFTEN UND SAMMELWERKE'))
+        for number in range(1, number_of_paragraphs + 1):
+            if number % 200 == 1:
+                keyword = SYNTHETIC_KEYWORDS[number // 200 % len(SYNTHETIC_KEYWORDS)]
+                volume_file.write(_paragraph(keyword))
+            text = SYNTHETIC_CITATIONS[number % len(SYNTHETIC_CITATIONS)]
+            volume_file.write(SYNTHETIC_PARAGRAPH.format(number=number, text=text))
+        volume_file.write('</wx:sect></w:body></w:wordDocument>')
+    return path
+
+
+def _paragraph(text: str) -> str:
+    return f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+
+
+def measure(function: Callable, *args) -> Measurement:
+    start = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return Measurement(result, seconds, peak_rss_mb)
+
+
+def measure_in_fresh_process(function: Callable, *args) -> Measurement:
+    """Run `function` in a newly spawned process so that its peak RSS can be measured."""
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        return pool.apply(measure, (function,) + args)
+
+
+def print_table(title: str, header: Sequence[str], rows: Sequence[Sequence[Any]]):
+    rows = [[_format_cell(cell) for cell in row] for row in rows]
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+    print(f'\n{title}')
+    for row in [header, *rows]:
+        print('  '.join(str(cell).rjust(width) for cell, width in zip(row, widths)))
+
+
+def _format_cell(cell):
+    if isinstance(cell, float):
+        return f'{cell:.3f}' if cell < 100 else f'{cell:.0f}'
+    return cell
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import jsonlines
+
+from benchmark.helpers import find_ocr_files, print_table, write_synthetic_volume
+from keywords import get_keyword_mapping
+from pipeline import run_isolated_pipeline_on_volume
+from repositories.JsonRepository import JsonRepository
+
+SYNTHETIC_VOLUME_SIZE = 20000
+CORPUS_SIZE = 80000  # About the number of citations in all volumes
+
+
+def run(data_dir: str):
+    keyword_mapping = get_keyword_mapping(os.path.join(data_dir, 'keywords.csv'))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        volumes = find_ocr_files(data_dir) or [
+            write_synthetic_volume(temp_dir, SYNTHETIC_VOLUME_SIZE)
+        ]
+        citations = [
+            citation
+            for volume in volumes
+            for citation in run_isolated_pipeline_on_volume(volume, keyword_mapping).citations
+        ]
+        citations = (citations * (CORPUS_SIZE // len(citations) + 1))[:CORPUS_SIZE]
+
+        rows = []
+        outputs = []
+        for name, write in (('before', write_citations_before), ('streaming', write_citations)):
+            filename = os.path.join(temp_dir, f'{name}.json')
+            start = time.perf_counter()
+            write(citations, filename)
+            duration = time.perf_counter() - start
+            tracemalloc.start()
+            write(citations, filename)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+            rows.append([name, len(citations), duration, peak_mb])
+            outputs.append([_read(filename), _read(filename + 'l')])
+        assert outputs[0] == outputs[1], 'Written files differ'
+    print_table(
+        'Writing JSON and JSON lines (peak memory of writing, without the citations)',
+        ['', 'citations', 'duration (s)', 'peak (MB)'],
+        rows
+    )
+
+
+def write_citations(citations, filename):
+    JsonRepository(filename).write_citations(citations)
+
+
+def write_citations_before(citations, filename):
+    """JsonRepository.write_citations() as it was before streaming"""
+    citations = [JsonRepository._citation_as_dict(citation) for citation in citations]
+    with open(filename, 'w') as storage_file:
+        json.dump(citations, storage_file)
+    with jsonlines.open(filename + 'l', 'w') as writer:
+        writer.write_all(citations)
+    with open(filename + 'l', 'w') as storage_file:
+        writer = jsonlines.Writer(storage_file)
+        for citation in citations:
+            writer.write(citation)
+
+
+def _read(filename):
+    with open(filename, 'rb') as written_file:
+        return written_file.read()
@@ -0,0 +1,46 @@
+import os
+import tempfile
+import time
+
+import regex as re
+
+from benchmark.helpers import find_ocr_files, print_table, write_synthetic_volume
+from keywords import get_keyword_mapping
+from paragraph.keyword_matching import KeywordHeadingMatcher
+from paragraph.paragraph_extraction import extract_paragraphs
+from paragraph.type_detection import keyword_headings_from_mapping
+
+SYNTHETIC_VOLUME_SIZE = 20000
+
+
+def run(data_dir: str):
+    headings = keyword_headings_from_mapping(
+        get_keyword_mapping(os.path.join(data_dir, 'keywords.csv'))
+    )
+    fuzzy_pattern = re.compile(
+        '({}){{e<=2}}'.format('|'.join(re.escape(heading) for heading in headings)),
+        re.IGNORECASE
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        volume = (find_ocr_files(data_dir) or [
+            write_synthetic_volume(temp_dir, SYNTHETIC_VOLUME_SIZE)
+        ])[0]
+        texts = [paragraph.text or '' for paragraph in extract_paragraphs(volume)]
+
+    rows = []
+    results = []
+    for engine, fullmatch in (
+            ('fuzzy regex', lambda text: bool(fuzzy_pattern.fullmatch(text))),
+            ('KeywordHeadingMatcher', KeywordHeadingMatcher(headings).fullmatch),
+    ):
+        start = time.perf_counter()
+        results.append([fullmatch(text) for text in texts])
+        duration = time.perf_counter() - start
+        rows.append([engine, len(texts), sum(results[-1]), duration, len(texts) / duration])
+    assert results[0] == results[1], 'Engines disagree'
+
+    print_table(
+        f'Keyword heading matching ({os.path.basename(volume).split("_")[0]})',
+        ['engine', 'paragraphs', 'headings', 'duration (s)', 'paragraphs/s'],
+        rows
+    )
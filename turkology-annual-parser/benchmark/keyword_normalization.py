@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from dataclasses import replace
+from operator import itemgetter
+
+from benchmark.helpers import find_ocr_files, print_table, write_synthetic_volume
+from citation.assembly import assemble_citations
+from citation.citation_parsing import parse_citations
+from citation.field_parsing import parse_citation_fields
+from citation.id_assignment import assign_citation_ids
+from citation.keywords import extract_keyword_code, fix_ocr_errors, normalize_keywords
+from keywords import get_keyword_mapping
+from paragraph.paragraph_correction import correct_paragraphs
+from paragraph.paragraph_extraction import extract_paragraphs
+from paragraph.type_detection import detect_paragraph_types
+
+SYNTHETIC_VOLUME_SIZE = 20000
+
+
+def run(data_dir: str):
+    keyword_mapping = get_keyword_mapping(os.path.join(data_dir, 'keywords.csv'))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        volumes = find_ocr_files(data_dir) or [
+            write_synthetic_volume(temp_dir, SYNTHETIC_VOLUME_SIZE)
+        ]
+        citations = [
+            citation
+            for volume in volumes
+            for citation in assign_citation_ids(parse_citation_fields(parse_citations(
+                assemble_citations(detect_paragraph_types(
+                    correct_paragraphs(extract_paragraphs(volume)), keyword_mapping
+                ))
+            )))
+        ]
+    rows = []
+    results = []
+    for name, normalize in (('before', normalize_keywords_before), ('after', normalize_keywords)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        normalized_citations = list(normalize(citations, keyword_mapping))
+        duration = time.perf_counter() - start
+        output_mb = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+        tracemalloc.stop()
+        results.append(json.dumps([citation.keywords for citation in normalized_citations]))
+        rows.append([name, len(citations), duration, len(citations) / duration, output_mb])
+        del normalized_citations
+    assert results[0] == results[1], 'Normalized keywords differ'
+    print_table(
+        'Keyword normalization (normalize_keywords), with memory allocated for the output',
+        ['', 'citations', 'duration (s)', 'citations/s', 'output (MB)'],
+        rows
+    )
+
+
+def normalize_keywords_before(citations, keyword_mapping):
+    """normalize_keywords() as it was before the KeywordResolver"""
+    for citation in citations:
+        keywords = []
+        for unparsed_keyword in map(itemgetter('raw'), citation.keywords):
+            unparsed_keyword = fix_ocr_errors(unparsed_keyword)
+            code = extract_keyword_code(unparsed_keyword)
+            if not code:
+                keywords.append({'raw': unparsed_keyword})
+                continue
+            keywords.append(make_keyword(code, keyword_mapping, unparsed_keyword))
+        if keywords:
+            citation = replace(citation, keywords=keywords)
+        yield citation
+
+
+def make_keyword(code, keyword_mapping, raw_keyword=None):
+    if not code:
+        return
+    if code.upper() in keyword_mapping:
+        code = code.upper()
+        keyword = {
+            'code': code,
+            'nameDE': keyword_mapping[code]['de'],
+            'nameEN': keyword_mapping[code]['en'],
+            'raw': raw_keyword,
+            'super': make_keyword(code[:-1], keyword_mapping)
+        }
+    else:
+        keyword = {
+            'raw': raw_keyword,
+            'code': code,
+        }
+    return keyword
@@ -0,0 +1,91 @@
+import json
+import os
+import re
+import tempfile
+import time
+
+from benchmark.helpers import find_ocr_files, print_table, write_synthetic_volume
+from citation.assembly import assemble_citations
+from citation.citation_parsing import parse_citations
+from citation.field_parsing import (
+    issues_pattern, journal_pattern, pages_pattern, parse_reference, volume_pattern, year_pattern
+)
+from keywords import get_keyword_mapping
+from paragraph.paragraph_correction import correct_paragraphs
+from paragraph.paragraph_extraction import extract_paragraphs
+from paragraph.type_detection import detect_paragraph_types
+
+SYNTHETIC_VOLUME_SIZE = 20000
+REPETITIONS = 20
+
+REFERENCE_PATTERNS = [('ta', re.compile(
+    r'^TA *(?P<volume>\d+)\. *(?P<number>\d+)(?:\. *%s)?$' % pages_pattern
+))]
+REFERENCE_PATTERNS.extend([
+    ('journal', re.compile(
+        '^' + journal_pattern + ' *' + r'\. *'.join(sub_patterns) + '$', re.UNICODE
+    ))
+    for sub_patterns in [
+        (volume_pattern, issues_pattern, year_pattern, pages_pattern),
+        (volume_pattern, issues_pattern, pages_pattern),
+        (year_pattern, issues_pattern, pages_pattern),
+        (volume_pattern, year_pattern, pages_pattern),
+        (year_pattern, pages_pattern),
+        (year_pattern,),
+    ]
+])
+
+
+def run(data_dir: str):
+    keyword_mapping = get_keyword_mapping(os.path.join(data_dir, 'keywords.csv'))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        volumes = find_ocr_files(data_dir) or [
+            write_synthetic_volume(temp_dir, SYNTHETIC_VOLUME_SIZE)
+        ]
+        raw_references = [
+            citation.published_in
+            for volume in volumes
+            for citation in parse_citations(assemble_citations(detect_paragraph_types(
+                correct_paragraphs(extract_paragraphs(volume)), keyword_mapping
+            )))
+            if citation.published_in
+        ] * REPETITIONS
+    durations = []
+    results = []
+    for parse in (parse_reference_before, parse_reference):
+        start = time.perf_counter()
+        results.append([parse(raw_reference) for raw_reference in raw_references])
+        durations.append(time.perf_counter() - start)
+    assert json.dumps(results[0]) == json.dumps(results[1]), 'Parsed references differ'
+    print_table(
+        'Reference parsing (published_in of all volumes): regex per shape vs. single pass',
+        ['references', 'parsed', 'before (s)', 'after (s)', 'speedup'],
+        [[
+            len(raw_references),
+            sum(1 for reference in results[1] if reference),
+            *durations,
+            durations[0] / durations[1],
+        ]]
+    )
+
+
+def parse_reference_before(raw_reference):
+    """parse_reference() as it was before the reference was split into its parts"""
+    if not isinstance(raw_reference, str):
+        return None
+    raw_reference = raw_reference.strip('. ')
+    for reference_type, reference_pattern in REFERENCE_PATTERNS:
+        reference_match = reference_pattern.search(raw_reference)
+        if reference_match:
+            group_dict = reference_match.groupdict()
+            for key, value in list(group_dict.items())[:]:
+                if value is None:
+                    del group_dict[key]
+                    continue
+                if value.isdigit():
+                    if key == 'yearEnd' and len(value) == 2:
+                        value = str(group_dict['yearStart'])[:2] + value
+                    group_dict[key] = int(value)
+            group_dict['type'] = reference_type
+            group_dict['raw'] = raw_reference
+            return group_dict or None
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import time
+from dataclasses import asdict, replace
+
+from benchmark.helpers import find_ocr_files, print_table, write_synthetic_volume
+from keywords import get_keyword_mapping
+from pipeline import run_isolated_pipeline_on_volume
+from repositories.serialization import citation_as_dict, to_camel_case
+
+SYNTHETIC_VOLUME_SIZE = 20000
+REPETITIONS = 3
+
+
+def run(data_dir: str):
+    keyword_mapping = get_keyword_mapping(os.path.join(data_dir, 'keywords.csv'))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        volumes = find_ocr_files(data_dir) or [
+            write_synthetic_volume(temp_dir, SYNTHETIC_VOLUME_SIZE)
+        ]
+        citations = [
+            citation
+            for volume in volumes
+            for citation in run_isolated_pipeline_on_volume(volume, keyword_mapping).citations
+        ] * REPETITIONS
+    rows = []
+    results = []
+    for name, serialize in (('asdict', citation_as_dict_before), ('serializer', citation_as_dict)):
+        start = time.perf_counter()
+        results.append([serialize(citation) for citation in citations])
+        duration = time.perf_counter() - start
+        rows.append([name, len(citations), duration, len(citations) / duration])
+    assert results[0] == results[1], 'Serialized citations differ'
+    print_table(
+        'Serializing citations to dicts',
+        ['', 'citations', 'duration (s)', 'citations/s'],
+        rows
+    )
+
+
+def citation_as_dict_before(citation):
+    """BaseRepository._citation_as_dict() as it was before the serializers per class"""
+    citation_dict = asdict(
+        replace(citation, type=citation.type.value if citation.type else None),
+        dict_factory=_to_dict
+    )
+    citation_dict['fullyParsed'] = citation.is_fully_parsed
+    return citation_dict
+
+
+def _to_dict(it):
+    return dict([(to_camel_case(key), value) for key, value in it if value])
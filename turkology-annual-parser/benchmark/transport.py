@@ -0,0 +1,76 @@
+import multiprocessing
+import time
+from queue import Queue
+from typing import List
+
+from benchmark.helpers import print_table
+from domain.citation import Citation, CitationType, Person
+
+NUMBER_OF_VOLUMES = 8
+CITATIONS_PER_VOLUME = 5000
+
+
+def make_citations(volume: int) -> List[Citation]:
+    return [
+        Citation(
+            id=f'{volume}-{number}',
+            volume=volume,
+            number=number,
+            type=CitationType.ARTICLE,
+            title='Problematika sakupljanja i izdavanja turskih istorijskih izvora',
+            authors=[Person(first='Adem', last='Handžić', raw='Handžić, Adem')],
+            keywords=[{'code': 'A', 'nameDE': 'Allgemeines', 'nameEN': 'General', 'raw': 'A.'}],
+            raw_text='12. Handžić, Adem   Problematika sakupljanja i izdavanja turskih '
+                     'istorijskih izvora. In: POF 20-21.1970/71 (1974).213-221.',
+            remaining_text='{{{ authors }}} {{{ title }}} {{{ in }}}',
+            published_in={'journal': 'POF', 'volumeStart': 20, 'volumeEnd': 21},
+        )
+        for number in range(CITATIONS_PER_VOLUME)
+    ]
+
+
+def put_citations_into_queue(volume: int, queue: Queue) -> None:
+    for citation in make_citations(volume):
+        queue.put(citation)
+
+
+def transport_through_manager_queue(volumes: List[int]) -> int:
+    """The transport used before: every citation is sent through a Manager().Queue() proxy"""
+    queue = multiprocessing.Manager().Queue()
+    with multiprocessing.Pool() as pool:
+        pool.starmap(put_citations_into_queue, ((volume, queue) for volume in volumes))
+    number_of_citations = 0
+    while not queue.empty():
+        queue.get()
+        number_of_citations += 1
+    return number_of_citations
+
+
+def transport_in_batches(volumes: List[int]) -> int:
+    number_of_citations = 0
+    with multiprocessing.Pool() as pool:
+        for citations in pool.imap_unordered(make_citations, volumes):
+            number_of_citations += len(citations)
+    return number_of_citations
+
+
+def run(data_dir: str):
+    volumes = list(range(1, NUMBER_OF_VOLUMES + 1))
+    rows = []
+    for name, transport in (
+            ('Manager().Queue()', transport_through_manager_queue),
+            ('imap_unordered', transport_in_batches),
+    ):
+        start_cpu, start_wall = time.process_time(), time.perf_counter()
+        number_of_citations = transport(volumes)
+        rows.append([
+            name,
+            number_of_citations,
+            time.perf_counter() - start_wall,
+            time.process_time() - start_cpu,
+        ])
+    print_table(
+        'Transport of citations from volume workers to the parent process',
+        ['transport', 'citations', 'wall time (s)', 'parent CPU (s)'],
+        rows
+    )
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import time
+from dataclasses import replace
+from typing import Dict, Iterable
+
+import regex as re
+
+from benchmark.helpers import find_ocr_files, print_table, write_synthetic_volume
+from domain.paragraph import Paragraph, ParagraphType
+from keywords import get_keyword_mapping
+from paragraph.keyword_matching import KeywordHeadingMatcher
+from paragraph.paragraph_correction import correct_paragraphs
+from paragraph.paragraph_extraction import extract_paragraphs
+from paragraph.type_detection import (
+    MAX_CITATION_GAP, _is_preceded_by_ocr_gap, detect_paragraph_types,
+    keyword_headings_from_mapping
+)
+
+SYNTHETIC_VOLUME_SIZE = 20000
+
+
+def run(data_dir: str):
+    keyword_mapping = get_keyword_mapping(os.path.join(data_dir, 'keywords.csv'))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        volumes = find_ocr_files(data_dir) or [
+            write_synthetic_volume(temp_dir, SYNTHETIC_VOLUME_SIZE)
+        ]
+        rows = []
+        for volume in volumes:
+            paragraphs = list(correct_paragraphs(extract_paragraphs(volume)))
+            durations = []
+            results = []
+            for detect in (detect_paragraph_types_before, detect_paragraph_types):
+                start = time.perf_counter()
+                detected = detect(paragraphs, keyword_mapping)
+                results.append([paragraph.type for paragraph in detected])
+                durations.append(time.perf_counter() - start)
+            assert results[0] == results[1], f'Paragraph types differ for {volume}'
+            rows.append([
+                os.path.basename(volume).split('_')[0],
+                len(paragraphs),
+                *durations,
+                durations[0] / durations[1],
+            ])
+    print_table(
+        'Paragraph type detection: before vs. cheap checks first',
+        ['volume', 'paragraphs', 'before (s)', 'after (s)', 'speedup'],
+        rows
+    )
+
+
+def detect_paragraph_types_before(
+        paragraphs: Iterable[Paragraph], keyword_mapping: Dict[str, Dict[str, str]]
+):
+    """detect_paragraph_types() as it was before cheap checks were tried first"""
+    journal_section_begin_pattern = re.compile('ZEITSCHRIFTEN +UND')
+    journal_pattern = re.compile('')
+    keyword_headings = keyword_headings_from_mapping(keyword_mapping)
+    keyword_pattern_exact = re.compile(
+        '({})'.format('|'.join([re.escape(heading) for heading in keyword_headings])),
+        re.IGNORECASE
+    )
+    keyword_matcher_fuzzy = KeywordHeadingMatcher(keyword_headings)
+    citation_pattern = re.compile(r'(\d+)\.\.?\s+.+', re.DOTALL)
+    broken_bullet_pattern = re.compile(r'^[φ#0Φ].*')  # , s\.( a\.)? \d+')
+    page_number_pattern = re.compile(
+        r'(\d+\s+Turkologischer Anzeiger|Turkologischer Anzeiger\s+\d+){e<=2}'
+    )
+
+    citation_section_has_begun = False
+    latest_citation_number = 0
+    previous_type = None
+    index_has_begun = False
+    journal_section_has_begun = False
+
+    for paragraph in paragraphs:
+        paragraph_type = None
+        text = paragraph.text or ''
+        is_possible_amendment = previous_type == ParagraphType.CITATION or (
+                previous_type and previous_type == ParagraphType.AMENDMENT)
+        citation_match = citation_pattern.fullmatch(text)
+
+        if not journal_section_has_begun:
+            if journal_section_begin_pattern.search(text):
+                paragraph_type = ParagraphType.JOURNAL_SECTION_BEGIN
+                journal_section_has_begun = True
+
+        if journal_section_has_begun and not citation_section_has_begun:
+            journal_match = journal_pattern.search(text)
+            if False and journal_match:
+                paragraph_type = ParagraphType.JOURNAL
+            elif keyword_matcher_fuzzy.fullmatch(text):
+                paragraph_type = ParagraphType.KEYWORD
+            elif citation_section_has_begun and text.split('.')[0] in keyword_mapping:
+                paragraph_type = ParagraphType.KEYWORD
+            if paragraph_type == ParagraphType.KEYWORD:
+                citation_section_has_begun = True
+
+        if citation_section_has_begun and not index_has_begun:
+            if keyword_pattern_exact.fullmatch(text):
+                paragraph_type = ParagraphType.KEYWORD
+            elif citation_section_has_begun and citation_match and (
+                    0 < (int(citation_match.group(1)) - latest_citation_number) <= MAX_CITATION_GAP
+                    or _is_preceded_by_ocr_gap(paragraph.volume, int(citation_match.group(1)))
+            ):
+                paragraph_type = ParagraphType.CITATION
+                latest_citation_number = int(citation_match.group(1))
+            elif keyword_matcher_fuzzy.fullmatch(text):
+                paragraph_type = ParagraphType.KEYWORD
+            elif citation_section_has_begun and text.split('.')[0] in keyword_mapping:
+                paragraph_type = ParagraphType.KEYWORD
+            elif text.startswith('•') and is_possible_amendment:
+                paragraph_type = ParagraphType.AMENDMENT
+            elif text.startswith('Rez.') and is_possible_amendment:
+                paragraph_type = ParagraphType.AMENDMENT
+            elif text.startswith('Bericht') and is_possible_amendment:
+                paragraph_type = ParagraphType.AMENDMENT
+            elif text == 'Autoren, Herausgeber, Übersetzer, Rezensenten' or text == 'INDEX':
+                paragraph_type = ParagraphType.AUTHOR_INDEX_BEGIN
+                index_has_begun = True
+            elif broken_bullet_pattern.match(text) and is_possible_amendment:
+                paragraph_type = ParagraphType.AMENDMENT
+            elif citation_section_has_begun and citation_match:
+                paragraph_type = ParagraphType.CITATION
+                latest_citation_number = int(citation_match.group(1))
+        yield replace(paragraph, type=paragraph_type)
+        if not page_number_pattern.fullmatch(text):
+            previous_type = paragraph_type
@@ -0,0 +1,36 @@
+import os
+import tempfile
+
+from benchmark.helpers import (
+    find_ocr_files, measure_in_fresh_process, print_table, write_synthetic_volume
+)
+from paragraph.wmlparser import WMLParser
+
+SYNTHETIC_VOLUME_SIZE = 200000
+
+
+def count_paragraphs(xml_filename: str, streaming: bool) -> int:
+    return sum(1 for _ in WMLParser(xml_filename, streaming=streaming))
+
+
+def run(data_dir: str):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        volumes = find_ocr_files(data_dir) or [
+            write_synthetic_volume(temp_dir, SYNTHETIC_VOLUME_SIZE)
+        ]
+        rows = []
+        for volume in volumes:
+            for mode, streaming in (('dom', False), ('streaming', True)):
+                measurement = measure_in_fresh_process(count_paragraphs, volume, streaming)
+                rows.append([
+                    os.path.basename(volume).split('_')[0],
+                    mode,
+                    measurement.result,
+                    measurement.result / measurement.seconds,
+                    measurement.peak_rss_mb,
+                ])
+        print_table(
+            'WMLParser: DOM vs. streaming',
+            ['volume', 'mode', 'paragraphs', 'paragraphs/s', 'peak RSS (MB)'],
+            rows
+        )
@@ -1,42 +1,91 @@
 import logging
+import math
 import multiprocessing
-import re
 from dataclasses import replace
-from multiprocessing.queues import Queue
-from typing import List, Iterable, Optional
-
-import regex
+from time import perf_counter
+from typing import List, Iterable, Optional, Tuple
 
 from citation.citation_parsing import reparse_citation
 from citation.field_parsing import parse_name
 from domain.citation import Citation
+from .author_matching import KnownAuthorMatcher
 from .extract import extract_known_authors
 
+CHUNKS_PER_WORKER = 4
+
 
-def reparse_citations_using_known_authors(citations: List[Citation]):
+def reparse_citations_using_known_authors(
+        citations: List[Citation],
+        workers: Optional[int] = None,
+        rounds: int = 1
+):
+    """
+    Search the citations without authors for known authors.
+
+    With more than one round, the authors found in a round are added to the known authors
+    and the citations in which no author was found yet are searched again, until no new
+    authors are found or the number of rounds is reached.
+    """
     authors = extract_known_authors(citations).union(HARDCODED_AUTHORS)
     logging.debug('Found {} distinct authors'.format(len(authors)))
 
-    queue = multiprocessing.Manager().Queue()
-    chunks = split_into_chunks(
-        filter(lambda c: not c.authors and not c.fully_parsed(), citations),
-        int(len(citations) / multiprocessing.cpu_count())
+    start = perf_counter()
+    author_matcher = KnownAuthorMatcher(authors)
+    logging.info(
+        f'Built matcher for {len(author_matcher)} known authors in {perf_counter() - start:.2f}s'
     )
-    with multiprocessing.Pool() as pool:
-        args = ((chunk, authors, queue) for chunk in chunks)
-        pool.starmap(insert_known_authors, args)
-    pool.join()
+
+    remaining_citations = [c for c in citations if not c.authors and not c.is_fully_parsed]
+    workers = workers or multiprocessing.cpu_count()
     updated_citations = {}
-    while not queue.empty():
-        citation = queue.get()
-        updated_citations[citation.id] = citation
-    pool.close()
+    new_authors_by_round: List[List[str]] = []
+    # The matcher is passed to each worker once; later rounds only send the new authors
+    with multiprocessing.Pool(
+            workers, initializer=_set_worker_author_matcher, initargs=(author_matcher,)
+    ) as pool:
+        for round_number in range(1, rounds + 1):
+            start = perf_counter()
+            chunks = split_into_chunks(
+                remaining_citations, chunk_size_for(len(remaining_citations), workers)
+            )
+            round_citations = {}
+            match_seconds = 0.0
+            for chunk_citations, chunk_seconds in pool.imap_unordered(
+                    _insert_known_authors_in_worker,
+                    ((chunk, new_authors_by_round) for chunk in chunks)
+            ):
+                match_seconds += chunk_seconds
+                for citation in chunk_citations:
+                    round_citations[citation.id] = citation
+            updated_citations.update(round_citations)
+            new_authors = sorted(
+                extract_known_authors(list(round_citations.values())) - authors
+            )
+            logging.info(
+                f'Round {round_number}: found known authors in {len(round_citations)} of '
+                f'{len(remaining_citations)} citations, learned {len(new_authors)} new authors '
+                f'in {perf_counter() - start:.2f}s ({match_seconds:.2f}s in workers)'
+            )
+            remaining_citations = [
+                citation for citation in remaining_citations
+                if citation.id not in round_citations
+            ]
+            if not new_authors or not remaining_citations:
+                break
+            authors.update(new_authors)
+            author_matcher.add(new_authors)
+            new_authors_by_round = new_authors_by_round + [new_authors]
     logging.info(f'Found known authors in {len(updated_citations)} citations')
     return [
         updated_citations.get(citation.id, citation) for citation in citations
     ]
 
 
+def chunk_size_for(number_of_citations: int, workers: int) -> int:
+    """Split the citations into a few chunks per worker, so that the workers finish together"""
+    return max(1, math.ceil(number_of_citations / (workers * CHUNKS_PER_WORKER)))
+
+
 def split_into_chunks(items: Iterable[Citation], chunk_size: int):
     current_chunk = []
     for item in items:
@@ -50,39 +99,52 @@ def split_into_chunks(items: Iterable[Citation], chunk_size: int):
 
 def insert_known_authors(
         citations: List[Citation],
-        known_authors: Iterable[str],
-        queue: Queue
-) -> None:
-    known_authors_pattern = '|'.join(
-        [re.escape(author.strip().lower()) for author in known_authors])
-
-    multiple_authors_pattern = regex.compile(
-        f'^({known_authors_pattern}){{e<=1}}(?: +(?:—|-) '
-        fr'+({known_authors_pattern}){{e<=1}})+\.?\s+(\p{{Lu}}[^ .]+ .+)',
-        regex.UNICODE | regex.IGNORECASE | regex.DOTALL
-    )
-
-    single_author_pattern = regex.compile(
-        r'^({}){{e<=1}}\.?\s+(\p{{Lu}}[^ .]+ )'.format(known_authors_pattern),
-        regex.UNICODE | regex.IGNORECASE
-    )
-
+        author_matcher: KnownAuthorMatcher
+) -> List[Citation]:
+    """Return the citations in which known authors were found, reparsed"""
+    updated_citations = []
     for citation in citations:
         citation_with_authors = (
-                find_multiple_authors(citation, multiple_authors_pattern)
-                or find_single_author(citation, single_author_pattern)
+                find_multiple_authors(citation, author_matcher)
+                or find_single_author(citation, author_matcher)
         )
         if citation_with_authors:
-            queue.put(reparse_citation(citation_with_authors))
+            updated_citations.append(reparse_citation(citation_with_authors))
+    return updated_citations
+
+
+_worker_author_matcher: Optional[KnownAuthorMatcher] = None
+_worker_rounds_added = 0
+
+
+def _set_worker_author_matcher(author_matcher: KnownAuthorMatcher):
+    global _worker_author_matcher
+    _worker_author_matcher = author_matcher
+
+
+def _insert_known_authors_in_worker(
+        task: Tuple[List[Citation], List[List[str]]]
+) -> Tuple[List[Citation], float]:
+    global _worker_rounds_added
+    if _worker_author_matcher is None:
+        raise RuntimeError('Author matcher of worker not set, initialize the pool with it')
+    citations, new_authors_by_round = task
+    start = perf_counter()
+    for new_authors in new_authors_by_round[_worker_rounds_added:]:
+        _worker_author_matcher.add(new_authors)
+    _worker_rounds_added = len(new_authors_by_round)
+    updated_citations = insert_known_authors(citations, _worker_author_matcher)
+    return updated_citations, perf_counter() - start
 
 
-def find_multiple_authors(citation: Citation, multiple_authors_pattern) -> Optional[Citation]:
-    authors_match = multiple_authors_pattern.findall(citation.remaining_text)
+def find_multiple_authors(
+        citation: Citation, author_matcher: KnownAuthorMatcher
+) -> Optional[Citation]:
+    authors_match = author_matcher.find_multiple_authors(citation.remaining_text)
     if not authors_match:
         return None
-    authors_match = authors_match[0]
-    author_names = [name for name in authors_match[:-1] if name]
-    remaining_text = '{{{ authors }}} ' + authors_match[-1]
+    author_names = [name for name in authors_match.author_names if name]
+    remaining_text = '{{{ authors }}} ' + citation.remaining_text[authors_match.title_start:]
     return replace(
         citation,
         remaining_text=remaining_text,
@@ -90,13 +152,15 @@ def find_multiple_authors(citation: Citation, multiple_authors_pattern) -> Optio
     )
 
 
-def find_single_author(citation: Citation, single_author_pattern) -> Optional[Citation]:
-    author_match = single_author_pattern.search(citation.remaining_text)
+def find_single_author(
+        citation: Citation, author_matcher: KnownAuthorMatcher
+) -> Optional[Citation]:
+    author_match = author_matcher.find_single_author(citation.remaining_text)
 
     if not author_match:
         return None
-    author_name = author_match.group(1)
-    remaining_text = '{{{ authors }}} ' + citation.remaining_text[author_match.span(2)[0]:]
+    author_name = author_match.author_names[0]
+    remaining_text = '{{{ authors }}} ' + citation.remaining_text[author_match.title_start:]
     return replace(
         citation,
         remaining_text=remaining_text,
@@ -0,0 +1,128 @@
+import random
+import re
+
+import regex
+
+from ..author_matching import KnownAuthorMatcher
+
+LAST_NAMES = ['Kreiser', 'Handžić', 'Bazin', 'Özeğe', 'Yıldız', 'İnalcık', 'Scharlipp', 'Ilgın']
+FIRST_NAMES = ['Klaus', 'Adem', 'Louis', 'Seyfettin', 'İsmail', 'Halil', 'Wolfgang-E', 'Işık']
+TITLES = ['Lexikon der islamischen Welt. Stuttgart, 1974', 'Über die Sprache', 'türk dili', 'A b']
+
+
+def test_finds_single_author_with_one_error():
+    # given
+    matcher = KnownAuthorMatcher(['Handžić, Adem'])
+
+    # when
+    author_match = matcher.find_single_author('Handžič, Adem. Problematika sakupljanja')
+
+    # then
+    assert author_match.author_names == ['Handžič, Adem']
+    assert author_match.title_start == len('Handžič, Adem. ')
+
+
+def test_finds_first_and_last_of_multiple_authors():
+    # given
+    matcher = KnownAuthorMatcher(['Kreiser, Klaus', 'Diem, Werner', 'Majer, Hans Georg'])
+    text = 'Kreiser, Klaus — Diem, Werner — Majer, Hans Georg  Lexikon der islamischen Welt.'
+
+    # when
+    author_match = matcher.find_multiple_authors(text)
+
+    # then
+    assert author_match.author_names == ['Kreiser, Klaus', 'Majer, Hans Georg']
+    assert text[author_match.title_start:] == 'Lexikon der islamischen Welt.'
+
+
+def test_finds_nothing_for_authors_with_two_errors():
+    # given
+    matcher = KnownAuthorMatcher(['Kreiser, Klaus'])
+
+    # when
+    author_match = matcher.find_single_author('Kreisre, Klaus  Lexikon der islamischen Welt.')
+
+    # then
+    assert author_match is None
+
+
+def test_matches_like_fuzzy_regex():
+    # given
+    rng = random.Random(42)
+    authors = list(dict.fromkeys(_random_author(rng) for _ in range(40)))
+    texts = [_random_citation_text(rng, authors) for _ in range(2000)]
+    matcher = KnownAuthorMatcher(authors)
+
+    # when
+    results = [
+        (matcher.find_multiple_authors(text), matcher.find_single_author(text))
+        for text in texts
+    ]
+
+    # then
+    multiple_authors_pattern, single_author_pattern = _fuzzy_regexes(authors)
+    for text, (multiple_authors_match, single_author_match) in zip(texts, results):
+        expected_multiple_authors = multiple_authors_pattern.findall(text)
+        if expected_multiple_authors:
+            *names, title = expected_multiple_authors[0]
+            assert multiple_authors_match.author_names == names
+            assert text[multiple_authors_match.title_start:] == title
+        else:
+            assert multiple_authors_match is None
+        expected_single_author = single_author_pattern.search(text)
+        if expected_single_author:
+            assert single_author_match.author_names == [expected_single_author.group(1)]
+            assert single_author_match.title_start == expected_single_author.start(2)
+        else:
+            assert single_author_match is None
+    assert sum(1 for _, single_author_match in results if single_author_match) > 100
+
+
+def _fuzzy_regexes(known_authors):
+    """The regexes used before KnownAuthorMatcher"""
+    known_authors_pattern = '|'.join(
+        [re.escape(author.strip().lower()) for author in known_authors])
+
+    multiple_authors_pattern = regex.compile(
+        f'^({known_authors_pattern}){{e<=1}}(?: +(?:—|-) '
+        fr'+({known_authors_pattern}){{e<=1}})+\.?\s+(\p{{Lu}}[^ .]+ .+)',
+        regex.UNICODE | regex.IGNORECASE | regex.DOTALL
+    )
+
+    single_author_pattern = regex.compile(
+        r'^({}){{e<=1}}\.?\s+(\p{{Lu}}[^ .]+ )'.format(known_authors_pattern),
+        regex.UNICODE | regex.IGNORECASE
+    )
+    return multiple_authors_pattern, single_author_pattern
+
+
+def _random_author(rng):
+    last_name, first_name = rng.choice(LAST_NAMES), rng.choice(FIRST_NAMES)
+    return rng.choice([f'{last_name}, {first_name}', f'{last_name}, {first_name[0]}'])
+
+
+def _random_citation_text(rng, authors):
+    names = [
+        _garble(rng, rng.choice(authors), rng.choice([0, 0, 1, 2]))
+        for _ in range(rng.randint(1, 3))
+    ]
+    separator = rng.choice([' — ', ' - ', '  —  ', ', '])
+    return separator.join(names) + rng.choice(['. ', '  ', ' ', '..', '']) + rng.choice(TITLES)
+
+
+def _garble(rng, text, number_of_errors):
+    chars = list(text)
+    for _ in range(number_of_errors):
+        position = rng.randrange(len(chars) + 1)
+        operation = rng.choice(['insert', 'delete', 'substitute', 'swapcase'])
+        if operation == 'insert':
+            chars.insert(position, rng.choice('aeıiIİs .,-'))
+        elif position == len(chars):
+            continue
+        elif operation == 'delete':
+            del chars[position]
+        elif operation == 'substitute':
+            chars[position] = rng.choice('aeıiIİs .,-')
+        else:
+            chars[position] = chars[position].swapcase()
+    return ''.join(chars)
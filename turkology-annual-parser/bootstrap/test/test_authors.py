@@ -1,6 +1,7 @@
-from queue import Queue
-
-from bootstrap.authors import insert_known_authors
+from bootstrap.author_matching import KnownAuthorMatcher
+from bootstrap.authors import (
+    chunk_size_for, insert_known_authors, reparse_citations_using_known_authors
+)
 from citation.citation_parsing import parse_citation
 from citation.field_parsing import parse_fields_in_citation
 from domain.citation import Citation, CitationType, Person
@@ -18,10 +19,11 @@ def test_insert_known_authors():
     ))
     raw_citation = IntermediateCitation(volume=1, raw_text=raw_text)
     parsed_citation = parse_fields_in_citation(parse_citation(raw_citation))
-    queue = Queue()
-    insert_known_authors([parsed_citation], ['Handžić, Adem'], queue)
+    updated_citations = insert_known_authors(
+        [parsed_citation], KnownAuthorMatcher(['Handžić, Adem'])
+    )
 
-    assert queue.get() == Citation(
+    assert updated_citations == [Citation(
         volume=1,
         number=12,
         type=CitationType.ARTICLE,
@@ -48,5 +50,44 @@ def test_insert_known_authors():
         },
         ta_references=[],
         remaining_text='{{{ authors }}} {{{ title }}} {{{ in }}}'
+    )]
+
+
+def test_chunk_size_is_at_least_one():
+    assert chunk_size_for(3, workers=8) == 1
+    assert chunk_size_for(0, workers=8) == 1
+
+
+def test_chunk_size_gives_a_few_chunks_per_worker():
+    assert chunk_size_for(1000, workers=4) == 63
+
+
+def test_later_rounds_use_authors_found_in_earlier_rounds():
+    # given
+    citations = [
+        _citation_with_remaining_text('1-1', 'Handžić, Adem', '{{{ title }}}'),
+        _citation_with_remaining_text('1-2', None, 'Handžic, Adem  Problematika sakupljanja'),
+        _citation_with_remaining_text('1-3', None, 'Handžic, Aden  Problematika sakupljanja'),
+    ]
+
+    # when
+    one_round = reparse_citations_using_known_authors(citations, workers=1, rounds=1)
+    two_rounds = reparse_citations_using_known_authors(citations, workers=1, rounds=2)
+
+    # then
+    assert [[a.raw for a in c.authors] for c in one_round] == [
+        ['Handžić, Adem'], ['Handžic, Adem'], []
+    ]
+    assert [[a.raw for a in c.authors] for c in two_rounds] == [
+        ['Handžić, Adem'], ['Handžic, Adem'], ['Handžic, Aden']
+    ]
+
+
+def _citation_with_remaining_text(citation_id, author, remaining_text):
+    return Citation(
+        id=citation_id,
+        volume=1,
+        authors=[Person(raw=author)] if author else [],
+        raw_text=remaining_text,
+        remaining_text=remaining_text,
     )
-    assert queue.empty()
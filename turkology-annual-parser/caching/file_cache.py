@@ -0,0 +1,71 @@
+import hashlib
+import logging
+import os
+import tempfile
+from typing import Optional
+
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024  # bytes
+TEMP_FILE_PREFIX = '.tmp-'
+
+
+class FileCache(object):
+    """
+    Stores binary entries as files in a directory.
+
+    When the total size of all entries exceeds `max_size`, the least recently used entries are
+    evicted. Entries are written atomically, so several processes can share one directory.
+    """
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as entry_file:
+                data = entry_file.read()
+            os.utime(path)  # Mark entry as recently used
+        except FileNotFoundError:
+            return None
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, prefix=TEMP_FILE_PREFIX)
+        with os.fdopen(file_descriptor, 'wb') as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, self._path(key))
+        self._evict_least_recently_used()
+
+    def _evict_least_recently_used(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(TEMP_FILE_PREFIX) or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # Evicted by another process in the meantime
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            logging.debug(f'Evicting cache entry {path}')
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+
+def file_digest(file_name: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_name, 'rb') as hashed_file:
+        for block in iter(lambda: hashed_file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
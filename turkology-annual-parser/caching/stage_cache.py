@@ -0,0 +1,189 @@
+import ast
+import hashlib
+import importlib
+import importlib.util
+import logging
+import os
+import pickle
+import sys
+import tokenize
+import zlib
+from collections import Counter
+from functools import lru_cache, partial
+from types import ModuleType
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+from .file_cache import DEFAULT_MAX_SIZE, FileCache, file_digest
+from domain import citation, intermediate_citation, paragraph, slots
+from profiling import StageProfiler
+
+STAGE_CACHE_VERSION = 2  # Increment to invalidate all memoized stage outputs
+# Modules within this directory are part of the code a stage depends on
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Stage(NamedTuple):
+    """
+    A step of the volume pipeline whose output can be memoized.
+
+    `code` is the source code the stage depends on (default: the module defining `function`
+    and the project modules it imports), `parameters` a fingerprint of any other data the
+    stage depends on besides its input.
+    """
+    function: Callable
+    code: Optional[str] = None
+    parameters: str = ''
+
+    @property
+    def name(self) -> str:
+        function = self.function
+        while isinstance(function, partial):
+            function = function.func
+        return function.__name__
+
+
+class StageCache(object):
+    """
+    Memoizes the output of each stage of the volume pipeline.
+
+    The output of a stage is keyed by a fingerprint of the stage's input (i.e. the fingerprint
+    of the previous stage), code and parameters. Only the stages after the last stage with a
+    memoized output are run, e.g. a change to the code of the last stage only reruns that stage.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_MAX_SIZE):
+        self._file_cache = FileCache(os.path.join(cache_dir, 'stages'), max_size)
+
+    def run(
+            self,
+            volume_filename: str,
+            stages: List[Stage],
+            profiler: Optional[StageProfiler] = None
+    ) -> Tuple[List[Any], Counter]:
+        """Return the output of the last stage and the number of cache hits/misses per stage"""
+        fingerprints = self._fingerprints(volume_filename, stages)
+        first_stage_to_run = 0
+        result: Any = volume_filename
+        for stage_index in reversed(range(len(stages))):
+            data = self._file_cache.get(fingerprints[stage_index])
+            if data is not None:
+                first_stage_to_run = stage_index + 1
+                result = pickle.loads(zlib.decompress(data))
+                break
+
+        statistics: Counter = Counter()
+        for stage in stages[:first_stage_to_run]:
+            statistics[(stage.name, 'hit')] += 1
+        for stage, fingerprint in zip(stages[first_stage_to_run:],
+                                      fingerprints[first_stage_to_run:]):
+            logging.debug(f'Running stage {stage.name} on {os.path.basename(volume_filename)}')
+            function = profiler.profile(stage.function) if profiler else stage.function
+            result = list(function(result))
+            self._file_cache.put(
+                fingerprint,
+                zlib.compress(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), 1)
+            )
+            statistics[(stage.name, 'miss')] += 1
+        return result, statistics
+
+    @staticmethod
+    def _fingerprints(volume_filename: str, stages: List[Stage]) -> List[str]:
+        fingerprint = _hash(
+            str(STAGE_CACHE_VERSION),
+            # The domain objects determine the format of memoized outputs
+            module_source(citation, intermediate_citation, paragraph, slots),
+            os.path.basename(volume_filename),  # The volume number is taken from the file name
+            file_digest(volume_filename),
+        )
+        fingerprints = []
+        for stage in stages:
+            code = stage.code if stage.code is not None else _function_source(stage.function)
+            fingerprint = _hash(fingerprint, stage.name, code, stage.parameters)
+            fingerprints.append(fingerprint)
+        return fingerprints
+
+
+def module_source(*modules: ModuleType) -> str:
+    """Return the source of the modules and of the project modules they import transitively"""
+    return ''.join(
+        _module_source(module_name)
+        for module_name in _with_imported_modules(module.__name__ for module in modules)
+    )
+
+
+def format_statistics(statistics: Counter) -> str:
+    stage_names = dict.fromkeys(stage_name for stage_name, _ in statistics)
+    return '\n'.join(
+        f'{stage_name:>24}: {statistics[(stage_name, "hit")]:>3} hits, '
+        f'{statistics[(stage_name, "miss")]:>3} misses'
+        for stage_name in stage_names
+    )
+
+
+@lru_cache(maxsize=None)
+def _module_source(module_name: str) -> str:
+    # Unlike inspect.getsource(), also works for empty modules, e.g. most __init__.py files
+    file_name = importlib.import_module(module_name).__file__
+    if file_name is None:
+        raise ValueError(f'Module {module_name} has no source file')
+    with tokenize.open(file_name) as source_file:
+        return source_file.read()
+
+
+def _function_source(function: Callable) -> str:
+    while isinstance(function, partial):
+        function = function.func
+    return module_source(sys.modules[function.__module__])
+
+
+def _with_imported_modules(module_names: Iterable[str]) -> List[str]:
+    """Return the modules and the project modules they import transitively, sorted by name"""
+    found = set()
+    to_visit = list(module_names)
+    while to_visit:
+        module_name = to_visit.pop()
+        if module_name not in found:
+            found.add(module_name)
+            to_visit.extend(_imported_project_modules(module_name))
+    return sorted(found)
+
+
+@lru_cache(maxsize=None)
+def _imported_project_modules(module_name: str) -> Tuple[str, ...]:
+    """
+    Return the project modules imported anywhere in the module, also within functions.
+
+    For `from package import name`, both the package and `package.name` (if it is a module)
+    are imported.
+    """
+    package = importlib.import_module(module_name).__package__ or ''
+    imported_names: List[str] = []
+    for node in ast.walk(ast.parse(_module_source(module_name))):
+        if isinstance(node, ast.Import):
+            imported_names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base_name = importlib.util.resolve_name(
+                '.' * node.level + (node.module or ''), package
+            )
+            imported_names.append(base_name)
+            imported_names.extend(f'{base_name}.{alias.name}' for alias in node.names)
+    return tuple(
+        name for name in dict.fromkeys(imported_names) if _is_project_module(name)
+    )
+
+
+def _is_project_module(module_name: str) -> bool:
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):  # e.g. a class imported from a module, not a module
+        return False
+    return spec is not None and spec.has_location and spec.origin is not None \
+        and os.path.abspath(spec.origin).startswith(PROJECT_DIR + os.sep)
+
+
+def _hash(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
@@ -0,0 +1,43 @@
+import os
+
+from ..file_cache import FileCache, file_digest
+
+
+def test_returns_stored_entry(tmp_path):
+    cache = FileCache(str(tmp_path))
+    cache.put('key', b'data')
+
+    assert cache.get('key') == b'data'
+
+
+def test_returns_none_for_missing_entry(tmp_path):
+    cache = FileCache(str(tmp_path / 'not-yet-created'))
+
+    assert cache.get('key') is None
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    # given
+    cache = FileCache(str(tmp_path), max_size=10)
+    cache.put('first', b'1234')
+    cache.put('second', b'1234')
+    os.utime(tmp_path / 'first', (0, 0))
+    os.utime(tmp_path / 'second', (1, 1))
+    cache.get('first')
+
+    # when
+    cache.put('third', b'1234')
+
+    # then
+    assert cache.get('first') == b'1234'
+    assert cache.get('second') is None
+    assert cache.get('third') == b'1234'
+
+
+def test_file_digest_depends_on_content(tmp_path):
+    first_file, second_file = tmp_path / 'first', tmp_path / 'second'
+    first_file.write_bytes(b'content')
+    second_file.write_bytes(b'other content')
+
+    assert file_digest(str(first_file)) == file_digest(str(first_file))
+    assert file_digest(str(first_file)) != file_digest(str(second_file))
@@ -0,0 +1,142 @@
+import importlib
+import sys
+from collections import Counter
+
+import pytest
+
+from .. import stage_cache
+from ..stage_cache import Stage, StageCache
+
+calls: Counter = Counter()
+
+
+def read_lines(volume_filename):
+    calls['read_lines'] += 1
+    with open(volume_filename) as volume_file:
+        return volume_file.read().splitlines()
+
+
+def to_upper_case(lines):
+    calls['to_upper_case'] += 1
+    return (line.upper() for line in lines)
+
+
+def test_runs_all_stages_without_cached_outputs(tmp_path):
+    # given
+    calls.clear()
+    volume_filename = write_volume(tmp_path)
+    stages = [Stage(read_lines), Stage(to_upper_case)]
+
+    # when
+    result, statistics = StageCache(str(tmp_path / 'cache')).run(volume_filename, stages)
+
+    # then
+    assert result == ['FIRST', 'SECOND']
+    assert calls == {'read_lines': 1, 'to_upper_case': 1}
+    assert statistics == {('read_lines', 'miss'): 1, ('to_upper_case', 'miss'): 1}
+
+
+def test_reuses_cached_outputs(tmp_path):
+    # given
+    volume_filename = write_volume(tmp_path)
+    stages = [Stage(read_lines), Stage(to_upper_case)]
+    StageCache(str(tmp_path / 'cache')).run(volume_filename, stages)
+    calls.clear()
+
+    # when
+    result, statistics = StageCache(str(tmp_path / 'cache')).run(volume_filename, stages)
+
+    # then
+    assert result == ['FIRST', 'SECOND']
+    assert calls == {}
+    assert statistics == {('read_lines', 'hit'): 1, ('to_upper_case', 'hit'): 1}
+
+
+def test_reruns_only_changed_stage_and_later_stages(tmp_path):
+    # given
+    volume_filename = write_volume(tmp_path)
+    StageCache(str(tmp_path / 'cache')).run(
+        volume_filename, [Stage(read_lines), Stage(to_upper_case)]
+    )
+    calls.clear()
+
+    # when
+    _, statistics = StageCache(str(tmp_path / 'cache')).run(
+        volume_filename, [Stage(read_lines), Stage(to_upper_case, code='changed code')]
+    )
+
+    # then
+    assert calls == {'to_upper_case': 1}
+    assert statistics == {('read_lines', 'hit'): 1, ('to_upper_case', 'miss'): 1}
+
+
+def test_reruns_all_stages_when_input_changes(tmp_path):
+    # given
+    volume_filename = write_volume(tmp_path)
+    stages = [Stage(read_lines), Stage(to_upper_case)]
+    StageCache(str(tmp_path / 'cache')).run(volume_filename, stages)
+    write_volume(tmp_path, 'changed')
+
+    # when
+    result, statistics = StageCache(str(tmp_path / 'cache')).run(volume_filename, stages)
+
+    # then
+    assert result == ['CHANGED']
+    assert statistics == {('read_lines', 'miss'): 1, ('to_upper_case', 'miss'): 1}
+
+
+@pytest.fixture
+def stage_package(tmp_path, monkeypatch):
+    """A package with a stage importing a helper module, treated as part of the project"""
+    package_dir = tmp_path / 'stage_package'
+    package_dir.mkdir()
+    (package_dir / '__init__.py').write_text('')
+    (package_dir / 'stages.py').write_text(
+        'def add_suffix(lines):\n'
+        '    from .helpers import suffix\n'
+        '    return [line + suffix() for line in lines]\n'
+    )
+    write_helpers(package_dir, "'!'")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(stage_cache, 'PROJECT_DIR', str(tmp_path))
+    clear_source_caches()
+    yield package_dir
+    clear_source_caches()
+    for module_name in ['stage_package', 'stage_package.stages', 'stage_package.helpers']:
+        sys.modules.pop(module_name, None)
+
+
+def test_reruns_stage_when_imported_module_changes(tmp_path, stage_package):
+    # given
+    volume_filename = write_volume(tmp_path)
+    stages = importlib.import_module('stage_package.stages')
+    StageCache(str(tmp_path / 'cache')).run(
+        volume_filename, [Stage(read_lines), Stage(stages.add_suffix)]
+    )
+    write_helpers(stage_package, "'?!'")
+    clear_source_caches()
+    importlib.reload(importlib.import_module('stage_package.helpers'))
+
+    # when
+    result, statistics = StageCache(str(tmp_path / 'cache')).run(
+        volume_filename, [Stage(read_lines), Stage(stages.add_suffix)]
+    )
+
+    # then
+    assert result == ['first?!', 'second?!']
+    assert statistics == {('read_lines', 'hit'): 1, ('add_suffix', 'miss'): 1}
+
+
+def write_helpers(package_dir, suffix):
+    (package_dir / 'helpers.py').write_text(f'def suffix():\n    return {suffix}\n')
+
+
+def clear_source_caches():
+    stage_cache._module_source.cache_clear()
+    stage_cache._imported_project_modules.cache_clear()
+
+
+def write_volume(directory, content='first\nsecond'):
+    volume_path = directory / 'TA01_volume.xml'
+    volume_path.write_text(content)
+    return str(volume_path)
@@ -1,11 +1,14 @@
 import re
 from datetime import date
-from typing import Iterable
+from typing import Iterable, Match, Optional
 
 import nameparser
 
 from domain.citation import Citation, Person
 from domain.intermediate_citation import IntermediateCitation
+from .name_cache import NameCache
+
+name_cache = NameCache()
 
 
 def parse_citation_fields(citations: Iterable[IntermediateCitation]) -> Iterable[Citation]:
@@ -82,6 +85,14 @@ def parse_editors_or_translators(people):
 def parse_name(name):
     if not isinstance(name, str):
         return name
+    return name_cache.get(name, _parse_name)
+
+
+def warm_name_cache(persons: Iterable[Person]):
+    name_cache.warm(persons)
+
+
+def _parse_name(name: str) -> Person:
     parsed_name = nameparser.HumanName(name)
     return Person(
         first=parsed_name.first if parsed_name.first else None,
@@ -117,42 +128,65 @@ issues_pattern = r'(?:(?P<issue>\d{1,3})|(?P<issueStart>\d{1,3})[-—](?P<issueE
 volume_pattern = r'(?:(?P<volume>\d{1,2})|(?P<volumeStart>\d{1,2})[-—](?P<volumeEnd>\d{1,2}))'
 journal_pattern = r'(?P<journal>(?:[^\W\d_]|[\- ])+?)'
 
-reference_patterns = [
-    ('ta', re.compile(r'^TA *(?P<volume>\d+)\. *(?P<number>\d+)(?:\. *%s)?$' % pages_pattern)),
-]
-reference_patterns.extend(
-    [('journal',
-      re.compile('^' + journal_pattern + ' *' + r'\. *'.join(sub_patterns) + '$', re.UNICODE))
-     for sub_patterns in [
-         (volume_pattern, issues_pattern, year_pattern, pages_pattern),
-         (volume_pattern, issues_pattern, pages_pattern),
-         (year_pattern, issues_pattern, pages_pattern),
-         (volume_pattern, year_pattern, pages_pattern),
-         (year_pattern, pages_pattern),
-         (year_pattern,),
-     ]],
+ta_reference_pattern = re.compile(
+    r'^TA *(?P<volume>\d+)\. *(?P<number>\d+)(?:\. *%s)?$' % pages_pattern
 )
+journal_reference_shapes = [
+    (volume_pattern, issues_pattern, year_pattern, pages_pattern),
+    (volume_pattern, issues_pattern, pages_pattern),
+    (year_pattern, issues_pattern, pages_pattern),
+    (volume_pattern, year_pattern, pages_pattern),
+    (year_pattern, pages_pattern),
+    (year_pattern,),
+]
+# Only the separators between the parts and the 'S.' before the pages contain a dot, so a
+# journal reference with n dots has n or n + 1 parts.
+journal_reference_patterns_by_dots = {
+    dots: [
+        re.compile('^' + journal_pattern + ' *' + r'\. *'.join(shape) + '$', re.UNICODE)
+        for shape in journal_reference_shapes
+        if len(shape) in (dots, dots + 1)
+    ]
+    for dots in range(max(map(len, journal_reference_shapes)) + 1)
+}
 
 
 def parse_reference(raw_reference):
     if not isinstance(raw_reference, str):
         return None
     raw_reference = raw_reference.strip('. ')
-    for reference_type, reference_pattern in reference_patterns:
-        reference_match = reference_pattern.search(raw_reference)
+    reference_match = match_reference(raw_reference)
+    if reference_match:
+        group_dict = {}
+        for key, value in reference_match.groupdict().items():
+            if value is None:
+                continue
+            if value.isdigit():
+                if key == 'yearEnd' and len(value) == 2:
+                    value = str(group_dict['yearStart'])[:2] + value
+                value = int(value)
+            group_dict[key] = value
+        group_dict['type'] = 'ta' if reference_match.re is ta_reference_pattern else 'journal'
+        group_dict['raw'] = raw_reference
+        return group_dict or None
+
+
+def match_reference(reference: str) -> Optional[Match]:
+    """
+    Match a reference like 'TA 12.345' or 'POF 20-21.1970/71 (1974).213-221'.
+
+    Instead of trying the pattern of every shape of journal reference in turn, only the
+    patterns of the shapes with as many parts as the dots in the reference allow are tried.
+    """
+    if reference.startswith('TA'):
+        ta_match = ta_reference_pattern.match(reference)
+        if ta_match:
+            return ta_match
+    for reference_pattern in journal_reference_patterns_by_dots.get(reference.count('.'), ()):
+        reference_match = reference_pattern.match(reference)
         if reference_match:
-            group_dict = reference_match.groupdict()
-            for key, value in list(group_dict.items())[:]:
-                if value is None:
-                    del group_dict[key]
-                    continue
-                if value.isdigit():
-                    if key == 'yearEnd' and len(value) == 2:
-                        value = str(group_dict['yearStart'])[:2] + value
-                    group_dict[key] = int(value)
-            group_dict['type'] = reference_type
-            group_dict['raw'] = raw_reference
-            return group_dict or None
+            return reference_match
+    return None
 
 
 def parse_material(material):
@@ -1,55 +1,80 @@
 import re
 from dataclasses import replace
 from operator import itemgetter
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Optional
 
 from domain.citation import Citation
 
 raw_keyword_pattern = re.compile(r'(?P<code>[A-Za-z]+)(?:\..+)?')
 
 
+class KeywordResolver(object):
+    """
+    Resolves raw keyword headings (e.g. 'AB. Forschungsbetrieb') to keywords of the mapping.
+
+    The super keywords of all codes are built once, and each distinct raw heading is only
+    resolved once. The same keyword dicts are thus shared by all citations with the same
+    heading and must not be modified.
+    """
+
+    def __init__(self, keyword_mapping: Dict[str, Dict[str, str]]):
+        self._keyword_mapping = keyword_mapping
+        self._keywords_by_code: Dict[str, dict] = {}
+        for code in sorted(keyword_mapping, key=len):
+            self._keyword_without_raw(code)
+        self._keywords_by_raw: Dict[str, dict] = {}
+
+    def resolve(self, raw_keyword: str) -> dict:
+        keyword = self._keywords_by_raw.get(raw_keyword)
+        if keyword is None:
+            keyword = self._keywords_by_raw[raw_keyword] = self._resolve(raw_keyword)
+        return keyword
+
+    def _resolve(self, raw_keyword: str) -> dict:
+        raw_keyword = fix_ocr_errors(raw_keyword)
+        code = extract_keyword_code(raw_keyword)
+        if not code:
+            return {'raw': raw_keyword}
+        if code.upper() in self._keyword_mapping:
+            return {**self._keywords_by_code[code.upper()], 'raw': raw_keyword}
+        return {'raw': raw_keyword, 'code': code}
+
+    def _keyword_without_raw(self, code: str) -> Optional[dict]:
+        """Return the keyword for `code` as it is used as a super keyword"""
+        if not code:
+            return None
+        if code.upper() in self._keyword_mapping:
+            code = code.upper()
+            keyword = self._keywords_by_code.get(code)
+            if keyword is None:
+                keyword = self._keywords_by_code[code] = {
+                    'code': code,
+                    'nameDE': self._keyword_mapping[code]['de'],
+                    'nameEN': self._keyword_mapping[code]['en'],
+                    'raw': None,
+                    'super': self._keyword_without_raw(code[:-1]),
+                }
+            return keyword
+        return {'raw': None, 'code': code}
+
+
 def normalize_keywords(
         citations: Iterable[Citation], keyword_mapping: Dict[str, Dict[str, str]]
 ) -> Iterable[Citation]:
-    return (normalize_keywords_for_citation(citation, keyword_mapping) for citation in citations)
+    keyword_resolver = KeywordResolver(keyword_mapping)
+    return (normalize_keywords_for_citation(citation, keyword_resolver) for citation in citations)
 
 
-def normalize_keywords_for_citation(citation: Citation, keyword_mapping: Dict[str, Dict[str, str]]):
-    keywords = []
-    for unparsed_keyword in map(itemgetter('raw'), citation.keywords):
-        unparsed_keyword = fix_ocr_errors(unparsed_keyword)
-        code = extract_keyword_code(unparsed_keyword)
-        if not code:
-            keywords.append({'raw': unparsed_keyword})
-            continue
-        keyword = make_keyword(code, keyword_mapping, unparsed_keyword)
-        keywords.append(keyword)
+def normalize_keywords_for_citation(citation: Citation, keyword_resolver: KeywordResolver):
+    keywords = [
+        keyword_resolver.resolve(raw_keyword)
+        for raw_keyword in map(itemgetter('raw'), citation.keywords)
+    ]
     if keywords:
         citation = replace(citation, keywords=keywords)
     return citation
 
 
-def make_keyword(code, keyword_mapping, raw_keyword=None):
-    if not code:
-        return
-    if code.upper() in keyword_mapping:
-        code = code.upper()
-        keyword = {
-            'code': code,
-            'nameDE': keyword_mapping[code]['de'],
-            'nameEN': keyword_mapping[code]['en'],
-            'raw': raw_keyword,
-            'super': make_keyword(code[:-1], keyword_mapping)
-        }
-
-    else:
-        keyword = {
-            'raw': raw_keyword,
-            'code': code,
-        }
-    return keyword
-
-
 def extract_keyword_code(raw_keyword):
     raw_keyword = fix_ocr_errors(raw_keyword)
     raw_keyword_match = raw_keyword_pattern.fullmatch(raw_keyword)
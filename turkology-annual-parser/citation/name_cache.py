@@ -0,0 +1,111 @@
+import hashlib
+import logging
+import os
+import pickle
+import zlib
+from collections import Counter, OrderedDict
+from typing import Callable, Iterable, List
+
+import nameparser
+
+from caching.file_cache import FileCache
+from domain.citation import Citation, Person
+
+DEFAULT_MAX_NAMES = 100000
+NAME_CACHE_VERSION = 2  # Increment when the format of the stored names changes
+
+
+class NameCache(object):
+    """
+    Memoizes parsed names, so that each distinct raw name is only parsed once per process.
+
+    The same names recur in every volume, as the same scholars publish every year. When more
+    than `max_size` names have been parsed, the least recently used names are forgotten.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_NAMES):
+        self.max_size = max_size
+        self._persons: 'OrderedDict[str, Person]' = OrderedDict()
+        self._statistics: Counter = Counter()
+
+    def get(self, name: str, parse: Callable[[str], Person]) -> Person:
+        person = self._persons.get(name)
+        if person is not None:
+            self._persons.move_to_end(name)
+            self._statistics['hit'] += 1
+            return person
+        self._statistics['miss'] += 1
+        person = parse(name)
+        self._add(name, person)
+        return person
+
+    def warm(self, persons: Iterable[Person]):
+        """Add names parsed before, e.g. in a previous run"""
+        for person in persons:
+            if isinstance(person.raw, str) and person.raw not in self._persons:
+                self._add(person.raw, person)
+
+    def statistics(self) -> Counter:
+        """Return the number of names found in the cache ('hit') and parsed ('miss')"""
+        return self._statistics.copy()
+
+    def __len__(self):
+        return len(self._persons)
+
+    def _add(self, name: str, person: Person):
+        self._persons[name] = person
+        if len(self._persons) > self.max_size:
+            self._persons.popitem(last=False)
+
+
+class NameCacheFile(object):
+    """
+    Stores parsed names between runs, keyed by cache version, nameparser version and `code`,
+    the source code of the parsing of names (see caching.stage_cache.module_source).
+    """
+
+    def __init__(self, cache_dir: str, code: str):
+        self._file_cache = FileCache(os.path.join(cache_dir, 'names'))
+        code_digest = hashlib.sha256(code.encode('utf-8')).hexdigest()
+        self._key = (
+            f'names-v{NAME_CACHE_VERSION}-nameparser-{nameparser.__version__}-{code_digest}'
+        )
+
+    def load(self) -> List[Person]:
+        data = self._file_cache.get(self._key)
+        if data is None:
+            return []
+        persons = [
+            Person(first=first, middle=middle, last=last, raw=raw)
+            for first, middle, last, raw in pickle.loads(zlib.decompress(data))
+        ]
+        logging.debug(f'Loaded {len(persons)} cached names')
+        return persons
+
+    def save(self, persons: Iterable[Person]):
+        fields = list({
+            person.raw: (person.first, person.middle, person.last, person.raw)
+            for person in persons if isinstance(person.raw, str)
+        }.values())[-DEFAULT_MAX_NAMES:]
+        self._file_cache.put(
+            self._key, zlib.compress(pickle.dumps(fields, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        )
+        logging.debug(f'Cached {len(fields)} names')
+
+
+def persons_in_citations(citations: Iterable[Citation]) -> List[Person]:
+    return [
+        person
+        for citation in citations
+        for person in (*citation.authors, *citation.editors, *citation.translators)
+        if isinstance(person, Person)
+    ]
+
+
+def format_statistics(statistics: Counter) -> str:
+    lookups = statistics['hit'] + statistics['miss']
+    hit_rate = statistics['hit'] / lookups if lookups else 0
+    return (
+        f'{statistics["hit"]} hits, {statistics["miss"]} misses '
+        f'({hit_rate:.1%} of {lookups} names)'
+    )
@@ -0,0 +1,70 @@
+from dataclasses import fields, replace
+from typing import Any, List, Optional, TypeVar, Union
+
+from domain.citation import Citation, CitationType
+from domain.intermediate_citation import IntermediateCitation
+
+FIELD_NAMES = frozenset(field.name for field in fields(IntermediateCitation))
+
+CitationLike = TypeVar('CitationLike', bound=Union[IntermediateCitation, Citation, 'ParseContext'])
+
+
+class ParseContext(object):
+    """
+    A mutable copy of an IntermediateCitation for the steps of citation parsing.
+
+    The steps change the context in place instead of copying the citation for every change,
+    and the result is frozen into an IntermediateCitation once at the end. Its fields are
+    those of IntermediateCitation.
+    """
+
+    volume: Optional[int]
+    number: Optional[str]
+    title: Optional[str]
+    authors: Optional[str]
+    editors: Optional[str]
+    translators: Optional[str]
+    date: Optional[str]
+    keywords: List[str]
+    comment: Optional[str]
+    published_in: Optional[str]
+    number_of_pages: Optional[str]
+    number_of_volumes: Optional[str]
+    reviews: Optional[str]
+    abstract_in: Optional[str]
+    location: Optional[str]
+    material: List[str]
+    amendments: List[str]
+    date_published: Optional[str]
+    type: Optional[CitationType]
+    ta_references: Optional[str]
+    page_range: Optional[str]
+    series: Optional[str]
+    remaining_text: str
+    page_start: Optional[str]
+    page_end: Optional[str]
+    raw_text: str
+
+    def __init__(self, citation: IntermediateCitation):
+        for field_name in FIELD_NAMES:
+            setattr(self, field_name, getattr(citation, field_name))
+
+    def update(self, **changes: Any):
+        unknown_fields = changes.keys() - FIELD_NAMES
+        if unknown_fields:
+            raise TypeError(f'Unknown citation fields: {", ".join(sorted(unknown_fields))}')
+        self.__dict__.update(changes)
+
+    def freeze(self) -> IntermediateCitation:
+        return IntermediateCitation(**self.__dict__)
+
+    def __str__(self):
+        return str(self.freeze())
+
+
+def replace_fields(citation: CitationLike, **changes: Any) -> CitationLike:
+    """Like dataclasses.replace(), but changes a ParseContext in place instead of copying it"""
+    if isinstance(citation, ParseContext):
+        citation.update(**changes)
+        return citation
+    return replace(citation, **changes)
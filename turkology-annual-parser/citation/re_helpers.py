@@ -1,4 +1,6 @@
-from typing import Optional
+from typing import Dict, FrozenSet, Iterable, Optional
+
+import regex
 
 
 class group():
@@ -15,3 +17,41 @@ class group():
 
     def __str__(self):
         return self.string
+
+
+class CaseInsensitiveAlphabet(object):
+    """
+    The characters of a set of patterns, matched against text characters ignoring case.
+
+    Matches exactly like the regex module does with IGNORECASE, which is not transitive:
+    'I' matches 'i' and 'ı', but 'i' does not match 'ı'.
+    """
+
+    def __init__(self, pattern_chars: Iterable[str] = ()):
+        self._patterns: Dict[str, regex.Pattern] = {}
+        self._matching_pattern_chars: Dict[str, FrozenSet[str]] = {}
+        self.add(pattern_chars)
+
+    def add(self, pattern_chars: Iterable[str]):
+        new_patterns = {
+            char: regex.compile(regex.escape(char), regex.IGNORECASE)
+            for char in set(pattern_chars) - self._patterns.keys()
+        }
+        self._patterns.update(new_patterns)
+        for text_char, matching_chars in self._matching_pattern_chars.items():
+            self._matching_pattern_chars[text_char] = matching_chars.union(
+                _matching_chars(new_patterns, text_char)
+            )
+
+    def matching_pattern_chars(self, text_char: str) -> FrozenSet[str]:
+        """Return the pattern characters which match `text_char`"""
+        if text_char not in self._matching_pattern_chars:
+            self._matching_pattern_chars[text_char] = _matching_chars(self._patterns, text_char)
+        return self._matching_pattern_chars[text_char]
+
+
+def _matching_chars(patterns: Dict[str, regex.Pattern], text_char: str) -> FrozenSet[str]:
+    return frozenset(
+        pattern_char for pattern_char, pattern in patterns.items()
+        if pattern.fullmatch(text_char)
+    )
@@ -1,6 +1,8 @@
 from domain.citation import CitationType
 from domain.intermediate_citation import IntermediateCitation
-from ..citation_parsing import parse_citation
+from ..citation_parsing import (
+    PARSING_STEPS, number_rest_pattern, parse_citation, review_pattern
+)
 from ..field_parsing import parse_fields_in_citation
 
 
@@ -104,7 +106,7 @@ def test_13_1584():
                                     'keine beruflichen Chancen in Deutschland?'
     assert parsed_citation.authors[0].first == 'Ursula'
     assert parsed_citation.authors[0].last == 'Mehrländer'
-    assert parsed_citation.fully_parsed()
+    assert parsed_citation.is_fully_parsed
 
 
 def test_12_2023():
@@ -152,79 +154,108 @@ def parse_citation_and_fields(raw_text):
     return parsed_citation
 
 
-def test_does_not_crash():
-    citations = [
-        '337. Özkirimli, Atillâ   Nedim. [Istanbul, 1974],'
-        '  175 S. [Der Dichter Nedīm, ca. 1681-1730.]',
+RAW_CITATIONS = [
+    '337. Özkirimli, Atillâ   Nedim. [Istanbul, 1974],'
+    '  175 S. [Der Dichter Nedīm, ca. 1681-1730.]',
+
+    "301. Yotjnous, Emre   Poèmes. Guzine Dino—Marc Delouze trs. Paris, 1973, 41 S.",
+
+    "863. Nye, Roger P.   The military in Turkish politics, 1960-1973. Diss., "
+    "Washington University, 1974, 302 S. (UM 74-22,540)."
+    " Abstract in: DAI 35.4.1974-1975.2358-A.",
 
-        "301. Yotjnous, Emre   Poèmes. Guzine Dino—Marc Delouze trs. Paris, 1973, 41 S.",
+    "222. Süleyman the Magnificent and his age [s.TA 22 - 23.293]. "
+    "Rez. György domokos, 110.4.1997.814.",
 
-        "863. Nye, Roger P.   The military in Turkish politics, 1960-1973. Diss., "
-        "Washington University, 1974, 302 S. (UM 74-22,540)."
-        " Abstract in: DAI 35.4.1974-1975.2358-A.",
+    "9. Dërfer, G.    0 sostojanii tjurkologii v Federativnoj Respublike Germanii. "
+    "In: ST 1974.6.98-109. [Die Turkologie in der Bundesrepublik Deutschland.]",
 
-        "222. Süleyman the Magnificent and his age [s.TA 22 - 23.293]. "
-        "Rez. György domokos, 110.4.1997.814.",
+    "1272. DEVECI, Hasan A.    Cyprus yesterday, today — what next? "
+    "London, 1976, 1 + 60 S. (Cyprus Turkish Association, 2).",
 
-        "9. Dërfer, G.    0 sostojanii tjurkologii v Federativnoj Respublike Germanii. "
-        "In: ST 1974.6.98-109. [Die Turkologie in der Bundesrepublik Deutschland.]",
+    "660. Kramer, Gerhard F.—McGrew, Roderick E.  "
+    "Potemkin, the Porte, and the road to Tsargrad. The Shumla negotiations, 1789-1790. "
+    "In: CASS 8.4.1974.467-487.",
 
-        "1272. DEVECI, Hasan A.    Cyprus yesterday, today — what next? "
-        "London, 1976, 1 + 60 S. (Cyprus Turkish Association, 2).",
+    "1226. Pollo, St. - Pulaha, S.     Akte të Rilindjes kombëtare shqiptare 1878-1912 "
+    "[s. TA 5.1496, 6.1621].",
 
-        "660. Kramer, Gerhard F.—McGrew, Roderick E.  "
-        "Potemkin, the Porte, and the road to Tsargrad. The Shumla negotiations, 1789-1790. "
-        "In: CASS 8.4.1974.467-487.",
+    '1018. PlNON, Pierre       Les villes du pont vues par le Père de Jerphanion.      e g '
+    'Tokat, Amasya, Sivas. In: TA 25.240.859-865.                                      CO Ό',
 
-        "1226. Pollo, St. - Pulaha, S.     Akte të Rilindjes kombëtare shqiptare 1878-1912 "
-        "[s. TA 5.1496, 6.1621].",
+    '3. Biographisches Lexikon zur Geschichte Südosteuropas. '
+    'Mathias Bernath und Felix v. Schroeder ed., Gerda Bartl (Red.). Bd. 1, Α-F. '
+    'München, 1974, XV+557 S. (Südosteuropäische Arbeiten, 75). '
+    'Rez. Gerhard Stadler, Donauraum 19.3.-4.1974.209. — Johann Weidlein, SODV 23.3.1974.218.',
 
-        '1018. PlNON, Pierre       Les villes du pont vues par le Père de Jerphanion.      e g '
-        'Tokat, Amasya, Sivas. In: TA 25.240.859-865.                                      CO Ό',
+    '701. Brouček, Peter-LEiτscH, Walter-VocELKA, Karl—Wimmer, Jan-Wój-cıκ, Zbigniew '
+    'Der Sieg bei Wien 1683. Wien-Warszawa, 1983, 187 S. 70 Abb., 4 Schlachtpläne, 1 Faltplan.',
 
-        '3. Biographisches Lexikon zur Geschichte Südosteuropas. '
-        'Mathias Bernath und Felix v. Schroeder ed., Gerda Bartl (Red.). Bd. 1, Α-F. '
-        'München, 1974, XV+557 S. (Südosteuropäische Arbeiten, 75). '
-        'Rez. Gerhard Stadler, Donauraum 19.3.-4.1974.209. — Johann Weidlein, SODV 23.3.1974.218.',
+    '117. Leningrad, 2.-4. VI. 1969: III Tjurkologičeskaja konferencija. '
+    '3. Turkologische Konferenz; die Referate sind abgedruckt in TA 1.89. '
+    'Bericht: V.G.Guzev,N. A.Dulina,L. Ju.Tuguševa, TA 1.89.403-412.',
 
-        '701. Brouček, Peter-LEiτscH, Walter-VocELKA, Karl—Wimmer, Jan-Wój-cıκ, Zbigniew '
-        'Der Sieg bei Wien 1683. Wien-Warszawa, 1983, 187 S. 70 Abb., 4 Schlachtpläne, 1 Faltplan.',
+    '879. ALLAMANI,   E.-PANAYOTOPOULOU, Κ.      ΊΙ   συμμαχική  εντολή για τήν κατάληψη της '
+    'Σμύρνης και ή δραστηριοποίηση της ελληνικής ηγεσίας. In: ΤΑ 7.160.119-172 '
+    '[The Allied decision concerning the Greek mandate on the occupation of Smyrna.]',
 
-        '117. Leningrad, 2.-4. VI. 1969: III Tjurkologičeskaja konferencija. '
-        '3. Turkologische Konferenz; die Referate sind abgedruckt in TA 1.89. '
-        'Bericht: V.G.Guzev,N. A.Dulina,L. Ju.Tuguševa, TA 1.89.403-412.',
+    '291. Fourtis, Georgios N. Στρατıωτıκòv fλλη vo-τoυpκıκòv λεξıκóv. 2 Bde. Athenai, 1977. '
+    '[Militärisches Fachwörterbuch Griechisch-Türkisch.]',
 
-        '879. ALLAMANI,   E.-PANAYOTOPOULOU, Κ.      ΊΙ   συμμαχική  εντολή για τήν κατάληψη της '
-        'Σμύρνης και ή δραστηριοποίηση της ελληνικής ηγεσίας. In: ΤΑ 7.160.119-172 '
-        '[The Allied decision concerning the Greek mandate on the occupation of Smyrna.]',
+    '16. Kononov, Α. N. Nekotorye itogi razvitija sovetskoj tjurkologii i zadaci Sovetskogo '
+    'komiteta tjurkologov. In: ST 1974.2.3-12. [Einige Ergebnisse der Entwicklung der '
+    'sowjetischen Turkologie und die Aufgaben des Sowjetischen Komitee der Turkologen.]',
 
-        '291. Fourtis, Georgios N. Στρατıωτıκòv fλλη vo-τoυpκıκòv λεξıκóv. 2 Bde. Athenai, 1977. '
-        '[Militärisches Fachwörterbuch Griechisch-Türkisch.]',
+    '1. Lexikon der islamischen Welt. Klaus Kreiser, Werner Diem, Hans Georg Majer ed. 3 Bde., '
+    'Stuttgart, 1974 (Urban-Taschenbücher, 200/1-3).',
 
-        '16. Kononov, Α. N. Nekotorye itogi razvitija sovetskoj tjurkologii i zadaci Sovetskogo '
-        'komiteta tjurkologov. In: ST 1974.2.3-12. [Einige Ergebnisse der Entwicklung der '
-        'sowjetischen Turkologie und die Aufgaben des Sowjetischen Komitee der Turkologen.]',
+    '200. Ramazanov, K. T. Türk dillärinin ğänub-ğarb ġrupunda ġoša sözlär '
+    '(jemäk-ičmäk adları). ADI 1974.2.51-60. '
+    '[Wortpaare in den südwestlichen Turksprachen: Speisen und Getränke. Russ. Res.]',
 
-        '1. Lexikon der islamischen Welt. Klaus Kreiser, Werner Diem, Hans Georg Majer ed. 3 Bde., '
-        'Stuttgart, 1974 (Urban-Taschenbücher, 200/1-3).',
+    '2392. Johnson,   C.   D.      Regular   disharmony   in   Kirghiz.   In: TA 10.274.8^-99.',
 
-        '200. Ramazanov, K. T. Türk dillärinin ğänub-ğarb ġrupunda ġoša sözlär '
-        '(jemäk-ičmäk adları). ADI 1974.2.51-60. '
-        '[Wortpaare in den südwestlichen Turksprachen: Speisen und Getränke. Russ. Res.]',
+    '954. Ebied, R. Y.—M. J. L. Young. A list of Ottoman governors of Aleppo, A. H. 1002-1168. '
+    'In: AION 34.1.1974.103-108.',
 
-        '2392. Johnson,   C.   D.      Regular   disharmony   in   Kirghiz.   In: TA 10.274.8^-99.',
+    '191. Ljubljana (Laibach), 4.-5. XII. 1975: '
+    'Jugoslovenska orijentalistika i nesvrstani svijet '
+    '[Die jugoslavische Orientalistik und die blockfreie Welt].',
 
-        '954. Ebied, R. Y.—M. J. L. Young. A list of Ottoman governors of Aleppo, A. H. 1002-1168. '
-        'In: AION 34.1.1974.103-108.',
+    '3. Biographisches Lexikon zur Geschichte Südosteuropas [s. TA 1.3, 2.3, 3.3].',
+]
 
-        '191. Ljubljana (Laibach), 4.-5. XII. 1975: '
-        'Jugoslovenska orijentalistika i nesvrstani svijet '
-        '[Die jugoslavische Orientalistik und die blockfreie Welt].',
 
-        '3. Biographisches Lexikon zur Geschichte Südosteuropas [s. TA 1.3, 2.3, 3.3].',
-    ]
-    for raw_citation in citations:
+def test_does_not_crash():
+    for raw_citation in RAW_CITATIONS:
         parsed_citation = parse_citation(IntermediateCitation(volume=1, raw_text=raw_citation))
         assert parsed_citation.number.isdigit()
         assert parsed_citation.raw_text == raw_citation
         assert isinstance(parsed_citation, IntermediateCitation)
+
+
+def test_parses_like_steps_on_frozen_citations():
+    for raw_citation in RAW_CITATIONS:
+        # given
+        number, remaining_text = number_rest_pattern.match(raw_citation).groups()
+        expected_citation = IntermediateCitation(
+            volume=1, raw_text=raw_citation, number=number, remaining_text=remaining_text
+        )
+        for step in PARSING_STEPS:
+            expected_citation = step(expected_citation)
+
+        # when
+        parsed_citation = parse_citation(IntermediateCitation(volume=1, raw_text=raw_citation))
+
+        # then
+        assert parsed_citation == expected_citation
+
+
+def test_review_pattern_distinguishes_reviews_and_abstracts():
+    review_match = review_pattern.search('Some title. Rez. Wilhelm Wagner, ÖO 15.4.1973.443-445')
+    abstract_match = review_pattern.search('Some title.  Abstract in: TA 12.345')
+
+    assert review_match.group('review_marker')
+    assert review_match.group('reviews_or_abstracts') == 'Wilhelm Wagner, ÖO 15.4.1973.443-445'
+    assert abstract_match.group('abstract_marker')
+    assert abstract_match.group('reviews_or_abstracts') == 'TA 12.345'
@@ -1,6 +1,15 @@
+import json
+import random
+import re
+
+import pytest
+
 from domain.citation import Citation, Person, CitationType
 from domain.intermediate_citation import IntermediateCitation
-from ..field_parsing import parse_fields_in_citation
+from ..field_parsing import (
+    issues_pattern, journal_pattern, pages_pattern, parse_fields_in_citation, parse_reference,
+    volume_pattern, year_pattern
+)
 
 CITATION = IntermediateCitation(
     remaining_text='{{{ title }}}.  {{{ editors }}}   {{{ number_of_volumes }}} '
@@ -51,3 +60,96 @@ def test_parse_citation_fields():
         remaining_text='{{{ title }}}.  {{{ editors }}}   {{{ number_of_volumes }}} '
                        '{{{ location }}} {{{ date_published }}}{{{ series }}}.'
     )
+
+
+@pytest.mark.parametrize('raw_reference,reference', [
+    ('TA 26.314.235-243', {
+        'volume': 26, 'number': 314, 'pageStart': 235, 'pageEnd': 243, 'type': 'ta',
+        'raw': 'TA 26.314.235-243',
+    }),
+    ('POF 20-21.1970/71 (1974).213-221.', {
+        'journal': 'POF', 'volumeStart': 20, 'volumeEnd': 21, 'yearStart': 1970, 'yearEnd': 1971,
+        'yearParentheses': 1974, 'pageStart': 213, 'pageEnd': 221, 'type': 'journal',
+        'raw': 'POF 20-21.1970/71 (1974).213-221',
+    }),
+    ('ÖO 15.4.1973.S. 443-445', {
+        'journal': 'ÖO', 'volume': 15, 'issue': 4, 'year': 1973, 'pageStart': 443,
+        'pageEnd': 445, 'type': 'journal', 'raw': 'ÖO 15.4.1973.S. 443-445',
+    }),
+    ('Belleten 1974', {'journal': 'Belleten', 'year': 1974, 'type': 'journal',
+                       'raw': 'Belleten 1974'}),
+    ('TA 26', None),
+    ('Türk Dili', None),
+    (None, None),
+])
+def test_parse_reference(raw_reference, reference):
+    assert parse_reference(raw_reference) == reference
+
+
+def test_parse_reference_like_regexes():
+    # given
+    rng = random.Random(42)
+    raw_references = [_random_reference(rng) for _ in range(20000)]
+
+    # when
+    references = [parse_reference(raw_reference) for raw_reference in raw_references]
+
+    # then
+    expected_references = [
+        _parse_reference_with_regexes(raw_reference) for raw_reference in raw_references
+    ]
+    for reference, expected_reference in zip(references, expected_references):
+        assert json.dumps(reference) == json.dumps(expected_reference)
+    assert sum(1 for reference in references if reference) > 1000
+
+
+def _parse_reference_with_regexes(raw_reference):
+    """parse_reference() as it was before the reference was split into its parts"""
+    reference_patterns = [('ta', re.compile(
+        r'^TA *(?P<volume>\d+)\. *(?P<number>\d+)(?:\. *%s)?$' % pages_pattern
+    ))]
+    reference_patterns.extend([
+        ('journal', re.compile(
+            '^' + journal_pattern + ' *' + r'\. *'.join(sub_patterns) + '$', re.UNICODE
+        ))
+        for sub_patterns in [
+            (volume_pattern, issues_pattern, year_pattern, pages_pattern),
+            (volume_pattern, issues_pattern, pages_pattern),
+            (year_pattern, issues_pattern, pages_pattern),
+            (volume_pattern, year_pattern, pages_pattern),
+            (year_pattern, pages_pattern),
+            (year_pattern,),
+        ]
+    ])
+    if not isinstance(raw_reference, str):
+        return None
+    raw_reference = raw_reference.strip('. ')
+    for reference_type, reference_pattern in reference_patterns:
+        reference_match = reference_pattern.search(raw_reference)
+        if reference_match:
+            group_dict = reference_match.groupdict()
+            for key, value in list(group_dict.items())[:]:
+                if value is None:
+                    del group_dict[key]
+                    continue
+                if value.isdigit():
+                    if key == 'yearEnd' and len(value) == 2:
+                        value = str(group_dict['yearStart'])[:2] + value
+                    group_dict[key] = int(value)
+            group_dict['type'] = reference_type
+            group_dict['raw'] = raw_reference
+            return group_dict or None
+
+
+def _random_reference(rng):
+    numbers = ['1', '12', '123', '1974', '1970/71', '1973-1974', '1974 (1975)', '20-21', '٣']
+    parts = [rng.choice(numbers) for _ in range(rng.randint(1, 5))]
+    if rng.random() < 0.5:
+        parts[-1] = rng.choice(['S. ', 'S.', 'S.  ', 'S']) + parts[-1]
+    separators = ['.', '. ', '.  ', '..', ' ', '']
+    reference = rng.choice(['TA ', 'TA', 'POF ', 'ÖO', 'Türk Dili ', 'A-B ', ' ', '', 'X1 '])
+    reference += parts[0] + ''.join(rng.choice(separators) + part for part in parts[1:])
+    chars = list(reference + rng.choice(['', '.', ' .', '\n', '.\n']))
+    if rng.random() < 0.2:
+        chars.insert(rng.randrange(len(chars) + 1), rng.choice('.- S—(),\n'))
+    return ''.join(chars)
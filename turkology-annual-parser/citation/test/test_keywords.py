@@ -1,5 +1,5 @@
 from domain.citation import Citation
-from ..keywords import normalize_keywords_for_citation
+from ..keywords import KeywordResolver, normalize_keywords_for_citation
 
 
 def test_normalize_keywords():
@@ -9,7 +9,7 @@ def test_normalize_keywords():
     keyword_mapping = {
         'A': {'de': 'Allgemeines', 'en': 'General'}
     }
-    citation = normalize_keywords_for_citation(citation, keyword_mapping)
+    citation = normalize_keywords_for_citation(citation, KeywordResolver(keyword_mapping))
     assert citation.keywords == [
         {
             'code': 'A',
@@ -29,7 +29,7 @@ def test_normalize_keywords_with_super_keyword():
         'A': {'de': 'Allgemeines', 'en': 'General'},
         'AB': {'de': 'Spezielles', 'en': 'Specific'}
     }
-    citation = normalize_keywords_for_citation(citation, keyword_mapping)
+    citation = normalize_keywords_for_citation(citation, KeywordResolver(keyword_mapping))
     assert citation.keywords == [
         {
             'code': 'AB',
@@ -45,3 +45,43 @@ def test_normalize_keywords_with_super_keyword():
             }
         }
     ]
+
+
+def test_normalize_keywords_with_unknown_code_and_super_keyword():
+    citation = Citation(
+        keywords=[{'raw': 'XY. IRGENDWAS'}, {'raw': 'AB. IRGENDWAS'}, {'raw': '1. Irgendwas'}]
+    )
+    keyword_mapping = {
+        'AB': {'de': 'Spezielles', 'en': 'Specific'}
+    }
+    citation = normalize_keywords_for_citation(citation, KeywordResolver(keyword_mapping))
+    assert citation.keywords == [
+        {'raw': 'XY. IRGENDWAS', 'code': 'XY'},
+        {
+            'code': 'AB',
+            'nameDE': 'Spezielles',
+            'nameEN': 'Specific',
+            'raw': 'AB. IRGENDWAS',
+            'super': {'raw': None, 'code': 'A'}
+        },
+        {'raw': '1. Irgendwas'},
+    ]
+
+
+def test_shares_keywords_of_same_heading():
+    keyword_resolver = KeywordResolver({
+        'A': {'de': 'Allgemeines', 'en': 'General'},
+        'AB': {'de': 'Spezielles', 'en': 'Specific'},
+        'AC': {'de': 'Anderes', 'en': 'Other'},
+    })
+    citations = [
+        Citation(keywords=[{'raw': 'AB. IRGENDWAS'}]),
+        Citation(keywords=[{'raw': 'AB. IRGENDWAS'}]),
+        Citation(keywords=[{'raw': 'AC. IRGENDWAS'}]),
+    ]
+    first, second, third = [
+        normalize_keywords_for_citation(citation, keyword_resolver).keywords[0]
+        for citation in citations
+    ]
+    assert first is second
+    assert first['super'] is third['super']
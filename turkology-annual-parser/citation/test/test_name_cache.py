@@ -0,0 +1,67 @@
+from domain.citation import Person
+from ..field_parsing import parse_name
+from ..name_cache import NameCache, NameCacheFile
+
+CODE = 'def _parse_name(name): ...'
+KREISER = Person(first='Klaus', last='Kreiser', raw='Kreiser, Klaus')
+BAZIN = Person(first='Louis', last='Bazin', raw='Bazin, Louis')
+
+
+def test_parses_each_name_once():
+    # given
+    cache = NameCache()
+    parsed_names = []
+
+    def parse(name):
+        parsed_names.append(name)
+        return parse_name(name)
+
+    # when
+    persons = [cache.get(name, parse) for name in ['Kreiser, Klaus', 'Bazin, Louis'] * 3]
+
+    # then
+    assert persons == [KREISER, BAZIN] * 3
+    assert parsed_names == ['Kreiser, Klaus', 'Bazin, Louis']
+    assert cache.statistics() == {'hit': 4, 'miss': 2}
+
+
+def test_forgets_least_recently_used_names():
+    # given
+    cache = NameCache(max_size=2)
+    cache.warm([KREISER, BAZIN])
+    cache.get('Kreiser, Klaus', parse_name)
+
+    # when
+    cache.get('Majer, Hans Georg', parse_name)
+
+    # then
+    assert len(cache) == 2
+    cache.get('Kreiser, Klaus', parse_name)
+    cache.get('Bazin, Louis', parse_name)
+    assert cache.statistics() == {'hit': 2, 'miss': 2}
+
+
+def test_stores_names_between_runs(tmp_path):
+    # given
+    NameCacheFile(str(tmp_path), CODE).save([KREISER, BAZIN, KREISER])
+
+    # when
+    persons = NameCacheFile(str(tmp_path), CODE).load()
+
+    # then
+    assert persons == [KREISER, BAZIN]
+
+
+def test_loads_nothing_without_stored_names(tmp_path):
+    assert NameCacheFile(str(tmp_path), CODE).load() == []
+
+
+def test_loads_nothing_after_parsing_code_changed(tmp_path):
+    # given
+    NameCacheFile(str(tmp_path), CODE).save([KREISER, BAZIN])
+
+    # when
+    persons = NameCacheFile(str(tmp_path), CODE + '\n    return None').load()
+
+    # then
+    assert persons == []
@@ -0,0 +1,23 @@
+from typing import get_type_hints
+
+from domain.intermediate_citation import IntermediateCitation
+from ..parse_context import ParseContext, replace_fields
+
+
+def test_declares_the_fields_of_intermediate_citations():
+    assert get_type_hints(ParseContext) == get_type_hints(IntermediateCitation)
+
+
+def test_replaces_fields_in_place():
+    # given
+    citation = IntermediateCitation(number='12', remaining_text='Ankara 1972.')
+    context = ParseContext(citation)
+
+    # when
+    changed_context = replace_fields(context, location='Ankara', remaining_text='1972.')
+
+    # then
+    assert changed_context is context
+    assert context.freeze() == IntermediateCitation(
+        number='12', location='Ankara', remaining_text='1972.'
+    )
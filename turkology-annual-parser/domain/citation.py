@@ -3,6 +3,10 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import List, Optional
 
+from domain.slots import add_slots, slot_cached_property
+
+fully_parsed_pattern = re.compile(r'({{{\s*[\w_]+\s*}}}[., ]*)+')
+
 
 class CitationType(Enum):
     ARTICLE = 'article'
@@ -12,6 +16,7 @@ class CitationType(Enum):
     CONFERENCE = 'conference'
 
 
+@add_slots
 @dataclass(frozen=True)
 class Person:
     first: Optional[str] = None
@@ -20,6 +25,7 @@ class Person:
     raw: Optional[str] = None
 
 
+@add_slots
 @dataclass(frozen=True)
 class Citation:
     id: Optional[str] = None
@@ -49,6 +55,7 @@ class Citation:
     series: Optional[str] = None
     date: Optional[dict] = None
 
-    def fully_parsed(self) -> bool:
-        fully_parsed_pattern = re.compile(r'({{{\s*[\w_]+\s*}}}[., ]*)+')
+    @slot_cached_property
+    def is_fully_parsed(self) -> bool:
+        """Whether all of the text has been parsed into fields"""
         return fully_parsed_pattern.fullmatch(self.remaining_text) is not None
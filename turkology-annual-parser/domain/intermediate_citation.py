@@ -1,11 +1,12 @@
-import re
 from typing import List, Optional
 
 from dataclasses import dataclass, field
 
-from domain.citation import CitationType
+from domain.citation import CitationType, fully_parsed_pattern
+from domain.slots import add_slots, slot_cached_property
 
 
+@add_slots
 @dataclass(frozen=True)
 class IntermediateCitation:
     volume: Optional[int] = None
@@ -35,7 +36,7 @@ class IntermediateCitation:
     page_end: Optional[str] = None
     raw_text: str = ''
 
-    @property
-    def fully_parsed(self) -> bool:
-        fully_parsed_pattern = re.compile(r'({{{\s*[\w_]+\s*}}}[., ]*)+')
+    @slot_cached_property
+    def is_fully_parsed(self) -> bool:
+        """Whether all of the text has been parsed into fields"""
         return fully_parsed_pattern.fullmatch(self.remaining_text) is not None
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+from domain.slots import add_slots
+
 
 class ParagraphType(Enum):
     KEYWORD = 'keyword'
@@ -12,6 +14,7 @@ class ParagraphType(Enum):
     JOURNAL_SECTION_BEGIN = 'journal-section-begin'
 
 
+@add_slots
 @dataclass(frozen=True)
 class Paragraph:
     text: str
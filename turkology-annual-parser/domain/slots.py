@@ -0,0 +1,68 @@
+from dataclasses import FrozenInstanceError, fields
+from typing import Any, Callable, List
+
+
+def add_slots(cls):
+    """
+    Recreate a frozen dataclass with `__slots__` instead of a per-instance `__dict__`.
+
+    Like `dataclass(slots=True)`, which requires Python 3.10. Pickling is kept working by
+    `__getstate__` and `__setstate__`, as the default of restoring the slots with `setattr`
+    fails for frozen dataclasses. The values of `slot_cached_property`s get slots of their
+    own, which are neither pickled nor compared.
+    """
+    field_names = tuple(field.name for field in fields(cls))
+    namespace = dict(cls.__dict__)
+    for field_name in field_names:
+        namespace.pop(field_name, None)  # Default values would conflict with the slots
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    cache_slots = tuple(
+        value.slot_name
+        for value in namespace.values() if isinstance(value, slot_cached_property)
+    )
+    namespace['__slots__'] = field_names + cache_slots
+
+    def __getstate__(self) -> List[Any]:
+        return [getattr(self, field_name) for field_name in field_names]
+
+    def __setstate__(self, state: List[Any]):
+        for field_name, value in zip(field_names, state):
+            object.__setattr__(self, field_name, value)
+
+    # The generated methods refer to `cls`, which is not the class of the instances anymore
+    def __setattr__(self, name: str, value: Any):
+        raise FrozenInstanceError(f'cannot assign to field {name!r}')
+
+    def __delattr__(self, name: str):
+        raise FrozenInstanceError(f'cannot delete field {name!r}')
+
+    namespace['__setattr__'] = __setattr__
+    namespace['__delattr__'] = __delattr__
+    namespace['__getstate__'] = __getstate__
+    namespace['__setstate__'] = __setstate__
+    slots_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slots_cls.__qualname__ = cls.__qualname__
+    return slots_cls
+
+
+class slot_cached_property(object):
+    """
+    Like `functools.cached_property` (Python 3.8), but caches the value in a slot added by
+    `add_slots()`, as frozen dataclasses with slots have no `__dict__` to cache it in.
+    """
+
+    def __init__(self, function: Callable[[Any], Any]):
+        self.function = function
+        self.slot_name = f'_cached_{function.__name__}'
+        self.__doc__ = function.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return getattr(instance, self.slot_name)
+        except AttributeError:
+            value = self.function(instance)
+            object.__setattr__(instance, self.slot_name, value)
+            return value
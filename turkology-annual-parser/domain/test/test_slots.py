@@ -0,0 +1,52 @@
+import pickle
+from dataclasses import FrozenInstanceError, replace
+
+import pytest
+
+from ..citation import Citation, Person
+
+CITATION = Citation(
+    volume=1,
+    number=1,
+    title='Lexikon der islamischen Welt',
+    authors=[Person(first='Klaus', last='Kreiser', raw='Kreiser, Klaus')],
+)
+
+
+def test_has_no_instance_dict():
+    assert not hasattr(CITATION, '__dict__')
+
+
+def test_is_immutable():
+    with pytest.raises(FrozenInstanceError):
+        CITATION.title = 'Other title'
+    with pytest.raises(FrozenInstanceError):
+        CITATION.unknown_field = 'value'
+    with pytest.raises(FrozenInstanceError):
+        del CITATION.title
+
+
+def test_can_be_replaced_and_pickled():
+    # when
+    replaced_citation = replace(CITATION, title='Other title')
+
+    # then
+    assert replaced_citation.title == 'Other title'
+    assert replaced_citation.keywords == []
+    assert pickle.loads(pickle.dumps(replaced_citation)) == replaced_citation
+
+
+def test_caches_property_in_slot():
+    # given
+    citation = replace(CITATION, remaining_text='{{{ authors }}} {{{ title }}}.')
+
+    # when
+    is_fully_parsed = citation.is_fully_parsed
+
+    # then
+    assert is_fully_parsed
+    assert citation._cached_is_fully_parsed is True
+    unpickled_citation = pickle.loads(pickle.dumps(citation))
+    assert not hasattr(unpickled_citation, '_cached_is_fully_parsed')
+    assert unpickled_citation == citation
+    assert not replace(citation, remaining_text='{{{ authors }}} Title').is_fully_parsed
@@ -1,35 +1,403 @@
+import bz2
+import contextlib
+import hashlib
+import io
 import logging
-import zipfile
-from os import walk, makedirs
-from os.path import join, relpath, dirname, basename
-from typing import List
-from zipfile import ZipFile
+import os
+import queue
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from os.path import basename, dirname, join, relpath
+from typing import Callable, Dict, IO, Iterable, List, NamedTuple, Optional, Tuple, Union
+from zipfile import ZIP_BZIP2, ZIP_DEFLATED, ZIP_STORED
+
+from caching.file_cache import FileCache
 
 ZIP_DIR = '/ta-data'
 ZIP_FILE = 'turkology_annual_export.zip'
 RESOURCES_DIR = '/ta-data/export'
 
+DEFAULT_CODEC = 'deflate'
+DEFAULT_LEVEL = 9
+CHUNK_SIZE = 1024 * 1024  # bytes passed to a compressor at once
+MAX_QUEUED_CHUNKS = 8  # per streamed member, before the writing waits for the compression
+SPOOL_SIZE = 16 * 1024 * 1024  # bytes of a compressed member kept in memory
+RESOURCE_CACHE_VERSION = 1  # Increment when the compressed resources change
+RESOURCE_CACHE_HEADER = struct.Struct('<LQ')  # CRC and size of the uncompressed resource
+
+Compressor = Callable[[int], Union['zlib._Compress', bz2.BZ2Compressor]]  # level -> compressor
+
+
+class Codec(NamedTuple):
+    compress_type: int
+    extract_version: int  # Minimum version of the zip format needed to extract the member
+    compressor: Optional[Compressor]
+    levels: range
+
+
+CODECS: Dict[str, Codec] = {
+    'stored': Codec(ZIP_STORED, 10, None, range(0, 10)),
+    'deflate': Codec(
+        ZIP_DEFLATED, 20, lambda level: zlib.compressobj(level, zlib.DEFLATED, -15),
+        range(0, 10)
+    ),
+    'bzip2': Codec(ZIP_BZIP2, 46, lambda level: bz2.BZ2Compressor(level), range(1, 10)),
+}
+
+# Structures of the zip format, see https://pkware.cachefly.net/webdocs/casestudies/APPNOTE.TXT
+LOCAL_FILE_HEADER = struct.Struct('<4sHHHHHLLLHH')
+CENTRAL_DIRECTORY_HEADER = struct.Struct('<4sHHHHHHLLLHHHHHLL')
+END_OF_CENTRAL_DIRECTORY = struct.Struct('<4sHHHHLLH')
+ZIP64_END_OF_CENTRAL_DIRECTORY = struct.Struct('<4sQHHLLQQQQ')
+ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR = struct.Struct('<4sLQL')
+VERSION_MADE_BY = (3 << 8) | 45  # Unix, version 4.5
+UTF8_NAMES_FLAG = 0x800
+DEFAULT_FILE_MODE = 0o100644
+# Sizes, offsets and numbers of entries from these on are stored in ZIP64 records instead
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP64_ENTRIES_LIMIT = 0xFFFF
+ZIP64_MARKER = 0xFFFFFFFF  # In place of a value stored in a ZIP64 record
+ZIP64_ENTRIES_MARKER = 0xFFFF
+ZIP64_EXTRACT_VERSION = 45
+ZIP64_EXTRA_FIELD_ID = 0x0001
+PARTIAL_FILE_SUFFIX = '.part'
+
+
+class CompressedMember(NamedTuple):
+    name: str
+    date_time: Tuple[int, int, int, int, int, int]
+    file_mode: int
+    crc: int
+    file_size: int
+    compress_size: int
+    data: IO[bytes]  # The compressed data, positioned at its start
+
+
+class ExportBundle(object):
+    """
+    Writes the export bundle, a zip file of the static resources and the output files.
+
+    Each member is compressed in its own thread (zlib and bz2 release the GIL), and output
+    files written through `open()` are compressed while they are written, instead of being
+    read again afterwards. Compressed resources are cached in `cache_dir` and reused as long
+    as their size and modification time stay the same.
+    """
+
+    def __init__(
+            self,
+            zip_path: str,
+            codec: str = DEFAULT_CODEC,
+            level: int = DEFAULT_LEVEL,
+            cache_dir: Optional[str] = None,
+            workers: Optional[int] = None,
+    ):
+        if codec not in CODECS:
+            raise ValueError(f'Unknown codec {codec}, use one of {", ".join(sorted(CODECS))}')
+        if level not in CODECS[codec].levels:
+            levels = CODECS[codec].levels
+            raise ValueError(f'Level of {codec} must be {levels.start} to {levels.stop - 1}')
+        self.zip_path = zip_path
+        self.codec = codec
+        self.level = level
+        self._resource_cache = FileCache(join(cache_dir, 'export')) if cache_dir else None
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._members: Dict[str, Future] = {}  # In the order of the zip file
+        self._start = time.perf_counter()
 
-def create_export_bundle(dump_file_name: str, zip_path: str):
-    logging.info('Writing export bundle...')
-    create_zip_file([dump_file_name, dump_file_name + 'l'], zip_path)
+    def open(self, filename: str, mode: str = 'w', buffering: int = -1,
+             encoding: Optional[str] = None) -> IO:
+        """
+        Open `filename` for writing like the built-in open(), also streaming the written data
+        into the bundle member named like the file.
+        """
+        if mode not in ('w', 'wb'):
+            raise ValueError(f'Output files can only be opened for writing, not {mode!r}')
+        output_file = open(filename, 'wb', buffering=0)
+        chunks = _ChunkQueue()
+        member = _run_in_thread(self._compress, basename(filename), _now(), chunks)
+        self._add_member(basename(filename), member)
+        raw_file = _TeeFile(output_file, chunks, member)
+        buffered_file = io.BufferedWriter(
+            raw_file, buffering if buffering > 1 else io.DEFAULT_BUFFER_SIZE
+        )
+        if mode == 'wb':
+            return buffered_file
+        return io.TextIOWrapper(buffered_file, encoding=encoding)
 
+    def add_files(self, filenames: Iterable[str]):
+        """Add files written before, unless they were written through `open()`"""
+        for filename in filenames:
+            if basename(filename) not in self._members:
+                self._add_member(
+                    basename(filename), self._executor.submit(self._compress_file, filename)
+                )
 
-def create_zip_file(dump_file_names: List[str], output_path: str):
-    ensure_dir_exists(dirname(output_path))
-    with ZipFile(
-            output_path,
-            'w',
-            compression=zipfile.ZIP_DEFLATED,
-            compresslevel=9
-    ) as zip_file_handle:
-        for root, dirs, files in walk(RESOURCES_DIR):
+    def add_resources(self, resources_dir: str = RESOURCES_DIR):
+        for root, dirs, files in os.walk(resources_dir):
             for file in files:
                 file_name = join(root, file)
-                zip_file_handle.write(file_name, relpath(file_name, RESOURCES_DIR))
-        for dump_file_name in dump_file_names:
-            zip_file_handle.write(dump_file_name, basename(dump_file_name))
+                self._add_member(
+                    relpath(file_name, resources_dir),
+                    self._executor.submit(self._compress_resource, file_name, resources_dir)
+                )
+
+    def close(self):
+        """
+        Write the bundle, once all members are compressed.
+
+        The bundle is written next to `zip_path` and only moved there when complete, so a
+        failed compression or write never leaves a truncated bundle behind.
+        """
+        try:
+            members = [member.result() for member in self._members.values()]
+            os.makedirs(dirname(os.path.abspath(self.zip_path)), exist_ok=True)
+            partial_path = self.zip_path + PARTIAL_FILE_SUFFIX
+            try:
+                with open(partial_path, 'wb') as zip_file:
+                    _write_zip(zip_file, members, CODECS[self.codec])
+                os.replace(partial_path, self.zip_path)
+            except BaseException:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(partial_path)
+                raise
+        finally:
+            self._discard()
+        logging.info(
+            f'Wrote export bundle with {len(members)} files '
+            f'({os.path.getsize(self.zip_path) / 1024 / 1024:.1f} MB, {self.codec} '
+            f'level {self.level}) in {time.perf_counter() - self._start:.2f}s'
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+    def _discard(self):
+        """Release the compressed data of the members and the compressing threads"""
+        self._executor.shutdown(wait=False)
+        for member in self._members.values():
+            if member.done() and not member.cancelled() and member.exception() is None:
+                member.result().data.close()
+
+    def _add_member(self, name: str, member: Future):
+        if name in self._members:
+            raise ValueError(f'Export bundle already contains {name}')
+        self._members[name] = member
+
+    def _compress_file(self, filename: str, name: Optional[str] = None) -> CompressedMember:
+        stat = os.stat(filename)
+        with open(filename, 'rb') as member_file:
+            return self._compress(
+                name or basename(filename),
+                _date_time(stat.st_mtime),
+                iter(lambda: member_file.read(CHUNK_SIZE), b''),
+                stat.st_mode,
+            )
+
+    def _compress_resource(self, filename: str, resources_dir: str) -> CompressedMember:
+        name = relpath(filename, resources_dir)
+        if not self._resource_cache:
+            return self._compress_file(filename, name)
+        stat = os.stat(filename)
+        key = hashlib.sha256(
+            f'{RESOURCE_CACHE_VERSION}\0{os.path.abspath(filename)}\0{stat.st_size}\0'
+            f'{stat.st_mtime_ns}\0{self.codec}\0{self.level}'.encode('utf-8')
+        ).hexdigest()
+        cached = self._resource_cache.get(key)
+        if cached is not None:
+            logging.debug(f'Reusing compressed {name}')
+            crc, file_size = RESOURCE_CACHE_HEADER.unpack_from(cached)
+            data = cached[RESOURCE_CACHE_HEADER.size:]
+            return CompressedMember(
+                name, _date_time(stat.st_mtime), stat.st_mode, crc, file_size, len(data),
+                io.BytesIO(data)
+            )
+        member = self._compress_file(filename, name)
+        data = member.data.read()
+        member.data.seek(0)
+        self._resource_cache.put(
+            key, RESOURCE_CACHE_HEADER.pack(member.crc, member.file_size) + data
+        )
+        return member
+
+    def _compress(
+            self,
+            name: str,
+            date_time: Tuple[int, int, int, int, int, int],
+            chunks: Iterable[bytes],
+            file_mode: int = DEFAULT_FILE_MODE,
+    ) -> CompressedMember:
+        compressor_factory = CODECS[self.codec].compressor
+        compressor = compressor_factory(self.level) if compressor_factory else None
+        data = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        crc = 0
+        file_size = 0
+        try:
+            for chunk in chunks:
+                crc = zlib.crc32(chunk, crc)
+                file_size += len(chunk)
+                data.write(compressor.compress(chunk) if compressor else chunk)
+            if compressor:
+                data.write(compressor.flush())
+        except BaseException:
+            data.close()
+            raise
+        compress_size = data.tell()
+        data.seek(0)
+        return CompressedMember(name, date_time, file_mode, crc, file_size, compress_size, data)
+
+
+class _ChunkQueue(object):
+    """Passes the chunks of a streamed member from the writing to the compressing thread"""
+
+    _END = None
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue = queue.Queue(MAX_QUEUED_CHUNKS)
+
+    def put(self, chunk: Optional[bytes], member: Future):
+        while True:
+            try:
+                self._queue.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                if member.done():  # The compression failed
+                    member.result()
+                    raise RuntimeError('Compression of member ended before its data')
+
+    def close(self, member: Future):
+        self.put(self._END, member)
+
+    def __iter__(self):
+        return iter(self._queue.get, self._END)
+
+
+class _TeeFile(io.RawIOBase):
+    """Writes into a file and passes the data on to the compression of a bundle member"""
+
+    def __init__(self, file: IO[bytes], chunks: _ChunkQueue, member: Future):
+        self._file = file
+        self._chunks = chunks
+        self._member = member
+
+    def writable(self):
+        return True
+
+    def write(self, data) -> int:
+        self._file.write(data)
+        self._chunks.put(bytes(data), self._member)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+            self._chunks.close(self._member)
+        super().close()
+
+
+def _write_zip(zip_file: IO[bytes], members: List[CompressedMember], codec: Codec):
+    central_directory = []
+    for member in members:
+        name = member.name.encode('utf-8')
+        flags = 0 if member.name.isascii() else UTF8_NAMES_FLAG
+        dos_time, dos_date = _dos_date_time(member.date_time)
+        header_offset = zip_file.tell()
+        # The local header has both sizes in its ZIP64 extra field, if one of them is large
+        if member.file_size >= ZIP64_LIMIT or member.compress_size >= ZIP64_LIMIT:
+            local_file_size = local_compress_size = ZIP64_MARKER
+            local_extra = _zip64_extra_field([member.file_size, member.compress_size])
+        else:
+            local_file_size, local_compress_size = member.file_size, member.compress_size
+            local_extra = b''
+        (file_size, compress_size, offset), central_extra = _zip64_fields(
+            [member.file_size, member.compress_size, header_offset]
+        )
+        extract_version = codec.extract_version
+        if central_extra:
+            extract_version = max(extract_version, ZIP64_EXTRACT_VERSION)
+        zip_file.write(LOCAL_FILE_HEADER.pack(
+            b'PK\x03\x04', extract_version, flags, codec.compress_type, dos_time, dos_date,
+            member.crc, local_compress_size, local_file_size, len(name), len(local_extra)
+        ))
+        zip_file.write(name + local_extra)
+        for chunk in iter(lambda: member.data.read(CHUNK_SIZE), b''):
+            zip_file.write(chunk)
+        central_directory.append(CENTRAL_DIRECTORY_HEADER.pack(
+            b'PK\x01\x02', VERSION_MADE_BY, extract_version, flags, codec.compress_type,
+            dos_time, dos_date, member.crc, compress_size, file_size, len(name),
+            len(central_extra), 0, 0, 0, (member.file_mode & 0xFFFF) << 16, offset
+        ) + name + central_extra)
+    central_directory_offset = zip_file.tell()
+    for header in central_directory:
+        zip_file.write(header)
+    central_directory_size = zip_file.tell() - central_directory_offset
+    entries = len(members)
+    if entries >= ZIP64_ENTRIES_LIMIT or central_directory_size >= ZIP64_LIMIT \
+            or central_directory_offset >= ZIP64_LIMIT:
+        zip64_end_offset = zip_file.tell()
+        zip_file.write(ZIP64_END_OF_CENTRAL_DIRECTORY.pack(
+            b'PK\x06\x06', ZIP64_END_OF_CENTRAL_DIRECTORY.size - 12, VERSION_MADE_BY,
+            ZIP64_EXTRACT_VERSION, 0, 0, entries, entries, central_directory_size,
+            central_directory_offset
+        ))
+        zip_file.write(ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR.pack(
+            b'PK\x06\x07', 0, zip64_end_offset, 1
+        ))
+        entries = ZIP64_ENTRIES_MARKER
+        central_directory_size = central_directory_offset = ZIP64_MARKER
+    zip_file.write(END_OF_CENTRAL_DIRECTORY.pack(
+        b'PK\x05\x06', 0, 0, entries, entries, central_directory_size,
+        central_directory_offset, 0
+    ))
+
+
+def _zip64_fields(values: List[int]) -> Tuple[List[int], bytes]:
+    """
+    Return the values for a central directory header, with ZIP64_MARKER for the large ones,
+    and the ZIP64 extra field holding the large values instead (b'' if there are none).
+    """
+    large_values = [value for value in values if value >= ZIP64_LIMIT]
+    header_values = [ZIP64_MARKER if value >= ZIP64_LIMIT else value for value in values]
+    return header_values, _zip64_extra_field(large_values) if large_values else b''
+
+
+def _zip64_extra_field(values: List[int]) -> bytes:
+    return struct.pack(f'<HH{len(values)}Q', ZIP64_EXTRA_FIELD_ID, 8 * len(values), *values)
+
+
+def _run_in_thread(function: Callable, *args) -> Future:
+    """Run `function` in a thread of its own, e.g. to consume chunks as they are written"""
+    future: Future = Future()
+
+    def run():
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(function(*args))
+            except BaseException as exception:
+                future.set_exception(exception)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+def _now() -> Tuple[int, int, int, int, int, int]:
+    return _date_time(time.time())
+
+
+def _date_time(timestamp: float) -> Tuple[int, int, int, int, int, int]:
+    return time.localtime(timestamp)[:6]
 
 
-def ensure_dir_exists(path: str):
-    makedirs(path, exist_ok=True)
+def _dos_date_time(date_time: Tuple[int, int, int, int, int, int]) -> Tuple[int, int]:
+    year, month, day, hour, minute, second = date_time
+    year = min(max(year, 1980), 2107)
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
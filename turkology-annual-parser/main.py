@@ -1,9 +1,13 @@
 import argparse
 import logging
+import os
 
-from export import create_export_bundle
+from export import CODECS, DEFAULT_CODEC, DEFAULT_LEVEL, ExportBundle
 from pipeline import run_pipeline
-from repositories.save import save_citations
+from repositories.save import REPOSITORIES, save_citations
+from search.search_index import build_search_index
+
+DEFAULT_CACHE_DIR = '/tmp/ta_cache'
 
 
 def main():
@@ -14,27 +18,99 @@ def main():
         args.input,
         args.keyword_file,
         find_authors=args.find_authors,
-        resolve_repetitions=args.resolve_repetitions
+        author_rounds=args.author_rounds,
+        resolve_repetitions=args.resolve_repetitions,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        incremental=args.incremental,
+        workers=args.workers,
+        stage_profile_file=stage_profile_file_name(args.output) if args.profile_stages else None
     )
-    save_citations(citations, args.output)
-    create_export_bundle(args.output, args.zip_output)
+    with ExportBundle(
+            args.zip_output,
+            codec=args.zip_codec,
+            level=args.zip_level,
+            cache_dir=None if args.no_cache else args.cache_dir
+    ) as export_bundle:
+        export_bundle.add_resources()
+        dump_file_names = save_citations(
+            citations, args.output, args.format, open_file=export_bundle.open
+        )
+        export_bundle.add_files(dump_file_names)
+    if args.search_index:
+        build_search_index(citations, args.search_index)
 
 
 def parse_command_line_args():
     parser = argparse.ArgumentParser()
     parser.add_argument('--input', '-i', nargs='*', help='Location of OCR directory', required=True)
-    parser.add_argument('--output', '-o', help='Location of JSON output file', required=True)
+    parser.add_argument('--output', '-o', help='Location of output file', required=True)
+    parser.add_argument(
+        '--format', choices=sorted(REPOSITORIES), default='json',
+        help='Format of the output file (default: json, which also writes JSON lines to the '
+             'output file name + "l")'
+    )
     parser.add_argument(
         '--zip-output', '-z', help='Location of compressed export bundle', required=True
     )
+    parser.add_argument(
+        '--zip-codec', choices=sorted(CODECS), default=DEFAULT_CODEC,
+        help=f'Compression of the export bundle (default: {DEFAULT_CODEC})'
+    )
+    parser.add_argument(
+        '--zip-level', type=int, choices=range(10), default=DEFAULT_LEVEL, metavar='0-9',
+        help=f'Compression level of the export bundle (default: {DEFAULT_LEVEL})'
+    )
     parser.add_argument('--keyword-file', help='Path to keyword CSV', required=True)
+    parser.add_argument(
+        '--search-index',
+        help='Location of a full-text search index of the citations to build '
+             '(query it with `python -m search`)'
+    )
     parser.add_argument('--find-authors', action='store_true')
+    parser.add_argument(
+        '--author-rounds', type=positive_int, default=1,
+        help='Maximum number of times to search for known authors, each time also using '
+             'the authors found in the previous one (default: 1)'
+    )
     parser.add_argument('--resolve-repetitions', action='store_true')
+    parser.add_argument(
+        '--cache-dir', default=DEFAULT_CACHE_DIR,
+        help=f'Location of cache for intermediate results (default: {DEFAULT_CACHE_DIR})'
+    )
+    parser.add_argument('--no-cache', action='store_true', help='Do not use or fill the cache')
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help='Only rerun pipeline stages whose input, code or parameters have changed'
+    )
+    parser.add_argument(
+        '--workers', type=positive_int, help='Number of worker processes (default: number of CPUs)'
+    )
+    parser.add_argument(
+        '--profile-stages', action='store_true',
+        help='Write timings and item counts of all pipeline stages next to the output file'
+    )
     parser.add_argument('--verbose', '-v', action='store_true')
     args = parser.parse_args()
+    zip_levels = CODECS[args.zip_codec].levels
+    if args.zip_level not in zip_levels:
+        parser.error(
+            f'argument --zip-level: {args.zip_codec} needs a level from {zip_levels.start} '
+            f'to {zip_levels.stop - 1}'
+        )
     return args
 
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'{value} is not a positive integer')
+    return number
+
+
+def stage_profile_file_name(output_file_name: str) -> str:
+    return os.path.splitext(output_file_name)[0] + '_stage_profile.json'
+
+
 def setup_logging(verbose: bool):
     # set up logging to file - see previous section for more details
     logging.basicConfig(level=logging.DEBUG,
@@ -0,0 +1,66 @@
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Sequence
+
+from citation.re_helpers import CaseInsensitiveAlphabet
+
+MAX_ERRORS = 2
+
+
+class KeywordHeadingMatcher(object):
+    """
+    Recognizes keyword headings (e.g. 'AC. Bibliotheken') with up to `max_errors` OCR errors.
+
+    Gives the same answers as fullmatching the case-insensitive alternation of all headings
+    with `{e<=max_errors}`, but instead of trying every heading, only the headings whose length
+    is within `max_errors` of the text's length are compared, using an edit distance
+    computation that gives up as soon as the distance exceeds `max_errors`.
+    """
+
+    def __init__(self, headings: Sequence[str], max_errors: int = MAX_ERRORS):
+        self.max_errors = max_errors
+        headings_by_length: Dict[int, List[str]] = defaultdict(list)
+        for heading in headings:
+            headings_by_length[len(heading)].append(heading)
+        self._candidates_by_length = {
+            length: [
+                heading
+                for candidate_length in range(length - max_errors, length + max_errors + 1)
+                for heading in headings_by_length.get(candidate_length, ())
+            ]
+            for length in range(max(headings_by_length, default=0) + max_errors + 1)
+        }
+        self._heading_alphabet = CaseInsensitiveAlphabet(''.join(headings))
+
+    def fullmatch(self, text: str) -> bool:
+        candidates = self._candidates_by_length.get(len(text))
+        if not candidates:
+            return False
+        text_chars = [self._heading_alphabet.matching_pattern_chars(char) for char in text]
+        return any(
+            _is_within_edit_distance(heading, text_chars, self.max_errors)
+            for heading in candidates
+        )
+
+
+def _is_within_edit_distance(
+        heading: str, text_chars: List[FrozenSet[str]], max_errors: int
+) -> bool:
+    """Compute the Levenshtein distance row by row, only within the diagonal band"""
+    text_length = len(text_chars)
+    too_far = max_errors + 1
+    previous_row = list(range(text_length + 1))
+    for i, heading_char in enumerate(heading, start=1):
+        row = [too_far] * (text_length + 1)
+        if i <= max_errors:
+            row[0] = i
+        first_column = max(1, i - max_errors)
+        for j in range(first_column, min(text_length, i + max_errors) + 1):
+            row[j] = min(
+                previous_row[j - 1] + (heading_char not in text_chars[j - 1]),
+                previous_row[j] + 1,
+                row[j - 1] + 1,
+            )
+        if min(row[first_column - 1:i + max_errors + 1]) > max_errors:
+            return False
+        previous_row = row
+    return previous_row[text_length] <= max_errors
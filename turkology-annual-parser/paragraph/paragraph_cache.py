@@ -0,0 +1,42 @@
+import logging
+import os
+import pickle
+import zlib
+from typing import Callable, Iterable, List
+
+from caching.file_cache import DEFAULT_MAX_SIZE, FileCache, file_digest
+from domain.paragraph import Paragraph
+from .wmlparser import PARSER_VERSION
+
+
+class ParagraphCache(object):
+    """Caches the paragraphs extracted from OCR files, keyed by file content & parser version"""
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_MAX_SIZE):
+        self._file_cache = FileCache(os.path.join(cache_dir, 'paragraphs'), max_size)
+
+    def get_paragraphs(
+            self,
+            volume_filename: str,
+            parse: Callable[[str], Iterable[Paragraph]]
+    ) -> List[Paragraph]:
+        key = f'{file_digest(volume_filename)}-v{PARSER_VERSION}'
+        data = self._file_cache.get(key)
+        if data is not None:
+            logging.debug(f'Using cached paragraphs for {os.path.basename(volume_filename)}')
+            return _decode_paragraphs(data)
+        paragraphs = list(parse(volume_filename))
+        self._file_cache.put(key, _encode_paragraphs(paragraphs))
+        return paragraphs
+
+
+def _encode_paragraphs(paragraphs: List[Paragraph]) -> bytes:
+    fields = [(paragraph.originalIndex, paragraph.text) for paragraph in paragraphs]
+    return zlib.compress(pickle.dumps(fields, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+
+def _decode_paragraphs(data: bytes) -> List[Paragraph]:
+    return [
+        Paragraph(originalIndex=original_index, text=text)
+        for original_index, text in pickle.loads(zlib.decompress(data))
+    ]
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
+import inspect
 import re
 from dataclasses import replace
 from operator import attrgetter
-from typing import Iterable
+from typing import Callable, Iterable, List
 
 from domain.paragraph import Paragraph
 
@@ -86,6 +87,22 @@ def correct_paragraphs(paragraphs: Iterable[Paragraph]) -> Iterable[Paragraph]:
     return filter(lambda x: x is not None, paragraphs)
 
 
+def correction_source(volume: int) -> str:
+    """Return the source code of all functions involved in correcting the given volume"""
+    functions: List[Callable] = [
+        correct_paragraphs,
+        replace_text,
+        split_paragraph_before,
+        flatten_list,
+        empty_paragraphs,
+        merge_paragraphs,
+    ]
+    volume_correction = globals().get(f'correct_volume_{volume}')
+    if volume_correction:
+        functions.append(volume_correction)
+    return ''.join(inspect.getsource(function) for function in functions)
+
+
 def correct_volume_25(paragraphs):
     paragraphs = flatten_list([
         paragraphs[:3771],
@@ -1,16 +1,25 @@
 # -*- coding: utf-8 -*-
 from dataclasses import replace
+from typing import Optional
 
+from .paragraph_cache import ParagraphCache
 from .wmlparser import WMLParser
 
 
-def extract_paragraphs(volume_filename):
+def extract_paragraphs(volume_filename, paragraph_cache: Optional[ParagraphCache] = None):
     volume_number = volume_from_filename(volume_filename)
-    parser = WMLParser(volume_filename)
-    for paragraph in parser:
+    if paragraph_cache:
+        paragraphs = paragraph_cache.get_paragraphs(volume_filename, parse_paragraphs)
+    else:
+        paragraphs = parse_paragraphs(volume_filename)
+    for paragraph in paragraphs:
         yield replace(paragraph, volume=volume_number)
 
 
+def parse_paragraphs(volume_filename):
+    return WMLParser(volume_filename, streaming=True)
+
+
 def volume_from_filename(volume_filename: str) -> int:
     volume_number = volume_filename.split("/")[-1].split("_")[0][2:]
     return int(volume_number.split('-')[0])
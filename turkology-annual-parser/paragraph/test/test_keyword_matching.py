@@ -0,0 +1,71 @@
+import random
+
+import pytest
+import regex as re
+
+from ..keyword_matching import KeywordHeadingMatcher
+
+HEADINGS = [
+    'A. Allgemeines',
+    'AC. Bibliotheken',
+    'B. Geschichte',
+    'BA. Türkische Völker vor 1300',
+    'IA. Islam',
+    'SA. Sprachwissenschaft: Allgemeines',
+]
+
+
+@pytest.mark.parametrize('text,is_heading', [
+    ('A. Allgemeines', True),
+    ('a. allgemeines', True),
+    ('A Allgemeınes', True),
+    ('AC. Bibliotheken.', True),
+    ('AC, Bibl1otheken', True),
+    ('AC. B1b1i0theken', False),
+    ('B. Geschichte der Türkei', False),
+    ('1. Kreiser, Klaus   Lexikon der islamischen Welt. Stuttgart, 1974, 240 S.', False),
+    ('', False),
+])
+def test_matches_headings_with_up_to_two_errors(text, is_heading):
+    # when
+    result = KeywordHeadingMatcher(HEADINGS).fullmatch(text)
+
+    # then
+    assert result == is_heading
+
+
+def test_matches_like_fuzzy_regex():
+    # given
+    fuzzy_pattern = re.compile(
+        '({}){{e<=2}}'.format('|'.join(re.escape(heading) for heading in HEADINGS)),
+        re.IGNORECASE
+    )
+    matcher = KeywordHeadingMatcher(HEADINGS)
+    texts = list(_garbled_headings(random.Random(42), 5000))
+
+    # when
+    results = [matcher.fullmatch(text) for text in texts]
+
+    # then
+    assert results == [bool(fuzzy_pattern.fullmatch(text)) for text in texts]
+    assert 0 < sum(results) < len(texts)
+
+
+def _garbled_headings(rng, count):
+    noise = 'aeiIıİsSſ .,:1Üüß'
+    for _ in range(count):
+        text = list(rng.choice(HEADINGS))
+        for _ in range(rng.randint(0, 4)):
+            position = rng.randrange(len(text) + 1)
+            operation = rng.choice(['insert', 'delete', 'substitute', 'swapcase'])
+            if operation == 'insert':
+                text.insert(position, rng.choice(noise))
+            elif position == len(text):
+                continue
+            elif operation == 'delete':
+                del text[position]
+            elif operation == 'substitute':
+                text[position] = rng.choice(noise)
+            else:
+                text[position] = text[position].swapcase()
+        yield ''.join(text)
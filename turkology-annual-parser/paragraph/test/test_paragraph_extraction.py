@@ -1,6 +1,7 @@
 from unittest.mock import patch
 
 from domain.paragraph import Paragraph
+from ..paragraph_cache import ParagraphCache
 from ..paragraph_extraction import volume_from_filename, extract_paragraphs
 
 
@@ -17,6 +18,24 @@ def test_extract_paragraphs(WMLParser):
     ]
 
 
+@patch('paragraph.paragraph_extraction.WMLParser')
+def test_extract_paragraphs_uses_cache(WMLParser, tmp_path):
+    # given
+    volume_filename = str(tmp_path / 'TA99_01.xml')
+    with open(volume_filename, 'w') as volume_file:
+        volume_file.write('<w:wordDocument/>')
+    WMLParser.return_value = iter([Paragraph(text='some text', originalIndex=0)])
+    paragraph_cache = ParagraphCache(str(tmp_path / 'cache'))
+    list(extract_paragraphs(volume_filename, paragraph_cache))
+
+    # when
+    paragraphs = list(extract_paragraphs(volume_filename, paragraph_cache))
+
+    # then
+    assert WMLParser.call_count == 1
+    assert paragraphs == [Paragraph(text='some text', originalIndex=0, volume=99)]
+
+
 def test_extract_volume_from_filename_vol_01():
     file_path = 'data/ocr/TA01_02_Xhosa_WML_formatted_pb_nopic_patterns.xml'
     assert volume_from_filename(file_path) == 1
@@ -27,3 +27,21 @@ def test_detect_paragraph_types():
     assert detected_types == [
         paragraph_type for _, paragraph_type in sample_paragraphs_with_expected_types
     ]
+
+
+def test_page_numbers_do_not_interrupt_amendments():
+    sample_paragraphs_with_expected_types = [
+        ('ZEITSCHRIFTEN UND', ParagraphType.JOURNAL_SECTION_BEGIN),
+        ('A. Allgemeines', ParagraphType.KEYWORD),
+        ('1. First citation', ParagraphType.CITATION),
+        ('12 Turkologischer Anzeigr', None),
+        ('Rez. Some review', ParagraphType.AMENDMENT),
+        ('Some text', None),
+        ('Rez. Not an amendment', None),
+    ]
+    paragraphs = [Paragraph(text=p, volume='130') for p, _ in sample_paragraphs_with_expected_types]
+    paragraphs = list(detect_paragraph_types(paragraphs, KEYWORD_MAPPING))
+    detected_types = [p.type for p in paragraphs]
+    assert detected_types == [
+        paragraph_type for _, paragraph_type in sample_paragraphs_with_expected_types
+    ]
@@ -1,11 +1,16 @@
 import os
+import time
+from glob import glob
 from itertools import islice
 
+import pytest
+
 from domain.paragraph import Paragraph
 from ..wmlparser import WMLParser
 
 TA01 = 'TA01_02_Xhosa_WML_formatted_pb_nopic_patterns.xml'
 TA26 = 'TA26_02_Xhosa_formatted_pb_nopics.xml'
+OCR_DIR = os.path.join(os.path.dirname(__file__), '../../../ta-data/ocr/')
 
 
 def test_parser_gets_correct_number_of_paragraphs_vol_1():
@@ -52,5 +57,45 @@ def test_parser_returns_specific_paragraphs_vol_26():
     ]
 
 
+def test_streaming_parser_returns_same_paragraphs_as_document_parser(tmp_path):
+    xml_path = tmp_path / 'TA99_01.xml'
+    xml_path.write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<w:wordDocument xmlns:w="http://schemas.microsoft.com/office/word/2003/wordml">'
+        '<w:body><wx:sect xmlns:wx="http://schemas.microsoft.com/office/word/2003/auxHint">'
+        '<w:p><w:r><w:t>1. First </w:t></w:r><w:r><w:t>citation</w:t></w:r></w:p>'
+        '<w:p><w:r><w:t>2. With text box</w:t><w:pict><w:p><w:r><w:t>boxed</w:t></w:r></w:p>'
+        '</w:pict></w:r></w:p>'
+        '<w:p><w:r><w:t/></w:r></w:p>'
+        '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>In a table</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+        '</wx:sect></w:body></w:wordDocument>',
+        encoding='utf-8'
+    )
+
+    streamed_paragraphs = list(WMLParser(str(xml_path), streaming=True))
+
+    assert streamed_paragraphs == list(WMLParser(str(xml_path)))
+    assert streamed_paragraphs == [
+        Paragraph(originalIndex=0, text='1. First citation'),
+        Paragraph(originalIndex=1, text='2. With text box'),
+        Paragraph(originalIndex=2, text='boxed'),
+        Paragraph(originalIndex=3, text=''),
+        Paragraph(originalIndex=4, text='In a table'),
+    ]
+
+
+@pytest.mark.parametrize('streaming', [False, True], ids=['dom', 'streaming'])
+@pytest.mark.parametrize(
+    'xml_path', sorted(glob(os.path.join(OCR_DIR, '*'))), ids=os.path.basename
+)
+def test_parser_throughput(xml_path, streaming):
+    start = time.perf_counter()
+    number_of_paragraphs = sum(1 for _ in WMLParser(xml_path, streaming=streaming))
+    duration = time.perf_counter() - start
+
+    print(f'{os.path.basename(xml_path)}: {number_of_paragraphs / duration:.0f} paragraphs/s')
+    assert number_of_paragraphs > 0
+
+
 def get_xml_path(filename):
-    return os.path.join(os.path.dirname(__file__), '../../../ta-data/ocr/', filename)
+    return os.path.join(OCR_DIR, filename)
@@ -1,12 +1,18 @@
+import logging
+from collections import Counter
 from dataclasses import replace
-from typing import Dict, Iterable
+from typing import Dict, Iterable, List
 
 import regex as re
 
 from domain.paragraph import Paragraph, ParagraphType
+from .keyword_matching import KeywordHeadingMatcher
 
 MAX_CITATION_GAP = 500
 
+PAGE_NUMBER_TITLE_PARTS = ('Turkolo', 'gischer', ' Anzeiger')
+PAGE_NUMBER_MIN_LENGTH = len('1 Turkologischer Anzeiger') - 2
+
 KNOWN_CITATION_GAPS_BY_VOLUME = {  # Ranges are inclusive
     '6': (
         (1823, 1831),
@@ -23,30 +29,49 @@ KNOWN_CITATION_GAPS_BY_VOLUME = {  # Ranges are inclusive
 def detect_paragraph_types(
         paragraphs: Iterable[Paragraph], keyword_mapping: Dict[str, Dict[str, str]]
 ):
+    """
+    Cheap checks (string prefixes, hash lookups, length bounds) are tried before the fuzzy
+    ones wherever this cannot change the result.
+    """
     journal_section_begin_pattern = re.compile('ZEITSCHRIFTEN +UND')
     journal_pattern = re.compile('')
-    keyword_pattern_base = '({})'.format(
-        '|'.join([
-            re.escape('{}. {}'.format(code, translations['de']))
-            for code, translations in keyword_mapping.items()
-        ])
+    keyword_headings = keyword_headings_from_mapping(keyword_mapping)
+    keyword_pattern_exact = re.compile(
+        '({})'.format('|'.join([re.escape(heading) for heading in keyword_headings])),
+        re.IGNORECASE
     )
-    keyword_pattern_exact = re.compile(keyword_pattern_base, re.IGNORECASE)
-    keyword_pattern_fuzzy = re.compile(keyword_pattern_base + '{e<=2}', re.IGNORECASE)
+    keyword_matcher_fuzzy = KeywordHeadingMatcher(keyword_headings)
     citation_pattern = re.compile(r'(\d+)\.\.?\s+.+', re.DOTALL)
     broken_bullet_pattern = re.compile(r'^[φ#0Φ].*')  # , s\.( a\.)? \d+')
     page_number_pattern = re.compile(
         r'(\d+\s+Turkologischer Anzeiger|Turkologischer Anzeiger\s+\d+){e<=2}'
     )
 
+    lowercase_keyword_headings = {heading.lower() for heading in keyword_headings}
+    # Headings that look like citations must be checked before the citation rule
+    citation_like_headings_exist = any(
+        citation_pattern.fullmatch(heading) for heading in keyword_headings
+    )
+
+    def is_exact_keyword_heading(text: str, citation_match) -> bool:
+        # The regex module also matches e.g. 'ı' against 'I', which a hash lookup misses.
+        # Those headings are still found by the fuzzy matcher later on, unless the
+        # citation rule takes precedence.
+        if text.lower() in lowercase_keyword_headings or (
+                citation_match and citation_like_headings_exist):
+            return bool(keyword_pattern_exact.fullmatch(text))
+        return False
+
     citation_section_has_begun = False
     latest_citation_number = 0
     previous_type = None
     index_has_begun = False
     journal_section_has_begun = False
+    rule_hits: Counter = Counter()
 
     for paragraph in paragraphs:
         paragraph_type = None
+        rule = None
         text = paragraph.text or ''
         is_possible_amendment = previous_type == ParagraphType.CITATION or (
                 previous_type and previous_type == ParagraphType.AMENDMENT)
@@ -54,51 +79,63 @@ def detect_paragraph_types(
 
         if not journal_section_has_begun:
             if journal_section_begin_pattern.search(text):
-                paragraph_type = ParagraphType.JOURNAL_SECTION_BEGIN
+                paragraph_type, rule = ParagraphType.JOURNAL_SECTION_BEGIN, 'journal section'
                 journal_section_has_begun = True
 
         if journal_section_has_begun and not citation_section_has_begun:
-            journal_match = journal_pattern.search(text)
-            if False and journal_match:
+            if False and journal_pattern.search(text):
                 paragraph_type = ParagraphType.JOURNAL
-            elif keyword_pattern_fuzzy.fullmatch(text):
-                paragraph_type = ParagraphType.KEYWORD
-            elif citation_section_has_begun and text.split('.')[0] in keyword_mapping:
-                paragraph_type = ParagraphType.KEYWORD
+            elif is_exact_keyword_heading(text, citation_match):
+                paragraph_type, rule = ParagraphType.KEYWORD, 'exact keyword'
+            elif keyword_matcher_fuzzy.fullmatch(text):
+                paragraph_type, rule = ParagraphType.KEYWORD, 'fuzzy keyword'
             if paragraph_type == ParagraphType.KEYWORD:
                 citation_section_has_begun = True
 
         if citation_section_has_begun and not index_has_begun:
-            if keyword_pattern_exact.fullmatch(text):
-                paragraph_type = ParagraphType.KEYWORD
-            elif citation_section_has_begun and citation_match and (
+            if is_exact_keyword_heading(text, citation_match):
+                paragraph_type, rule = ParagraphType.KEYWORD, 'exact keyword'
+            elif citation_match and (
                     0 < (int(citation_match.group(1)) - latest_citation_number) <= MAX_CITATION_GAP
                     or _is_preceded_by_ocr_gap(paragraph.volume, int(citation_match.group(1)))
             ):
-                paragraph_type = ParagraphType.CITATION
+                paragraph_type, rule = ParagraphType.CITATION, 'citation'
                 latest_citation_number = int(citation_match.group(1))
-            elif keyword_pattern_fuzzy.fullmatch(text):
-                paragraph_type = ParagraphType.KEYWORD
-            elif citation_section_has_begun and text.split('.')[0] in keyword_mapping:
-                paragraph_type = ParagraphType.KEYWORD
-            elif text.startswith('•') and is_possible_amendment:
-                paragraph_type = ParagraphType.AMENDMENT
-            elif text.startswith('Rez.') and is_possible_amendment:
-                paragraph_type = ParagraphType.AMENDMENT
-            elif text.startswith('Bericht') and is_possible_amendment:
-                paragraph_type = ParagraphType.AMENDMENT
+            elif text.split('.')[0] in keyword_mapping:
+                paragraph_type, rule = ParagraphType.KEYWORD, 'keyword code'
+            elif keyword_matcher_fuzzy.fullmatch(text):
+                paragraph_type, rule = ParagraphType.KEYWORD, 'fuzzy keyword'
+            elif is_possible_amendment and text.startswith(('•', 'Rez.', 'Bericht')):
+                paragraph_type, rule = ParagraphType.AMENDMENT, 'amendment'
             elif text == 'Autoren, Herausgeber, Übersetzer, Rezensenten' or text == 'INDEX':
-                paragraph_type = ParagraphType.AUTHOR_INDEX_BEGIN
+                paragraph_type, rule = ParagraphType.AUTHOR_INDEX_BEGIN, 'index'
                 index_has_begun = True
-            elif broken_bullet_pattern.match(text) and is_possible_amendment:
-                paragraph_type = ParagraphType.AMENDMENT
-            elif citation_section_has_begun and citation_match:
-                paragraph_type = ParagraphType.CITATION
+            elif is_possible_amendment and broken_bullet_pattern.match(text):
+                paragraph_type, rule = ParagraphType.AMENDMENT, 'broken bullet amendment'
+            elif citation_match:
+                paragraph_type, rule = ParagraphType.CITATION, 'out of sequence citation'
                 latest_citation_number = int(citation_match.group(1))
+        rule_hits[rule or 'none'] += 1
         yield replace(paragraph, type=paragraph_type)
-        if not page_number_pattern.fullmatch(text):
+        if paragraph_type != previous_type and not _is_page_number(text, page_number_pattern):
             previous_type = paragraph_type
 
+    logging.debug(f'Paragraph type detection rule hits: {dict(rule_hits.most_common())}')
+
+
+def keyword_headings_from_mapping(keyword_mapping: Dict[str, Dict[str, str]]) -> List[str]:
+    return [
+        '{}. {}'.format(code, translations['de'])
+        for code, translations in keyword_mapping.items()
+    ]
+
+
+def _is_page_number(text: str, page_number_pattern) -> bool:
+    # With at most two errors, one of the three parts of the title must be left intact
+    return len(text) >= PAGE_NUMBER_MIN_LENGTH and any(
+        part in text for part in PAGE_NUMBER_TITLE_PARTS
+    ) and bool(page_number_pattern.fullmatch(text))
+
 
 def _is_preceded_by_ocr_gap(volume, number):
     for _, range_end in KNOWN_CITATION_GAPS_BY_VOLUME.get(volume, ()):
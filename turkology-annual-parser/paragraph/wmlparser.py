@@ -1,18 +1,37 @@
+from itertools import chain
+from typing import Dict
+
 from lxml import etree
 
 from domain.paragraph import Paragraph
 
+PARSER_VERSION = 1  # Increment when changes to the parser affect the extracted paragraphs
+
+WORDML_NAMESPACE = 'http://schemas.microsoft.com/office/word/2003/wordml'
+NAMESPACES = {
+    'w': WORDML_NAMESPACE,
+    'wx': 'http://schemas.microsoft.com/office/word/2003/auxHint',
+}
+PARAGRAPH_TAG = f'{{{WORDML_NAMESPACE}}}p'
+RUN_TAG = f'{{{WORDML_NAMESPACE}}}r'
+TEXT_TAG = f'{{{WORDML_NAMESPACE}}}t'
+
+_compiled_expressions: Dict[str, etree.XPath] = {}
+
 
 class WMLParser(object):
-    def __init__(self, xml_filename):
-        self.namespaces = {
-            'w': 'http://schemas.microsoft.com/office/word/2003/wordml',
-            'wx': 'http://schemas.microsoft.com/office/word/2003/auxHint',
-        }
+    def __init__(self, xml_filename, streaming=False):
+        self.namespaces = NAMESPACES
         self._xml_filename = xml_filename
         self._document = None
+        self._streaming = streaming
 
     def __iter__(self):
+        if self._streaming:
+            return self._iter_streaming()
+        return self._iter_document()
+
+    def _iter_document(self):
         self._parse_xml()
         paragraph_nodes = self._xpath('//w:p')
         for paragraph_index, paragraph_node in enumerate(paragraph_nodes):
@@ -21,23 +40,67 @@ class WMLParser(object):
                 text=self._get_paragraph_text(paragraph_node),
             )
 
-    def _get_paragraph_text(self, paragraph_node) -> str:
-        text_parts = []
-        index_start = 0
-        for text_node in self._xpath('w:r/w:t', element=paragraph_node):
-            text_part = text_node.text
-            if text_part is None:
+    def _iter_streaming(self):
+        """
+        Yield paragraphs while parsing the document incrementally.
+
+        Paragraphs are numbered in document order (like '//w:p'), i.e. when their start tag is
+        seen. Paragraphs nested inside another paragraph (e.g. in text boxes) are held back
+        until the outermost paragraph has been closed, so that they are yielded in the same
+        order as in the DOM-based mode. Processed elements are discarded to keep the memory
+        footprint independent of the document size.
+        """
+        open_paragraph_indexes = []
+        next_index = 0
+        pending = []
+        events = etree.iterparse(self._xml_filename, events=('start', 'end'), tag=PARAGRAPH_TAG)
+        for event, paragraph_node in events:
+            if event == 'start':
+                open_paragraph_indexes.append(next_index)
+                next_index += 1
                 continue
-            text_parts.append(text_part)
-            index_end = index_start + len(text_part)
-            index_start = index_end
-        return ''.join(text_parts)
+            pending.append(Paragraph(
+                originalIndex=open_paragraph_indexes.pop(),
+                text=self._get_paragraph_text(paragraph_node),
+            ))
+            if open_paragraph_indexes:
+                continue
+            pending.sort(key=lambda paragraph: paragraph.originalIndex)
+            yield from pending
+            pending = []
+            _discard_processed_element(paragraph_node)
+
+    @staticmethod
+    def _get_paragraph_text(paragraph_node) -> str:
+        # Equivalent to the XPath 'w:r/w:t', but walking the children directly is much faster
+        return ''.join([
+            text_node.text
+            for run_node in paragraph_node.iterchildren(RUN_TAG)
+            for text_node in run_node.iterchildren(TEXT_TAG)
+            if text_node.text is not None
+        ])
 
     def _xpath(self, expression, element=None):
         element = element if element is not None else self._document
         if element is self._document:
             expression = '/w:wordDocument' + ('' if expression[0] == '/' else '/') + expression
-        return element.xpath(expression, namespaces=self.namespaces)
+        return _compile_xpath(expression)(element)
 
     def _parse_xml(self):
         self._document = etree.parse(self._xml_filename).getroot()
+
+
+def _compile_xpath(expression: str) -> etree.XPath:
+    if expression not in _compiled_expressions:
+        _compiled_expressions[expression] = etree.XPath(expression, namespaces=NAMESPACES)
+    return _compiled_expressions[expression]
+
+
+def _discard_processed_element(element):
+    element.clear()
+    for node in chain([element], element.iterancestors()):
+        parent = node.getparent()
+        if parent is None:
+            break
+        while node.getprevious() is not None:
+            del parent[0]
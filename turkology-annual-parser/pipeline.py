@@ -1,22 +1,31 @@
+import hashlib
+import json
 import logging
 import multiprocessing
 import os
+from collections import Counter
 from functools import partial
 from operator import attrgetter
-from queue import Queue
-from typing import List, Dict
+from typing import Any, List, Dict, NamedTuple, Optional
 
 from bootstrap.authors import reparse_citations_using_known_authors
+from caching.stage_cache import Stage, StageCache, format_statistics, module_source
+from citation import citation_parsing, field_parsing, re_helpers
 from citation.assembly import assemble_citations
 from citation.citation_parsing import parse_citations
-from citation.field_parsing import parse_citation_fields
+from citation.field_parsing import parse_citation_fields, warm_name_cache
 from citation.id_assignment import assign_citation_ids
 from citation.keywords import normalize_keywords
-from domain.citation import Citation
+from citation.name_cache import NameCacheFile, persons_in_citations
+from citation.name_cache import format_statistics as format_name_statistics
+from domain.citation import Citation, Person
 from keywords import get_keyword_mapping
-from paragraph.paragraph_correction import correct_paragraphs
-from paragraph.paragraph_extraction import extract_paragraphs
+from paragraph import keyword_matching, paragraph_extraction, type_detection, wmlparser
+from paragraph.paragraph_cache import ParagraphCache
+from paragraph.paragraph_correction import correct_paragraphs, correction_source
+from paragraph.paragraph_extraction import extract_paragraphs, volume_from_filename
 from paragraph.type_detection import detect_paragraph_types
+from profiling import StageProfiler, worker_name, write_report
 from repetitions.repetitions import extend_citations_with_later_added_info
 
 
@@ -24,55 +33,191 @@ def run_pipeline(
         ocr_files: List[str],
         keyword_file: str,
         find_authors=False,
-        resolve_repetitions=False
+        author_rounds: int = 1,
+        resolve_repetitions=False,
+        cache_dir: Optional[str] = None,
+        incremental=False,
+        workers: Optional[int] = None,
+        stage_profile_file: Optional[str] = None
 ) -> List[Citation]:
     keyword_mapping = get_keyword_mapping(keyword_file)
+    paragraph_cache = ParagraphCache(cache_dir) if cache_dir else None
+    stage_cache = StageCache(cache_dir) if cache_dir and incremental else None
+    profiler = StageProfiler() if stage_profile_file else None
+    volume_profiles: List[Dict[str, Any]] = []
+    name_cache_file = (
+        NameCacheFile(cache_dir, code=module_source(field_parsing)) if cache_dir else None
+    )
+    cached_persons = name_cache_file.load() if name_cache_file else []
+    warm_name_cache(cached_persons)  # Also for the workers reparsing citations later
 
-    return pipeline(
+    citations = pipeline(
         lambda: ocr_files,
-        partial(run_isolated_pipelines_in_parallel, keyword_mapping=keyword_mapping),
+        partial(
+            run_isolated_pipelines_in_parallel,
+            keyword_mapping=keyword_mapping,
+            paragraph_cache=paragraph_cache,
+            stage_cache=stage_cache,
+            workers=workers,
+            volume_profiles=volume_profiles if profiler else None,
+            cached_persons=cached_persons
+        ),
         partial(sorted, key=attrgetter('volume')),
-        find_authors and reparse_citations_using_known_authors,
-        resolve_repetitions and extend_citations_with_later_added_info
+        find_authors and partial(
+            reparse_citations_using_known_authors, workers=workers, rounds=author_rounds
+        ),
+        resolve_repetitions and extend_citations_with_later_added_info,
+        profiler=profiler
+    )
+    if profiler and stage_profile_file:
+        logging.info(f'Writing stage profile to {stage_profile_file}...')
+        write_report(stage_profile_file, profiler.report(), volume_profiles)
+    if name_cache_file:
+        name_cache_file.save(persons_in_citations(citations))
+    log_parse_coverage(citations)
+    return citations
+
+
+def log_parse_coverage(citations: List[Citation]):
+    """Log how many citations have been parsed fully, per volume and in total"""
+    coverage = Counter((citation.volume, citation.is_fully_parsed) for citation in citations)
+    for volume in dict.fromkeys(volume for volume, _ in coverage):
+        logging.debug(
+            f'Parse coverage of volume {volume}: '
+            f'{format_coverage(coverage[(volume, True)], coverage[(volume, False)])}'
+        )
+    fully_parsed = sum(count for (_, is_fully_parsed), count in coverage.items() if is_fully_parsed)
+    logging.info(f'Parse coverage: {format_coverage(fully_parsed, len(citations) - fully_parsed)}')
+
+
+def format_coverage(fully_parsed: int, partially_parsed: int) -> str:
+    total = fully_parsed + partially_parsed
+    return (
+        f'{fully_parsed} of {total} citations fully parsed '
+        f'({fully_parsed / total if total else 0:.1%})'
     )
 
 
-def run_isolated_pipelines_in_parallel(ocr_files: List[str], keyword_mapping):
+def run_isolated_pipelines_in_parallel(
+        ocr_files: List[str],
+        keyword_mapping,
+        paragraph_cache: Optional[ParagraphCache] = None,
+        stage_cache: Optional[StageCache] = None,
+        workers: Optional[int] = None,
+        volume_profiles: Optional[List[Dict[str, Any]]] = None,
+        cached_persons: Optional[List[Person]] = None
+):
     logging.info(f'Parsing {len(ocr_files)} volumes...')
-    m = multiprocessing.Manager()
-    queue = m.Queue()
-    with multiprocessing.Pool() as pool:
-        args = ((volume_filename, keyword_mapping, queue) for volume_filename in ocr_files)
-        pool.starmap(run_isolated_pipeline_on_volume, args)
-    pool.join()
-    while not queue.empty():
-        yield queue.get()
-    pool.close()
+    run_on_volume = partial(
+        run_isolated_pipeline_on_volume,
+        keyword_mapping=keyword_mapping,
+        paragraph_cache=paragraph_cache,
+        stage_cache=stage_cache,
+        profile_stages=volume_profiles is not None,
+    )
+    stage_statistics: Counter = Counter()
+    name_statistics: Counter = Counter()
+    with multiprocessing.Pool(
+            workers, initializer=warm_name_cache, initargs=(cached_persons or [],)
+    ) as pool:
+        # Each volume's citations are sent back as one batch as soon as the volume is done
+        for volume_result in pool.imap_unordered(
+                run_on_volume, schedule_largest_first(ocr_files), chunksize=1
+        ):
+            stage_statistics.update(volume_result.stage_statistics)
+            name_statistics.update(volume_result.name_statistics)
+            if volume_result.stage_profile and volume_profiles is not None:
+                volume_profiles.append(volume_result.stage_profile)
+            yield from volume_result.citations
+    if stage_cache:
+        logging.info(f'Stage cache statistics:\n{format_statistics(stage_statistics)}')
+    logging.info(f'Name cache statistics: {format_name_statistics(name_statistics)}')
+
+
+def schedule_largest_first(ocr_files: List[str]) -> List[str]:
+    """
+    Order volumes by decreasing size of their OCR file (as an estimate of the work required).
+
+    Starting the largest volumes first keeps a large volume from being started last and
+    prolonging the run while all other workers are already idle.
+    """
+    return sorted(ocr_files, key=os.path.getsize, reverse=True)
+
+
+class VolumeResult(NamedTuple):
+    citations: List[Citation]
+    stage_statistics: Counter
+    stage_profile: Optional[Dict[str, Any]] = None
+    name_statistics: Counter = Counter()
 
 
 def run_isolated_pipeline_on_volume(
         volume_filename: str,
         keyword_mapping: Dict[str, Dict[str, str]],
-        queue: Queue
-) -> None:
-    for citation in pipeline(
+        paragraph_cache: Optional[ParagraphCache] = None,
+        stage_cache: Optional[StageCache] = None,
+        profile_stages=False
+) -> VolumeResult:
+    profiler = StageProfiler() if profile_stages else None
+    name_statistics_before = field_parsing.name_cache.statistics()
+    stages = volume_stages(volume_filename, keyword_mapping, paragraph_cache, profiler)
+    stage_statistics: Counter = Counter()
+    if stage_cache:
+        citations, stage_statistics = stage_cache.run(volume_filename, stages, profiler)
+    else:
+        citations = list(pipeline(
             lambda: volume_filename,
-            extract_paragraphs,
-            correct_paragraphs,
+            *[stage.function for stage in stages],
+            profiler=profiler
+        ))
+    logging.info(f'{os.path.basename(volume_filename)} [DONE]')
+    stage_profile = {
+        'volume': os.path.basename(volume_filename),
+        'worker': worker_name(),
+        'stages': profiler.report(),
+    } if profiler else None
+    name_statistics = field_parsing.name_cache.statistics()
+    name_statistics.subtract(name_statistics_before)
+    return VolumeResult(citations, stage_statistics, stage_profile, name_statistics)
+
+
+def volume_stages(
+        volume_filename: str,
+        keyword_mapping: Dict[str, Dict[str, str]],
+        paragraph_cache: Optional[ParagraphCache] = None,
+        profiler: Optional[StageProfiler] = None
+) -> List[Stage]:
+    keyword_fingerprint = hashlib.sha256(
+        json.dumps(keyword_mapping, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+    return [
+        Stage(
+            partial(extract_paragraphs, paragraph_cache=paragraph_cache),
+            code=module_source(paragraph_extraction, wmlparser),
+        ),
+        Stage(correct_paragraphs, code=correction_source(volume_from_filename(volume_filename))),
+        Stage(
             partial(detect_paragraph_types, keyword_mapping=keyword_mapping),
-            assemble_citations,
-            parse_citations,
-            parse_citation_fields,
-            assign_citation_ids,
+            code=module_source(type_detection, keyword_matching),
+            parameters=keyword_fingerprint,
+        ),
+        Stage(assemble_citations),
+        Stage(
+            partial(parse_citations, profiler=profiler),
+            code=module_source(citation_parsing, re_helpers),
+        ),
+        Stage(parse_citation_fields),
+        Stage(assign_citation_ids),
+        Stage(
             partial(normalize_keywords, keyword_mapping=keyword_mapping),
-    ):
-        queue.put(citation)
-    logging.info(f'{os.path.basename(volume_filename)} [DONE]')
+            parameters=keyword_fingerprint,
+        ),
+    ]
 
 
-def pipeline(*steps):
-    steps = filter(None, steps)  # Filter out falsy steps
-    result = next(steps)()
-    for step in steps:
-        result = step(result)
+def pipeline(*steps, profiler: Optional[StageProfiler] = None):
+    enabled_steps = filter(None, steps)  # Filter out falsy steps
+    result = next(enabled_steps)()
+    for step in enabled_steps:
+        result = (profiler.profile(step) if profiler else step)(result)
     return result
@@ -0,0 +1,194 @@
+import json
+import math
+import multiprocessing
+from collections import Counter
+from functools import partial
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sized
+
+
+class StageProfile(object):
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0  # Time spent in the stage itself, i.e. without its upstream stages
+        self.items_in = 0
+        self.items_out = 0
+        self.latency_histogram: Counter = Counter()  # Upper bound in µs -> number of items
+        self.upstream_seconds = 0.0
+
+    def record_item(self, seconds: float):
+        self.items_out += 1
+        self.seconds += seconds
+        microseconds = seconds * 1e6
+        upper_bound = 2 ** math.ceil(math.log2(microseconds)) if microseconds > 1 else 1
+        self.latency_histogram[upper_bound] += 1
+
+    def merge(self, other: 'StageProfile'):
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.items_in += other.items_in
+        self.items_out += other.items_out
+        self.latency_histogram.update(other.latency_histogram)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'seconds': round(self.seconds, 6),
+            'itemsIn': self.items_in,
+            'itemsOut': self.items_out,
+            'latencyHistogramMicroseconds': {
+                str(upper_bound): count
+                for upper_bound, count in sorted(self.latency_histogram.items())
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, profile_dict: Dict[str, Any]) -> 'StageProfile':
+        profile = cls(profile_dict['name'])
+        profile.calls = profile_dict['calls']
+        profile.seconds = profile_dict['seconds']
+        profile.items_in = profile_dict['itemsIn']
+        profile.items_out = profile_dict['itemsOut']
+        profile.latency_histogram = Counter({
+            int(upper_bound): count
+            for upper_bound, count in profile_dict['latencyHistogramMicroseconds'].items()
+        })
+        return profile
+
+
+class StageProfiler(object):
+    """
+    Records wall time, item counts and per-item latencies of pipeline stages.
+
+    Most stages are lazy, i.e. their work happens while a later stage pulls items from them.
+    To attribute the time to the right stage, the time a stage spends waiting for items from
+    its input is subtracted from its own time.
+    """
+
+    def __init__(self) -> None:
+        self._profiles: Dict[str, StageProfile] = {}
+        self._profiled_functions: Dict[Any, Callable] = {}
+
+    def profile(self, function: Callable) -> Callable:
+        if function not in self._profiled_functions:
+            self._profiled_functions[function] = self._wrap(function)
+        return self._profiled_functions[function]
+
+    def report(self) -> List[Dict[str, Any]]:
+        return [profile.as_dict() for profile in self._profiles.values()]
+
+    def _wrap(self, function: Callable) -> Callable:
+        name = stage_name(function)
+        if name not in self._profiles:
+            self._profiles[name] = StageProfile(name)
+        profile = self._profiles[name]
+
+        def profiled_function(stage_input):
+            profile.calls += 1
+            if isinstance(stage_input, Sized) and _is_item_stream(stage_input):
+                profile.items_in += len(stage_input)  # Materialized by an upstream stage already
+            elif _is_item_stream(stage_input):
+                stage_input = _count_input(profile, stage_input)
+            else:
+                profile.items_in += 1
+            upstream_seconds = profile.upstream_seconds
+            start = perf_counter()
+            output = function(stage_input)
+            seconds = _own_seconds(profile, start, upstream_seconds)
+            if not _is_item_stream(output):
+                profile.record_item(seconds)
+                return output
+            profile.seconds += seconds
+            if isinstance(output, Sized):
+                profile.items_out += len(output)
+                return output
+            return _time_output(profile, output)
+
+        return profiled_function
+
+
+def merge_reports(reports: Iterable[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    profiles: Dict[str, StageProfile] = {}
+    for report in reports:
+        for profile_dict in report:
+            profile = StageProfile.from_dict(profile_dict)
+            if profile.name in profiles:
+                profiles[profile.name].merge(profile)
+            else:
+                profiles[profile.name] = profile
+    return [profile.as_dict() for profile in profiles.values()]
+
+
+def write_report(
+        file_name: str,
+        main_report: List[Dict[str, Any]],
+        volume_reports: List[Dict[str, Any]]
+):
+    """Write the stage profiles of the main process and of each volume, per worker & in total"""
+    volume_reports = sorted(volume_reports, key=lambda report: report['volume'])
+    workers = sorted({report['worker'] for report in volume_reports})
+    report = {
+        'main': {'worker': worker_name(), 'stages': main_report},
+        'volumes': volume_reports,
+        'workers': [
+            {
+                'worker': worker,
+                'stages': merge_reports(
+                    volume_report['stages'] for volume_report in volume_reports
+                    if volume_report['worker'] == worker
+                ),
+            }
+            for worker in workers
+        ],
+        'allVolumes': merge_reports(volume_report['stages'] for volume_report in volume_reports),
+    }
+    with open(file_name, 'w') as report_file:
+        json.dump(report, report_file, indent=2)
+
+
+def stage_name(function: Callable) -> str:
+    while isinstance(function, partial):
+        function = function.func
+    return getattr(function, '__name__', type(function).__name__)
+
+
+def worker_name() -> str:
+    return multiprocessing.current_process().name
+
+
+def _is_item_stream(value) -> bool:
+    return isinstance(value, Iterable) and not isinstance(value, (str, bytes, dict))
+
+
+def _count_input(profile: StageProfile, items: Iterable) -> Iterator:
+    iterator = iter(items)
+    while True:
+        start = perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            profile.upstream_seconds += perf_counter() - start
+            return
+        profile.upstream_seconds += perf_counter() - start
+        profile.items_in += 1
+        yield item
+
+
+def _time_output(profile: StageProfile, items: Iterable) -> Iterator:
+    iterator = iter(items)
+    while True:
+        upstream_seconds = profile.upstream_seconds
+        start = perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            profile.seconds += _own_seconds(profile, start, upstream_seconds)
+            return
+        profile.record_item(_own_seconds(profile, start, upstream_seconds))
+        yield item
+
+
+def _own_seconds(profile: StageProfile, start: float, upstream_seconds: float) -> float:
+    return perf_counter() - start - (profile.upstream_seconds - upstream_seconds)
@@ -1,38 +1,25 @@
 from abc import ABCMeta, abstractmethod
-from dataclasses import asdict, replace
+from typing import IO, Callable, List
 
 from domain.citation import Citation
+from .serialization import citation_as_dict, to_camel_case
 
 
 class BaseRepository(object):
     __meta__ = ABCMeta
 
+    def __init__(self, filename: str, open_file: Callable[..., IO] = open):
+        """`open_file` opens the output files, e.g. ExportBundle.open() to also compress them"""
+        self._filename = filename
+        self._open_file = open_file
+
     @abstractmethod
-    def write_citations(self, citations):
+    def write_citations(self, citations) -> List[str]:
+        """Write the citations and return the names of the written files"""
         pass
 
     @classmethod
     def _citation_as_dict(cls, citation: Citation):
-        citation_dict = asdict(
-            replace(citation, type=citation.type.value if citation.type else None),
-            dict_factory=cls._to_dict
-        )
-        citation_dict['fullyParsed'] = citation.fully_parsed()
-        return citation_dict
-
-    @classmethod
-    def _to_dict(cls, it):
-        return dict(
-            [
-                (cls.to_camel_case(key), value)
-                for key, value in it
-                if value
-            ]
-        )
+        return citation_as_dict(citation)
 
-    @staticmethod
-    def to_camel_case(snake_str):
-        components = snake_str.split('_')
-        # We capitalize the first letter of each component except the first one
-        # with the 'title' method and join them together.
-        return components[0] + ''.join(x.title() for x in components[1:])
+    to_camel_case = staticmethod(to_camel_case)
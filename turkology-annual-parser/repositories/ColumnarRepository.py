@@ -0,0 +1,190 @@
+import json
+import struct
+import sys
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .BaseRepository import BaseRepository
+from .citation_fields import page_end, page_start, year_published
+from .columnar import (
+    BOOL, BOOL_TYPECODE, CODE_TYPECODE, DICTIONARY, DICTIONARY_LIST, FORMAT_VERSION,
+    HEADER_LENGTH_FORMAT, INT, INT_TYPECODE, MAGIC, NULL_CODE, NULL_INT, OFFSET_TYPECODE,
+    STRING, padding
+)
+from domain.citation import Citation
+
+# Name, kind and value of the columns
+COLUMNS: List[Any] = [
+    ('id', STRING, lambda citation: citation.id),
+    ('volume', INT, lambda citation: citation.volume),
+    ('number', INT, lambda citation: citation.number),
+    ('type', DICTIONARY, lambda citation: citation.type.value if citation.type else None),
+    ('title', STRING, lambda citation: citation.title),
+    ('authors', DICTIONARY_LIST, lambda citation: [
+        author.raw for author in citation.authors if author.raw
+    ]),
+    ('editors', DICTIONARY_LIST, lambda citation: [
+        editor.raw for editor in citation.editors if editor.raw
+    ]),
+    ('keyword_codes', DICTIONARY_LIST, lambda citation: [
+        keyword['code'] for keyword in citation.keywords if keyword.get('code')
+    ]),
+    ('journal', DICTIONARY, lambda citation: (citation.published_in or {}).get('journal')),
+    ('location', DICTIONARY, lambda citation: citation.location),
+    ('series', DICTIONARY, lambda citation: citation.series),
+    ('year', INT, year_published),
+    ('page_start', INT, page_start),
+    ('page_end', INT, page_end),
+    ('fully_parsed', BOOL, lambda citation: citation.is_fully_parsed),
+]
+
+
+class ColumnarRepository(BaseRepository):
+    """
+    Writes the main fields of the citations column by column into a single file, which
+    repositories.columnar.ColumnarFile reads without decoding the columns not asked for.
+
+    Keyword codes, authors, editors, journals, locations, series and types are dictionary
+    encoded, i.e. stored once per distinct value.
+    """
+
+    def write_citations(self, citations: Iterable[Citation]) -> List[str]:
+        builders = [
+            (_COLUMN_BUILDERS[kind](name), value) for name, kind, value in COLUMNS
+        ]
+        number_of_rows = 0
+        for citation in citations:
+            for builder, value in builders:
+                builder.append(value(citation))
+            number_of_rows += 1
+
+        buffers = []
+        columns = []
+        offset = 0
+        for builder, _ in builders:
+            column = builder.header()
+            column['buffers'] = {}
+            for buffer_name, buffer in builder.buffers():
+                length = memoryview(buffer).nbytes
+                column['buffers'][buffer_name] = [offset, length]
+                buffers.append(buffer)
+                offset += length + padding(length)
+            columns.append(column)
+        header = json.dumps({
+            'version': FORMAT_VERSION,
+            'byteorder': sys.byteorder,
+            'rows': number_of_rows,
+            'columns': columns,
+        }, ensure_ascii=False).encode('utf-8')
+
+        header_end = len(MAGIC) + struct.calcsize(HEADER_LENGTH_FORMAT) + len(header)
+        with self._open_file(self._filename, 'wb') as columnar_file:
+            columnar_file.write(MAGIC)
+            columnar_file.write(struct.pack(HEADER_LENGTH_FORMAT, len(header)))
+            columnar_file.write(header)
+            columnar_file.write(bytes(padding(header_end)))
+            for buffer in buffers:
+                columnar_file.write(buffer)
+                columnar_file.write(bytes(padding(memoryview(buffer).nbytes)))
+        return [self._filename]
+
+
+class _IntColumnBuilder(object):
+    def __init__(self, name: str):
+        self.name = name
+        self._values = array(INT_TYPECODE)
+
+    def append(self, value: Optional[int]):
+        self._values.append(NULL_INT if value is None else value)
+
+    def header(self) -> Dict[str, Any]:
+        return {'name': self.name, 'kind': INT}
+
+    def buffers(self):
+        return [('values', self._values)]
+
+
+class _BoolColumnBuilder(object):
+    def __init__(self, name: str):
+        self.name = name
+        self._values = array(BOOL_TYPECODE)
+
+    def append(self, value: bool):
+        self._values.append(1 if value else 0)
+
+    def header(self) -> Dict[str, Any]:
+        return {'name': self.name, 'kind': BOOL}
+
+    def buffers(self):
+        return [('values', self._values)]
+
+
+class _StringColumnBuilder(object):
+    def __init__(self, name: str):
+        self.name = name
+        self._offsets = array(OFFSET_TYPECODE, [0])
+        self._data = bytearray()
+        self._valid = array(BOOL_TYPECODE)
+
+    def append(self, value: Optional[str]):
+        if value is not None:
+            self._data += value.encode('utf-8')
+        self._offsets.append(len(self._data))
+        self._valid.append(value is not None)
+
+    def header(self) -> Dict[str, Any]:
+        return {'name': self.name, 'kind': STRING}
+
+    def buffers(self):
+        return [('offsets', self._offsets), ('data', self._data), ('valid', self._valid)]
+
+
+class _DictionaryEncoder(object):
+    """Assigns each distinct value of a column a code, i.e. its index in the dictionary"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._codes = array(CODE_TYPECODE)
+        self._dictionary: Dict[str, int] = {}
+
+    def _code(self, value: str) -> int:
+        code = self._dictionary.get(value)
+        if code is None:
+            code = self._dictionary[value] = len(self._dictionary)
+        return code
+
+
+class _DictionaryColumnBuilder(_DictionaryEncoder):
+    def append(self, value: Optional[str]):
+        self._codes.append(NULL_CODE if value is None else self._code(value))
+
+    def header(self) -> Dict[str, Any]:
+        return {'name': self.name, 'kind': DICTIONARY, 'dictionary': list(self._dictionary)}
+
+    def buffers(self):
+        return [('codes', self._codes)]
+
+
+class _DictionaryListColumnBuilder(_DictionaryEncoder):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._offsets = array(OFFSET_TYPECODE, [0])
+
+    def append(self, values: List[str]):
+        self._codes.extend(self._code(value) for value in values)
+        self._offsets.append(len(self._codes))
+
+    def header(self) -> Dict[str, Any]:
+        return {'name': self.name, 'kind': DICTIONARY_LIST, 'dictionary': list(self._dictionary)}
+
+    def buffers(self):
+        return [('offsets', self._offsets), ('codes', self._codes)]
+
+
+_COLUMN_BUILDERS: Dict[str, Callable[[str], Any]] = {
+    INT: _IntColumnBuilder,
+    BOOL: _BoolColumnBuilder,
+    STRING: _StringColumnBuilder,
+    DICTIONARY: _DictionaryColumnBuilder,
+    DICTIONARY_LIST: _DictionaryListColumnBuilder,
+}
@@ -1,33 +1,36 @@
 import json
-from typing import List, Iterable
+from typing import Iterable, List
 
 import jsonlines
 
 from .BaseRepository import BaseRepository
 from domain.citation import Citation
 
+WRITE_BUFFER_SIZE = 1024 * 1024  # bytes
 
-class JsonRepository(BaseRepository):
-    def __init__(self, filename):
-        self._filename = filename
-
-    def write_citations(self, citations: Iterable[Citation]):
-        citations = [self._citation_as_dict(citation) for citation in citations]
-        self._write_json(citations)
-        self._write_json_lines(citations)
-
-        with open(self._filename + 'l', 'w') as storage_file:
-            writer = jsonlines.Writer(storage_file)
-            for citation in citations:
-                writer.write(citation)
 
-    def _write_json(self, citations: List[Citation]):
-        with open(self._filename, 'w') as storage_file:
-            json.dump(
-                citations,
-                storage_file
-            )
-
-    def _write_json_lines(self, citations: List[Citation]):
-        with jsonlines.open(self._filename + 'l', 'w') as writer:
-            writer.write_all(citations)
+class JsonRepository(BaseRepository):
+    """
+    Writes the citations as a JSON array to `filename` and as JSON lines to `filename` + 'l'.
+
+    Both files are written in a single pass over the citations, converting one citation to a
+    dict at a time, so the citations can be streamed and their dicts are never all in memory.
+    """
+
+    def write_citations(self, citations: Iterable[Citation]) -> List[str]:
+        json_encoder = json.JSONEncoder()  # Same output as json.dump()
+        json_lines_filename = self._filename + 'l'
+        with self._open_file(self._filename, 'w', buffering=WRITE_BUFFER_SIZE) as json_file, \
+                self._open_file(
+                    json_lines_filename, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE
+                ) as json_lines_file:
+            json_lines_writer = jsonlines.Writer(json_lines_file)
+            json_file.write('[')
+            for index, citation in enumerate(citations):
+                citation_dict = self._citation_as_dict(citation)
+                if index:
+                    json_file.write(', ')
+                json_file.write(json_encoder.encode(citation_dict))
+                json_lines_writer.write(citation_dict)
+            json_file.write(']')
+        return [self._filename, json_lines_filename]
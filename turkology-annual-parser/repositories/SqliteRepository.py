@@ -0,0 +1,143 @@
+import json
+import logging
+import os
+import sqlite3
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+from .BaseRepository import BaseRepository
+from .citation_fields import page_end, page_start
+from domain.citation import Citation
+
+BATCH_SIZE = 1000  # Citations inserted per executemany()
+
+SCHEMA = '''
+CREATE TABLE citations (
+    id TEXT PRIMARY KEY,
+    volume INTEGER,
+    number INTEGER,
+    type TEXT,
+    title TEXT,
+    location TEXT,
+    series TEXT,
+    number_of_pages TEXT,
+    number_of_volumes TEXT,
+    page_start INTEGER,
+    page_end INTEGER,
+    raw_text TEXT,
+    remaining_text TEXT,
+    fully_parsed INTEGER,
+    data TEXT  -- The citation as in the JSON file
+);
+CREATE TABLE persons (
+    citation_id TEXT REFERENCES citations(id),
+    role TEXT,  -- 'author', 'editor' or 'translator'
+    position INTEGER,
+    first TEXT,
+    middle TEXT,
+    last TEXT,
+    raw TEXT
+);
+CREATE TABLE keywords (
+    citation_id TEXT REFERENCES citations(id),
+    position INTEGER,
+    code TEXT,
+    name_de TEXT,
+    name_en TEXT,
+    raw TEXT
+);
+'''
+# Created after inserting all rows, which is faster than updating them with every insert
+INDEXES = [
+    'CREATE INDEX citations_volume_number ON citations(volume, number)',
+    'CREATE INDEX citations_type ON citations(type)',
+    'CREATE INDEX persons_last ON persons(last)',
+    'CREATE INDEX persons_citation_id ON persons(citation_id)',
+    'CREATE INDEX keywords_code ON keywords(code)',
+    'CREATE INDEX keywords_citation_id ON keywords(citation_id)',
+]
+PERSON_ROLES = [('authors', 'author'), ('editors', 'editor'), ('translators', 'translator')]
+
+
+class SqliteRepository(BaseRepository):
+    """
+    Writes the citations into an SQLite database with a table each for citations, persons
+    (authors, editors and translators) and keywords.
+
+    The citations are inserted in batches within a single transaction. The complete citation
+    as written by JsonRepository is stored in the `data` column of the citations table.
+    Citations with the id of a citation written before are left out and logged.
+    SQLite writes the file itself, so `open_file` is not used.
+    """
+
+    def write_citations(self, citations: Iterable[Citation]) -> List[str]:
+        if os.path.exists(self._filename):
+            os.remove(self._filename)
+        connection = sqlite3.connect(self._filename)
+        try:
+            connection.executescript(SCHEMA)
+            with connection:  # One transaction, committed at the end
+                citations = _without_duplicate_ids(citations)
+                for batch in iter(lambda: list(islice(citations, BATCH_SIZE)), []):
+                    self._insert(connection, batch)
+                for index in INDEXES:
+                    connection.execute(index)
+        finally:
+            connection.close()
+        return [self._filename]
+
+    @classmethod
+    def _insert(cls, connection: sqlite3.Connection, citations: List[Citation]):
+        connection.executemany(
+            'INSERT INTO citations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [
+                (
+                    citation.id,
+                    citation.volume,
+                    citation.number,
+                    citation.type.value if citation.type else None,
+                    citation.title,
+                    citation.location,
+                    citation.series,
+                    citation.number_of_pages,
+                    citation.number_of_volumes,
+                    page_start(citation),
+                    page_end(citation),
+                    citation.raw_text,
+                    citation.remaining_text,
+                    citation.is_fully_parsed,
+                    json.dumps(cls._citation_as_dict(citation), ensure_ascii=False),
+                )
+                for citation in citations
+            ]
+        )
+        connection.executemany(
+            'INSERT INTO persons VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [
+                (citation.id, role, position, person.first, person.middle, person.last,
+                 person.raw)
+                for citation in citations
+                for field_name, role in PERSON_ROLES
+                for position, person in enumerate(getattr(citation, field_name))
+            ]
+        )
+        connection.executemany(
+            'INSERT INTO keywords VALUES (?, ?, ?, ?, ?, ?)',
+            [
+                (citation.id, position, keyword.get('code'), keyword.get('nameDE'),
+                 keyword.get('nameEN'), keyword.get('raw'))
+                for citation in citations
+                for position, keyword in enumerate(citation.keywords)
+            ]
+        )
+
+
+def _without_duplicate_ids(citations: Iterable[Citation]) -> Iterator[Citation]:
+    ids = set()
+    for citation in citations:
+        if citation.id in ids:
+            logging.warning(f'Leaving out citation with duplicate id {citation.id} from SQLite '
+                            f'output: {citation.raw_text}')
+            continue
+        ids.add(citation.id)
+        yield citation
@@ -0,0 +1,24 @@
+from typing import Optional
+
+from domain.citation import Citation
+
+
+def year_published(citation: Citation) -> Optional[int]:
+    """
+    Return the year of a monograph or collection, or else the year of the journal volume or
+    TA reference an article was published in.
+    """
+    year = (citation.date_published or {}).get('year')
+    if year is None:
+        published_in = citation.published_in or {}
+        year = published_in.get('year', published_in.get('yearStart'))
+    return year
+
+
+def page_start(citation: Citation) -> Optional[int]:
+    """Return the first page of an article within the journal or TA reference it is in"""
+    return (citation.published_in or {}).get('pageStart')
+
+
+def page_end(citation: Citation) -> Optional[int]:
+    return (citation.published_in or {}).get('pageEnd')
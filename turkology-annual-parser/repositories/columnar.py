@@ -0,0 +1,250 @@
+"""
+A self-contained columnar file format for analysing the citations, e.g. counting them by year,
+journal or keyword, without loading and decoding the complete JSON output.
+
+Layout of a file:
+
+    MAGIC | header length (uint64) | header (JSON) | padding | buffers
+
+The header describes the number of rows and, for every column, its kind and the offset and
+length of its buffers (relative to the start of the buffers). Each buffer is a C array in
+the byte order given in the header, aligned to 8 bytes, so that ColumnarFile can memory-map
+it and read a single column without touching the others.
+
+Kinds of columns and their buffers:
+
+- int: 'values', int64 with NULL_INT for missing values
+- bool: 'values', uint8 of 0 or 1
+- string: 'offsets', int64 with the start of every value and the end of the last one in
+  'data', the UTF-8 encoded values, and 'valid', uint8 of 0 for missing values
+- dictionary: 'codes', int32 indexes into the column's 'dictionary' in the header,
+  NULL_CODE for missing values
+- dictionary_list: 'offsets', int64 with the start of every row's codes and the end of the
+  last row's codes in 'codes', int32 indexes into the 'dictionary'
+"""
+import json
+import mmap
+import struct
+import sys
+from collections import Counter
+from collections.abc import Sequence
+from typing import Dict, List, Optional, overload
+
+MAGIC = b'TACOLS\x00\x01'
+HEADER_LENGTH_FORMAT = '<Q'
+ALIGNMENT = 8
+FORMAT_VERSION = 1
+
+INT = 'int'
+BOOL = 'bool'
+STRING = 'string'
+DICTIONARY = 'dictionary'
+DICTIONARY_LIST = 'dictionary_list'
+
+# Typecodes of the `array` module / memoryview.cast() formats of the buffers
+INT_TYPECODE = 'q'
+BOOL_TYPECODE = 'B'
+OFFSET_TYPECODE = 'q'
+CODE_TYPECODE = 'i'
+
+NULL_INT = -2 ** 63
+NULL_CODE = -1
+
+
+def padding(length: int) -> int:
+    """Return the number of bytes needed to align `length` to ALIGNMENT"""
+    return -length % ALIGNMENT
+
+
+class StringColumn(Sequence):
+    """The strings of a string column, decoded only when accessed"""
+
+    def __init__(self, offsets: memoryview, data: memoryview, valid: memoryview):
+        self.offsets = offsets
+        self.data = data
+        self.valid = valid
+
+    def __len__(self):
+        return len(self.valid)
+
+    @overload
+    def __getitem__(self, index: int) -> Optional[str]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Optional[str]]:
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = range(len(self))[index]
+        if not self.valid[index]:
+            return None
+        return str(self.data[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+
+
+class DictionaryColumn(Sequence):
+    """The values of a dictionary-encoded column, i.e. indexes (codes) into its dictionary"""
+
+    def __init__(self, codes: memoryview, dictionary: List[str]):
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self):
+        return len(self.codes)
+
+    @overload
+    def __getitem__(self, index: int) -> Optional[str]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Optional[str]]:
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        code = self.codes[index]
+        return None if code == NULL_CODE else self.dictionary[code]
+
+    def value_counts(self) -> Counter:
+        """Return the number of rows of every value, without decoding each row"""
+        return Counter({
+            self.dictionary[code]: count
+            for code, count in Counter(self.codes).items() if code != NULL_CODE
+        })
+
+
+class DictionaryListColumn(Sequence):
+    """Lists of dictionary-encoded values per row, e.g. the keyword codes of the citations"""
+
+    def __init__(self, offsets: memoryview, codes: memoryview, dictionary: List[str]):
+        self.offsets = offsets
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> List[str]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[List[str]]:
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = range(len(self))[index]
+        return [
+            self.dictionary[code]
+            for code in self.codes[self.offsets[index]:self.offsets[index + 1]]
+        ]
+
+    def value_counts(self) -> Counter:
+        """Return the number of occurrences of every value over all rows"""
+        return Counter({
+            self.dictionary[code]: count for code, count in Counter(self.codes).items()
+        })
+
+
+class ColumnarFile(object):
+    """
+    Reads a file written by ColumnarRepository, memory-mapping it and decoding only the
+    columns asked for.
+
+    int and bool columns are returned as memoryviews of the file (with NULL_INT for missing
+    ints), the others as sequences decoding a value when it is accessed. They can only be
+    used until the file is closed.
+    """
+
+    def __init__(self, filename: str):
+        with open(filename, 'rb') as columnar_file:
+            self._mmap = mmap.mmap(columnar_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: List[memoryview] = []
+        try:
+            self._header = self._read_header()
+        except Exception:
+            self.close()
+            raise
+        self._columns: Dict[str, dict] = {
+            column['name']: column for column in self._header['columns']
+        }
+
+    @property
+    def number_of_rows(self) -> int:
+        return self._header['rows']
+
+    def __len__(self):
+        return self.number_of_rows
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self._columns)
+
+    def column(self, name: str):
+        if name not in self._columns:
+            raise KeyError(f'No column {name!r}, the columns are {", ".join(self._columns)}')
+        column = self._columns[name]
+        buffers = column['buffers']
+        kind = column['kind']
+        if kind == INT:
+            return self._view(buffers['values'], INT_TYPECODE)
+        if kind == BOOL:
+            return self._view(buffers['values'], BOOL_TYPECODE)
+        if kind == STRING:
+            return StringColumn(
+                self._view(buffers['offsets'], OFFSET_TYPECODE),
+                self._view(buffers['data']),
+                self._view(buffers['valid'], BOOL_TYPECODE),
+            )
+        if kind == DICTIONARY:
+            return DictionaryColumn(
+                self._view(buffers['codes'], CODE_TYPECODE), column['dictionary']
+            )
+        if kind == DICTIONARY_LIST:
+            return DictionaryListColumn(
+                self._view(buffers['offsets'], OFFSET_TYPECODE),
+                self._view(buffers['codes'], CODE_TYPECODE),
+                column['dictionary'],
+            )
+        raise ValueError(f'Unknown kind of column {kind!r}')
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _read_header(self) -> dict:
+        header_start = len(MAGIC) + struct.calcsize(HEADER_LENGTH_FORMAT)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError('Not a columnar citations file')
+        header_length, = struct.unpack_from(HEADER_LENGTH_FORMAT, self._mmap, len(MAGIC))
+        header = json.loads(str(self._mmap[header_start:header_start + header_length], 'utf-8'))
+        if header['version'] != FORMAT_VERSION:
+            raise ValueError(f'Unsupported version {header["version"]} of columnar file')
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError(f'Columnar file has byte order {header["byteorder"]}')
+        data_start = header_start + header_length
+        self._data_start = data_start + padding(data_start)
+        return header
+
+    def _view(self, buffer: List[int], typecode: Optional[str] = None) -> memoryview:
+        offset, length = buffer
+        start = self._data_start + offset
+        view = memoryview(self._mmap)[start:start + length]
+        self._views.append(view)
+        if typecode:
+            view = view.cast(typecode)  # type: ignore[call-overload]  # Not a literal format
+            self._views.append(view)
+        return view
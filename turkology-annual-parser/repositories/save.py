@@ -1,13 +1,31 @@
 import logging
 import os
-from typing import List
+from typing import IO, Callable, Iterable, List
 
 from domain.citation import Citation
+from repositories.ColumnarRepository import ColumnarRepository
 from repositories.JsonRepository import JsonRepository
+from repositories.SqliteRepository import SqliteRepository
 
+REPOSITORIES = {
+    'columnar': ColumnarRepository,
+    'json': JsonRepository,
+    'sqlite': SqliteRepository,
+}
 
-def save_citations(citations: List[Citation], output_filename: str) -> None:
+
+def save_citations(
+        citations: Iterable[Citation],
+        output_filename: str,
+        output_format: str = 'json',
+        open_file: Callable[..., IO] = open
+) -> List[str]:
+    """
+    Write the citations in `output_format` and return the names of the written files.
+
+    The files are opened with `open_file`, if the repository opens them itself.
+    """
     os.makedirs(os.path.dirname(os.path.abspath(output_filename)), exist_ok=True)
-    repository = JsonRepository(output_filename)
-    logging.info('Writing JSON file...')
-    repository.write_citations(citations)
+    repository = REPOSITORIES[output_format](output_filename, open_file)
+    logging.info(f'Writing {output_format} output to {output_filename}...')
+    return repository.write_citations(citations)
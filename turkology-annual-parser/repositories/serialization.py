@@ -0,0 +1,68 @@
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from typing import Any, Callable, Dict
+
+from domain.citation import Citation
+
+Serializer = Callable[[Any], Dict[str, Any]]
+
+# Values of these types are serialized as they are
+PLAIN_TYPES = frozenset([str, int, float, bool, type(None)])
+
+_serializers: Dict[type, Serializer] = {}
+
+
+def citation_as_dict(citation: Citation) -> Dict[str, Any]:
+    """
+    Return the citation as a dict with camelCase keys, leaving out all falsy values.
+
+    Gives the same result as `asdict()` with a dict factory leaving out falsy values and
+    converting the keys to camelCase, but walks the citation with a serializer per class
+    instead of copying it, and converts each field name only once.
+    """
+    citation_dict = as_json_value(citation)
+    citation_dict['fullyParsed'] = citation.is_fully_parsed
+    return citation_dict
+
+
+def as_json_value(value: Any) -> Any:
+    if value.__class__ in PLAIN_TYPES:
+        return value
+    serializer = _serializers.get(type(value))
+    if serializer:
+        return serializer(value)
+    if isinstance(value, (list, tuple)):
+        return [as_json_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: as_json_value(item) for key, item in value.items()}
+    if isinstance(value, Enum):
+        return value.value
+    if is_dataclass(value) and not isinstance(value, type):
+        return _serializer_for(type(value))(value)
+    return value
+
+
+def to_camel_case(snake_str: str) -> str:
+    components = snake_str.split('_')
+    # We capitalize the first letter of each component except the first one
+    # with the 'title' method and join them together.
+    return components[0] + ''.join(x.title() for x in components[1:])
+
+
+def _serializer_for(dataclass_type: type) -> Serializer:
+    """Generate a function serializing instances of `dataclass_type` field by field"""
+    lines = ['def serialize(value):', '    value_dict = {}']
+    for field in fields(dataclass_type):
+        lines.extend([
+            f'    field_value = value.{field.name}',
+            '    if field_value.__class__ not in PLAIN_TYPES:',
+            '        field_value = as_json_value(field_value)',
+            '    if field_value:',
+            f'        value_dict[{to_camel_case(field.name)!r}] = field_value',
+        ])
+    lines.append('    return value_dict')
+    namespace: Dict[str, Any] = {}
+    exec('\n'.join(lines), {'PLAIN_TYPES': PLAIN_TYPES, 'as_json_value': as_json_value}, namespace)
+    serialize = namespace['serialize']
+    _serializers[dataclass_type] = serialize
+    return serialize
@@ -0,0 +1,144 @@
+import pytest
+
+from citation.field_parsing import parse_fields_in_citation
+from domain.citation import Citation, CitationType, Person
+from domain.intermediate_citation import IntermediateCitation
+from ..ColumnarRepository import ColumnarRepository
+from ..columnar import NULL_INT, ColumnarFile
+
+CITATIONS = [
+    Citation(
+        id='1-1',
+        volume=1,
+        number=1,
+        type=CitationType.MONOGRAPH,
+        title='Lexikon der islamischen Welt',
+        authors=[Person(first='Klaus', last='Kreiser', raw='Kreiser, Klaus')],
+        editors=[
+            Person(first='Werner', last='Diem', raw='Werner Diem'),
+            Person(first='Hans', middle='Georg', last='Majer', raw='Hans Georg Majer'),
+        ],
+        keywords=[{'code': 'A', 'nameDE': 'Allgemeines', 'raw': 'A. Allgemeines'}],
+        location='Stuttgart',
+        date_published={'year': 1974},
+        remaining_text='{{{ authors }}} {{{ title }}}.',
+    ),
+    Citation(
+        id='1-2',
+        volume=1,
+        number=2,
+        type=CitationType.ARTICLE,
+        title='Türk dili',
+        authors=[Person(first='İsmail', last='Özeğe', raw='Özeğe, İsmail')],
+        keywords=[{'code': 'A'}, {'code': 'AC'}],
+        published_in={'journal': 'POF', 'year': 1970, 'pageStart': 213, 'pageEnd': 221,
+                      'type': 'journal'},
+    ),
+    Citation(id='2-5', volume=2, number=5, keywords=[{'raw': '1. Irgendwas'}]),
+]
+
+
+@pytest.fixture
+def columnar_file(tmp_path):
+    filename = str(tmp_path / 'ta.tacol')
+    assert ColumnarRepository(filename).write_citations(iter(CITATIONS)) == [filename]
+    columnar_file = ColumnarFile(filename)
+    yield columnar_file
+    columnar_file.close()
+
+
+def test_reads_int_and_bool_columns(columnar_file):
+    assert len(columnar_file) == 3
+    assert list(columnar_file.column('volume')) == [1, 1, 2]
+    assert list(columnar_file.column('year')) == [1974, 1970, NULL_INT]
+    assert list(columnar_file.column('page_end')) == [NULL_INT, 221, NULL_INT]
+    assert list(columnar_file.column('fully_parsed')) == [1, 0, 0]
+
+
+def test_reads_string_columns(columnar_file):
+    titles = columnar_file.column('title')
+    assert list(titles) == ['Lexikon der islamischen Welt', 'Türk dili', None]
+    assert titles[-2] == 'Türk dili'
+    assert list(columnar_file.column('id')) == ['1-1', '1-2', '2-5']
+
+
+def test_reads_dictionary_encoded_columns(columnar_file):
+    journals = columnar_file.column('journal')
+    assert list(journals) == [None, 'POF', None]
+    assert journals.dictionary == ['POF']
+    assert list(columnar_file.column('type')) == ['monograph', 'article', None]
+    assert columnar_file.column('location').value_counts() == {'Stuttgart': 1}
+
+
+def test_reads_dictionary_encoded_list_columns(columnar_file):
+    keyword_codes = columnar_file.column('keyword_codes')
+    assert list(keyword_codes) == [['A'], ['A', 'AC'], []]
+    assert keyword_codes.dictionary == ['A', 'AC']
+    assert keyword_codes.value_counts() == {'A': 2, 'AC': 1}
+    assert columnar_file.column('editors')[0] == ['Werner Diem', 'Hans Georg Majer']
+    assert columnar_file.column('authors')[:2] == [['Kreiser, Klaus'], ['Özeğe, İsmail']]
+
+
+def test_reads_years_and_pages_of_parsed_citations(tmp_path):
+    # given
+    citations = [
+        parse_fields_in_citation(IntermediateCitation(
+            volume=1, number='1', location='Stuttgart', date_published='1974'
+        )),
+        parse_fields_in_citation(IntermediateCitation(
+            volume=1, number='2', published_in='POF 20-21.1970/71 (1974).213-221'
+        )),
+        parse_fields_in_citation(IntermediateCitation(
+            volume=1, number='3', published_in='Belleten 1972. S. 17'
+        )),
+        parse_fields_in_citation(IntermediateCitation(
+            volume=1, number='4', published_in='TA 26.314.235-243'
+        )),
+    ]
+    filename = str(tmp_path / 'ta.tacol')
+
+    # when
+    ColumnarRepository(filename).write_citations(citations)
+
+    # then
+    with ColumnarFile(filename) as columnar_file:
+        assert list(columnar_file.column('year')) == [1974, 1970, 1972, NULL_INT]
+        assert list(columnar_file.column('page_start')) == [NULL_INT, 213, 17, 235]
+        assert list(columnar_file.column('page_end')) == [NULL_INT, 221, NULL_INT, 243]
+        assert list(columnar_file.column('journal')) == [None, 'POF', 'Belleten', None]
+
+
+def test_writes_empty_file(tmp_path):
+    # given
+    filename = str(tmp_path / 'empty.tacol')
+
+    # when
+    ColumnarRepository(filename).write_citations([])
+
+    # then
+    with ColumnarFile(filename) as columnar_file:
+        assert len(columnar_file) == 0
+        assert list(columnar_file.column('keyword_codes')) == []
+        assert list(columnar_file.column('title')) == []
+
+
+def test_closes_file_with_columns_in_use(columnar_file):
+    # given
+    volumes = columnar_file.column('volume')
+    columnar_file.column('title')
+
+    # when
+    columnar_file.close()
+
+    # then
+    with pytest.raises(ValueError):
+        volumes[0]
+
+
+def test_rejects_unknown_columns_and_files(columnar_file, tmp_path):
+    with pytest.raises(KeyError):
+        columnar_file.column('unknown')
+    filename = tmp_path / 'ta.json'
+    filename.write_text('[]')
+    with pytest.raises(ValueError):
+        ColumnarFile(str(filename))
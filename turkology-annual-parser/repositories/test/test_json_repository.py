@@ -0,0 +1,58 @@
+import json
+
+from domain.citation import Citation, CitationType, Person
+from ..JsonRepository import JsonRepository
+
+CITATIONS = [
+    Citation(
+        id='1-1',
+        volume=1,
+        number=1,
+        type=CitationType.MONOGRAPH,
+        title='Lexikon der islamischen Welt',
+        authors=[Person(first='Klaus', last='Kreiser', raw='Kreiser, Klaus')],
+        remaining_text='{{{ authors }}} {{{ title }}}.',
+    ),
+    Citation(id='1-2', volume=1, number=2, title='Türk dili', remaining_text='Türk dili'),
+]
+
+
+def test_writes_json_and_json_lines(tmp_path):
+    # given
+    filename = str(tmp_path / 'ta.json')
+
+    # when
+    JsonRepository(filename).write_citations(iter(CITATIONS))
+
+    # then
+    expected_dicts = [
+        {
+            'id': '1-1', 'volume': 1, 'number': 1, 'type': 'monograph',
+            'title': 'Lexikon der islamischen Welt',
+            'authors': [{'first': 'Klaus', 'last': 'Kreiser', 'raw': 'Kreiser, Klaus'}],
+            'remainingText': '{{{ authors }}} {{{ title }}}.', 'fullyParsed': True,
+        },
+        {
+            'id': '1-2', 'volume': 1, 'number': 2, 'title': 'Türk dili',
+            'remainingText': 'Türk dili', 'fullyParsed': False,
+        },
+    ]
+    with open(filename) as json_file:
+        assert json_file.read() == json.dumps(expected_dicts)
+    with open(filename + 'l', encoding='utf-8') as json_lines_file:
+        assert json_lines_file.read() == ''.join(
+            json.dumps(citation_dict, ensure_ascii=False) + '\n'
+            for citation_dict in expected_dicts
+        )
+
+
+def test_writes_empty_array_without_citations(tmp_path):
+    # given
+    filename = str(tmp_path / 'ta.json')
+
+    # when
+    JsonRepository(filename).write_citations([])
+
+    # then
+    with open(filename) as json_file:
+        assert json.load(json_file) == []
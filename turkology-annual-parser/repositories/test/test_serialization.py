@@ -0,0 +1,50 @@
+import json
+from dataclasses import asdict, replace
+
+from domain.citation import Citation, CitationType, Person
+from ..serialization import citation_as_dict, to_camel_case
+
+CITATION = Citation(
+    id='1-3',
+    volume=1,
+    number=3,
+    type=CitationType.COLLECTION,
+    title='Lexikon der islamischen Welt',
+    editors=[
+        Person(first='Klaus', last='Kreiser', raw='Klaus Kreiser'),
+        Person(first='Hans', middle='Georg', last='Majer', raw='Hans Georg Majer'),
+        Person(),
+    ],
+    keywords=[{
+        'code': 'AB', 'nameDE': 'Forschungsbetrieb', 'nameEN': 'Research activities',
+        'raw': 'AB. Forschungsbetrieb',
+        'super': {'code': 'A', 'nameDE': 'Allgemeines', 'nameEN': 'General', 'raw': None,
+                  'super': None},
+    }],
+    published_in={'journal': 'POF', 'volume': 20, 'type': 'journal', 'raw': 'POF 20.1974'},
+    date_published={'year': 1974},
+    page_start=0,
+    series='Urban-Taschenbücher, 200/1-3',
+    raw_text='3. Lexikon der islamischen Welt.',
+    remaining_text='{{{ title }}}. {{{ editors }}}',
+)
+
+
+def test_converts_field_names_to_camel_case():
+    assert to_camel_case('ta_references') == 'taReferences'
+    assert to_camel_case('originalIndex') == 'originalIndex'
+
+
+def test_serializes_like_asdict():
+    # when
+    citation_dict = citation_as_dict(CITATION)
+
+    # then
+    expected_dict = asdict(
+        replace(CITATION, type=CITATION.type.value),
+        dict_factory=lambda items: {to_camel_case(key): value for key, value in items if value}
+    )
+    expected_dict['fullyParsed'] = True
+    assert json.dumps(citation_dict) == json.dumps(expected_dict)
+    assert citation_dict['editors'][2] == {}
+    assert 'pageStart' not in citation_dict
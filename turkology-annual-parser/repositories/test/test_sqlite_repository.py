@@ -0,0 +1,137 @@
+import json
+import logging
+import sqlite3
+
+from citation.field_parsing import parse_fields_in_citation
+from domain.citation import Citation, CitationType, Person
+from domain.intermediate_citation import IntermediateCitation
+from ..SqliteRepository import SqliteRepository
+from ..serialization import citation_as_dict
+
+CITATIONS = [
+    Citation(
+        id='1-1',
+        volume=1,
+        number=1,
+        type=CitationType.MONOGRAPH,
+        title='Lexikon der islamischen Welt',
+        authors=[Person(first='Klaus', last='Kreiser', raw='Kreiser, Klaus')],
+        editors=[
+            Person(first='Werner', last='Diem', raw='Werner Diem'),
+            Person(first='Hans', middle='Georg', last='Majer', raw='Hans Georg Majer'),
+        ],
+        keywords=[{'code': 'A', 'nameDE': 'Allgemeines', 'nameEN': 'General',
+                   'raw': 'A. Allgemeines', 'super': None}],
+        remaining_text='{{{ authors }}} {{{ title }}}.',
+    ),
+    Citation(id='2-5', volume=2, number=5, keywords=[{'raw': '1. Irgendwas'}]),
+]
+
+
+def test_writes_citations_persons_and_keywords(tmp_path):
+    # given
+    filename = str(tmp_path / 'ta.sqlite')
+
+    # when
+    written_files = SqliteRepository(filename).write_citations(iter(CITATIONS))
+
+    # then
+    assert written_files == [filename]
+    connection = sqlite3.connect(filename)
+    assert connection.execute(
+        'SELECT id, volume, number, type, title, fully_parsed FROM citations ORDER BY id'
+    ).fetchall() == [
+        ('1-1', 1, 1, 'monograph', 'Lexikon der islamischen Welt', 1),
+        ('2-5', 2, 5, None, None, 0),
+    ]
+    assert connection.execute(
+        'SELECT citation_id, role, position, last FROM persons ORDER BY role, position'
+    ).fetchall() == [
+        ('1-1', 'author', 0, 'Kreiser'),
+        ('1-1', 'editor', 0, 'Diem'),
+        ('1-1', 'editor', 1, 'Majer'),
+    ]
+    assert connection.execute(
+        'SELECT citation_id, code, name_de, raw FROM keywords ORDER BY citation_id'
+    ).fetchall() == [
+        ('1-1', 'A', 'Allgemeines', 'A. Allgemeines'),
+        ('2-5', None, None, '1. Irgendwas'),
+    ]
+    data = connection.execute("SELECT data FROM citations WHERE id = '1-1'").fetchone()[0]
+    assert json.loads(data) == citation_as_dict(CITATIONS[0])
+
+
+def test_uses_indexes(tmp_path):
+    # given
+    filename = str(tmp_path / 'ta.sqlite')
+    SqliteRepository(filename).write_citations(CITATIONS)
+    connection = sqlite3.connect(filename)
+
+    # when
+    plans = [
+        str(connection.execute(f'EXPLAIN QUERY PLAN {query}').fetchall())
+        for query in [
+            'SELECT * FROM citations WHERE volume = 1 AND number = 1',
+            "SELECT * FROM citations WHERE type = 'article'",
+            "SELECT * FROM persons WHERE last = 'Kreiser'",
+            "SELECT * FROM keywords WHERE code = 'A'",
+        ]
+    ]
+
+    # then
+    assert all('USING INDEX' in plan for plan in plans)
+
+
+def test_replaces_existing_database(tmp_path):
+    # given
+    filename = str(tmp_path / 'ta.sqlite')
+    SqliteRepository(filename).write_citations(CITATIONS)
+
+    # when
+    SqliteRepository(filename).write_citations(CITATIONS[1:])
+
+    # then
+    connection = sqlite3.connect(filename)
+    assert connection.execute('SELECT id FROM citations').fetchall() == [('2-5',)]
+
+
+def test_writes_pages_of_articles(tmp_path):
+    # given
+    filename = str(tmp_path / 'ta.sqlite')
+    citation = parse_fields_in_citation(IntermediateCitation(
+        volume=1, number='2', published_in='POF 20-21.1970/71 (1974).213-221'
+    ))
+
+    # when
+    SqliteRepository(filename).write_citations([citation])
+
+    # then
+    connection = sqlite3.connect(filename)
+    assert connection.execute('SELECT page_start, page_end FROM citations').fetchall() == [
+        (213, 221)
+    ]
+
+
+def test_leaves_out_citations_with_duplicate_ids(tmp_path, caplog):
+    # given
+    filename = str(tmp_path / 'ta.sqlite')
+    duplicate = Citation(id='1-1', volume=1, number=1, title='Aus einer anderen Datei',
+                         authors=[Person(last='Diem', raw='Diem, Werner')])
+
+    # when
+    with caplog.at_level(logging.WARNING):
+        written_files = SqliteRepository(filename).write_citations(
+            [*CITATIONS, duplicate]
+        )
+
+    # then
+    assert written_files == [filename]
+    connection = sqlite3.connect(filename)
+    assert connection.execute('SELECT id, title FROM citations ORDER BY id').fetchall() == [
+        ('1-1', 'Lexikon der islamischen Welt'),
+        ('2-5', None),
+    ]
+    assert connection.execute(
+        "SELECT last FROM persons WHERE citation_id = '1-1' AND role = 'author'"
+    ).fetchall() == [('Kreiser',)]
+    assert 'duplicate id 1-1' in caplog.text
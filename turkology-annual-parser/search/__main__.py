@@ -0,0 +1,28 @@
+import argparse
+import sys
+import time
+
+from search.search_index import DEFAULT_LIMIT, SearchIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search the parsed citations')
+    parser.add_argument('index', help='Location of the search index (see main.py --search-index)')
+    parser.add_argument('query', nargs='+', help="Words to search for, e.g. 'türk dil*'")
+    parser.add_argument(
+        '--limit', type=int, default=DEFAULT_LIMIT,
+        help=f'Maximum number of citations to return (default: {DEFAULT_LIMIT})'
+    )
+    args = parser.parse_args()
+    search_index = SearchIndex(args.index)
+    start = time.perf_counter()
+    citation_ids = search_index.search(' '.join(args.query), args.limit)
+    duration = time.perf_counter() - start
+    search_index.close()
+    for citation_id in citation_ids:
+        print(citation_id)
+    print(f'{len(citation_ids)} citations in {duration * 1000:.1f} ms', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import logging
+import os
+import re
+import sqlite3
+import unicodedata
+from itertools import islice
+from typing import Iterable, List
+
+from domain.citation import Citation
+
+BATCH_SIZE = 1000  # Citations inserted per executemany()
+DEFAULT_LIMIT = 20
+
+# Letters which are not decomposed into a base letter and a combining mark
+FOLDED_LETTERS = str.maketrans({
+    'ı': 'i', 'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ø': 'o', 'đ': 'd', 'ł': 'l', 'þ': 'th',
+})
+combining_marks_pattern = re.compile('[\u0300-\u036f]+')
+query_term_pattern = re.compile(r'\w+\*?')
+
+# Weights of the columns for ranking, more important columns first
+COLUMN_WEIGHTS = [
+    ('title', 10.0),
+    ('authors', 5.0),
+    ('keywords', 3.0),
+    ('series', 2.0),
+    ('raw_text', 1.0),
+]
+SCHEMA = '''
+CREATE VIRTUAL TABLE citation_search USING fts5(
+    id UNINDEXED, {columns}, tokenize = "unicode61 remove_diacritics 0"
+)
+'''.format(columns=', '.join(column for column, _ in COLUMN_WEIGHTS))
+INSERT_QUERY = 'INSERT INTO citation_search VALUES (?, {})'.format(
+    ', '.join('?' for _ in COLUMN_WEIGHTS)
+)
+SEARCH_QUERY = '''
+SELECT id FROM citation_search
+WHERE citation_search MATCH ?
+ORDER BY bm25(citation_search, 0, {weights})
+LIMIT ?
+'''.format(weights=', '.join(str(weight) for _, weight in COLUMN_WEIGHTS))
+
+
+def fold_diacritics(text: str) -> str:
+    """
+    Lowercase the text and remove diacritics, e.g. 'Özeğe, İsmail' → 'ozege, ismail'.
+
+    Both the indexed texts and the queries are folded, so that e.g. 'turk' finds 'Türk' and
+    'Türk' finds 'TURK'. The Turkish dotless 'ı' becomes 'i'.
+    """
+    text = unicodedata.normalize('NFKD', text.lower()).translate(FOLDED_LETTERS)
+    return combining_marks_pattern.sub('', text)
+
+
+def build_search_index(citations: Iterable[Citation], filename: str) -> None:
+    """
+    Build a full-text search index (SQLite FTS5) over the title, authors, editors, translators,
+    keywords, series and raw text of the citations.
+    """
+    logging.info(f'Writing search index to {filename}...')
+    if os.path.exists(filename):
+        os.remove(filename)
+    connection = sqlite3.connect(filename)
+    try:
+        with connection:
+            connection.execute(SCHEMA)
+            citations = iter(citations)
+            for batch in iter(lambda: list(islice(citations, BATCH_SIZE)), []):
+                connection.executemany(
+                    INSERT_QUERY, [_search_row(citation) for citation in batch]
+                )
+            # Merge the index segments for faster queries
+            connection.execute("INSERT INTO citation_search(citation_search) VALUES ('optimize')")
+    finally:
+        connection.close()
+
+
+class SearchIndex(object):
+    """Queries a search index built by build_search_index()"""
+
+    def __init__(self, filename: str):
+        if not os.path.exists(filename):
+            raise FileNotFoundError(f'Search index {filename} does not exist')
+        self._connection = sqlite3.connect(filename)
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[str]:
+        """
+        Return the ids of the citations containing all words of the query, best matches first.
+
+        A word ending in '*' also matches all words beginning with it.
+        """
+        match_expression = ' '.join(
+            f'"{term[:-1]}"*' if term.endswith('*') else f'"{term}"'
+            for term in query_term_pattern.findall(fold_diacritics(query))
+        )
+        if not match_expression:
+            return []
+        return [
+            citation_id
+            for citation_id, in self._connection.execute(SEARCH_QUERY, (match_expression, limit))
+        ]
+
+    def close(self):
+        self._connection.close()
+
+
+def _search_row(citation: Citation):
+    persons = [*citation.authors, *citation.editors, *citation.translators]
+    keyword_names = [
+        keyword.get(key) or ''
+        for keyword in citation.keywords
+        for key in ('code', 'nameDE', 'nameEN')
+    ]
+    texts = {
+        'title': citation.title or '',
+        'authors': ' ; '.join(person.raw or '' for person in persons),
+        'keywords': ' ; '.join(keyword_names),
+        'series': citation.series or '',
+        'raw_text': citation.raw_text or '',
+    }
+    return (citation.id, *(fold_diacritics(texts[column]) for column, _ in COLUMN_WEIGHTS))
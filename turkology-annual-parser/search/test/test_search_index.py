@@ -0,0 +1,79 @@
+import pytest
+
+from domain.citation import Citation, Person
+from ..search_index import SearchIndex, build_search_index, fold_diacritics
+
+CITATIONS = [
+    Citation(
+        id='1-1',
+        volume=1,
+        number=1,
+        title='Türk dili tarihi',
+        authors=[Person(first='İsmail', last='Özeğe', raw='Özeğe, İsmail')],
+        keywords=[{'code': 'C', 'nameDE': 'Sprache', 'nameEN': 'Language'}],
+        raw_text='1. Özeğe, İsmail: Türk dili tarihi. Ankara 1970.',
+    ),
+    Citation(
+        id='1-2',
+        volume=1,
+        number=2,
+        title='Osmanische Urkunden',
+        series='Studien zur Sprache und Geschichte',
+        raw_text='2. Majer, Hans Georg: Osmanische Urkunden. Eine türkische Quelle.',
+    ),
+    Citation(id='2-5', volume=2, number=5, raw_text='5. Irgendwas zur Straße nach Kırşehir'),
+]
+
+
+@pytest.fixture
+def search_index(tmp_path):
+    filename = str(tmp_path / 'ta_search.sqlite')
+    build_search_index(iter(CITATIONS), filename)
+    search_index = SearchIndex(filename)
+    yield search_index
+    search_index.close()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Özeğe, İsmail', 'ozege, ismail'),
+    ('Kırşehir', 'kirsehir'),
+    ('Straße', 'strasse'),
+    ('TÜRKÇE', 'turkce'),
+    ('Übersetzung', 'ubersetzung'),
+])
+def test_folds_diacritics(text, expected):
+    assert fold_diacritics(text) == expected
+
+
+def test_finds_citations_regardless_of_diacritics(search_index):
+    assert search_index.search('ozege') == ['1-1']
+    assert search_index.search('ÖZEĞE ismail') == ['1-1']
+    assert search_index.search('kirsehir strasse') == ['2-5']
+
+
+def test_ranks_titles_above_raw_text(search_index):
+    # 'türk' is in the title of 1-1, but only in the raw text of 1-2
+    assert search_index.search('türk*') == ['1-1', '1-2']
+
+
+def test_searches_keywords_and_series(search_index):
+    assert search_index.search('sprache') == ['1-1', '1-2']
+    assert search_index.search('language') == ['1-1']
+
+
+def test_requires_all_words(search_index):
+    assert search_index.search('osmanische tarihi') == []
+
+
+def test_limits_results(search_index):
+    assert search_index.search('türk*', limit=1) == ['1-1']
+
+
+@pytest.mark.parametrize('query', ['', '  ', '"', 'AND OR'])
+def test_finds_nothing_for_queries_without_words_or_with_operators(search_index, query):
+    assert search_index.search(query) == []
+
+
+def test_fails_for_missing_index(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        SearchIndex(str(tmp_path / 'missing.sqlite'))
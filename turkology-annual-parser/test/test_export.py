@@ -0,0 +1,191 @@
+import logging
+import os
+import zipfile
+
+import pytest
+
+import export
+from export import CODECS, Codec, ExportBundle
+
+JSON_TEXT = '[{"title": "Türk dili tarihi"}, ' * 2000 + ']'
+BINARY_DATA = bytes(range(256)) * 500
+
+
+@pytest.fixture
+def resources_dir(tmp_path):
+    resources_dir = tmp_path / 'resources'
+    (resources_dir / 'docs').mkdir(parents=True)
+    (resources_dir / 'README.txt').write_text('Turkology Annual\n')
+    (resources_dir / 'docs' / 'Übersicht.txt').write_text('Schlüssel ' * 1000)
+    return str(resources_dir)
+
+
+def write_bundle(tmp_path, resources_dir, codec='deflate', level=9, cache_dir=None):
+    zip_path = str(tmp_path / 'out' / 'bundle.zip')
+    json_path = str(tmp_path / 'ta.json')
+    binary_path = str(tmp_path / 'ta.tacol')
+    added_path = str(tmp_path / 'ta.sqlite')
+    with open(added_path, 'wb') as added_file:
+        added_file.write(BINARY_DATA)
+    with ExportBundle(zip_path, codec, level, cache_dir=cache_dir) as export_bundle:
+        export_bundle.add_resources(resources_dir)
+        with export_bundle.open(json_path, 'w', buffering=1024, encoding='utf-8') as json_file:
+            for start in range(0, len(JSON_TEXT), 1000):
+                json_file.write(JSON_TEXT[start:start + 1000])
+        with export_bundle.open(binary_path, 'wb') as binary_file:
+            binary_file.write(BINARY_DATA)
+        export_bundle.add_files([json_path, binary_path, added_path])
+    return zip_path
+
+
+def read_bundle(zip_path):
+    with zipfile.ZipFile(zip_path) as zip_file:
+        assert zip_file.testzip() is None
+        return {info.filename: zip_file.read(info) for info in zip_file.infolist()}
+
+
+@pytest.mark.parametrize('codec, compress_type', [
+    ('stored', zipfile.ZIP_STORED),
+    ('deflate', zipfile.ZIP_DEFLATED),
+    ('bzip2', zipfile.ZIP_BZIP2),
+])
+def test_writes_streamed_added_and_resource_files(tmp_path, resources_dir, codec, compress_type):
+    # when
+    zip_path = write_bundle(tmp_path, resources_dir, codec)
+
+    # then
+    assert read_bundle(zip_path) == {
+        'README.txt': b'Turkology Annual\n',
+        os.path.join('docs', 'Übersicht.txt'): ('Schlüssel ' * 1000).encode('utf-8'),
+        'ta.json': JSON_TEXT.encode('utf-8'),
+        'ta.tacol': BINARY_DATA,
+        'ta.sqlite': BINARY_DATA,
+    }
+    with open(tmp_path / 'ta.json', 'rb') as json_file:
+        assert json_file.read() == JSON_TEXT.encode('utf-8')
+    with open(tmp_path / 'ta.tacol', 'rb') as binary_file:
+        assert binary_file.read() == BINARY_DATA
+    with zipfile.ZipFile(zip_path) as zip_file:
+        assert {info.compress_type for info in zip_file.infolist()} == {compress_type}
+
+
+def test_writes_zip64_records_for_large_bundles(tmp_path, resources_dir, monkeypatch):
+    # given
+    monkeypatch.setattr(export, 'ZIP64_LIMIT', 1000)
+    monkeypatch.setattr(export, 'ZIP64_ENTRIES_LIMIT', 3)
+
+    # when
+    zip_path = write_bundle(tmp_path, resources_dir, 'stored', 0)
+
+    # then
+    assert read_bundle(zip_path)['ta.sqlite'] == BINARY_DATA
+    with open(zip_path, 'rb') as zip_file:
+        data = zip_file.read()
+    assert b'PK\x06\x06' in data and b'PK\x06\x07' in data
+
+
+def test_reuses_compressed_resources_until_they_change(tmp_path, resources_dir, caplog):
+    # given
+    cache_dir = str(tmp_path / 'cache')
+    readme = os.path.join(resources_dir, 'README.txt')
+    caplog.set_level(logging.DEBUG)
+    write_bundle(tmp_path, resources_dir, cache_dir=cache_dir)
+    assert 'Reusing compressed' not in caplog.text
+
+    # when
+    caplog.clear()
+    zip_path = write_bundle(tmp_path, resources_dir, cache_dir=cache_dir)
+
+    # then
+    assert 'Reusing compressed README.txt' in caplog.text
+    assert read_bundle(zip_path)['README.txt'] == b'Turkology Annual\n'
+
+    # when
+    caplog.clear()
+    with open(readme, 'w') as readme_file:
+        readme_file.write('Turkology Annual, revised\n')
+    os.utime(readme, ns=(0, os.stat(readme).st_mtime_ns + 10 ** 9))
+    zip_path = write_bundle(tmp_path, resources_dir, cache_dir=cache_dir)
+
+    # then
+    assert 'Reusing compressed README.txt' not in caplog.text
+    assert read_bundle(zip_path)['README.txt'] == b'Turkology Annual, revised\n'
+
+    # when
+    caplog.clear()
+    zip_path = write_bundle(tmp_path, resources_dir, 'deflate', 1, cache_dir=cache_dir)
+
+    # then
+    assert 'Reusing compressed' not in caplog.text
+    assert read_bundle(zip_path)['README.txt'] == b'Turkology Annual, revised\n'
+
+
+class FailingCompressor(object):
+    def compress(self, data):
+        raise MemoryError('compressor failed')
+
+    def flush(self):
+        return b''
+
+
+@pytest.mark.parametrize('data_size', [10, 100000])
+def test_fails_without_bundle_when_compression_fails(tmp_path, monkeypatch, data_size):
+    # given
+    monkeypatch.setitem(CODECS, 'deflate', CODECS['deflate']._replace(
+        compressor=lambda level: FailingCompressor()
+    ))
+    monkeypatch.setattr(export, 'MAX_QUEUED_CHUNKS', 1)
+    zip_path = tmp_path / 'bundle.zip'
+    json_path = str(tmp_path / 'ta.json')
+
+    # when
+    with pytest.raises(MemoryError):
+        with ExportBundle(str(zip_path)) as export_bundle:
+            with export_bundle.open(json_path, 'wb', buffering=64) as json_file:
+                for _ in range(data_size):
+                    json_file.write(b'[]')
+
+    # then
+    assert os.listdir(tmp_path) == ['ta.json']
+
+
+def test_keeps_previous_bundle_when_compression_fails(tmp_path, resources_dir, monkeypatch):
+    # given
+    zip_path = write_bundle(tmp_path, resources_dir)
+    previous_bundle = read_bundle(zip_path)
+    monkeypatch.setitem(CODECS, 'bzip2', Codec(
+        zipfile.ZIP_BZIP2, 46, lambda level: FailingCompressor(), range(1, 10)
+    ))
+
+    # when
+    with pytest.raises(MemoryError):
+        write_bundle(tmp_path, resources_dir, 'bzip2')
+
+    # then
+    assert read_bundle(zip_path) == previous_bundle
+    assert os.listdir(os.path.dirname(zip_path)) == ['bundle.zip']
+
+
+def test_surfaces_error_when_bundle_cannot_be_created(tmp_path, monkeypatch):
+    # given
+    zip_path = tmp_path / 'bundle.zip'
+
+    def failing_open(filename, mode='r', *args, **kwargs):
+        raise PermissionError(f'Cannot open {filename} for writing')
+
+    monkeypatch.setattr(export, 'open', failing_open, raising=False)
+
+    # when
+    with pytest.raises(PermissionError):
+        with ExportBundle(str(zip_path)) as export_bundle:
+            export_bundle.add_files([])
+
+    # then
+    assert not zip_path.exists()
+
+
+def test_rejects_unknown_codecs_and_levels(tmp_path):
+    with pytest.raises(ValueError):
+        ExportBundle(str(tmp_path / 'bundle.zip'), 'lzma')
+    with pytest.raises(ValueError):
+        ExportBundle(str(tmp_path / 'bundle.zip'), 'bzip2', 0)
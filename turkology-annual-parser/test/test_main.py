@@ -0,0 +1,57 @@
+import sys
+
+import pytest
+
+from main import parse_command_line_args
+
+REQUIRED_ARGS = ['-i', 'ocr', '-o', 'ta.json', '-z', 'ta.zip', '--keyword-file', 'keywords.csv']
+
+
+def parse_args(monkeypatch, *args):
+    monkeypatch.setattr(sys, 'argv', ['main.py', *REQUIRED_ARGS, *args])
+    return parse_command_line_args()
+
+
+def test_author_rounds_default_to_one(monkeypatch):
+    # when
+    args = parse_args(monkeypatch)
+
+    # then
+    assert args.author_rounds == 1
+
+
+def test_accepts_positive_author_rounds(monkeypatch):
+    # when
+    args = parse_args(monkeypatch, '--author-rounds', '3')
+
+    # then
+    assert args.author_rounds == 3
+
+
+@pytest.mark.parametrize('author_rounds', ['0', '-1', 'two'])
+def test_rejects_author_rounds_below_one(monkeypatch, capsys, author_rounds):
+    # when
+    with pytest.raises(SystemExit):
+        parse_args(monkeypatch, '--author-rounds', author_rounds)
+
+    # then
+    assert '--author-rounds' in capsys.readouterr().err
+
+
+def test_rejects_zip_level_not_supported_by_zip_codec(monkeypatch, capsys):
+    # when
+    with pytest.raises(SystemExit):
+        parse_args(monkeypatch, '--zip-codec', 'bzip2', '--zip-level', '0')
+
+    # then
+    assert 'bzip2 needs a level from 1 to 9' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('workers', ['0', '-2'])
+def test_rejects_workers_below_one(monkeypatch, capsys, workers):
+    # when
+    with pytest.raises(SystemExit):
+        parse_args(monkeypatch, '--workers', workers)
+
+    # then
+    assert '--workers' in capsys.readouterr().err
@@ -0,0 +1,124 @@
+import json
+import time
+
+from profiling import StageProfiler, merge_reports, write_report
+
+PRODUCE_SECONDS = 0.05
+DOUBLE_SECONDS = 0.01
+
+
+def produce(_):
+    for number in range(3):
+        time.sleep(PRODUCE_SECONDS)
+        yield number
+
+
+def double(numbers):
+    for number in numbers:
+        time.sleep(DOUBLE_SECONDS)
+        yield number * 2
+
+
+def collect(numbers):
+    return list(numbers)
+
+
+def total(numbers):
+    return {'total': sum(numbers)}
+
+
+def run_profiled(profiler, *stages):
+    result = None
+    for stage in stages:
+        result = profiler.profile(stage)(result)
+    return result
+
+
+def stage_profiles(profiler):
+    return {profile['name']: profile for profile in profiler.report()}
+
+
+def test_attributes_time_of_lazy_stages_to_the_stage_producing_the_items():
+    # given
+    profiler = StageProfiler()
+
+    # when
+    result = run_profiled(profiler, produce, double, collect)
+
+    # then
+    assert result == [0, 2, 4]
+    profiles = stage_profiles(profiler)
+    assert 3 * PRODUCE_SECONDS <= profiles['produce']['seconds'] < 4 * PRODUCE_SECONDS
+    assert 3 * DOUBLE_SECONDS <= profiles['double']['seconds'] < 3 * PRODUCE_SECONDS
+    assert profiles['collect']['seconds'] < 3 * DOUBLE_SECONDS
+
+
+def test_counts_items_in_and_out_of_each_stage():
+    # given
+    profiler = StageProfiler()
+
+    # when
+    run_profiled(profiler, produce, double, collect, total)
+
+    # then
+    assert [
+        (profile['name'], profile['calls'], profile['itemsIn'], profile['itemsOut'])
+        for profile in profiler.report()
+    ] == [
+        ('produce', 1, 1, 3),
+        ('double', 1, 3, 3),
+        ('collect', 1, 3, 3),
+        ('total', 1, 3, 1),
+    ]
+    profiles = stage_profiles(profiler)
+    assert sum(profiles['produce']['latencyHistogramMicroseconds'].values()) == 3
+    assert sum(profiles['total']['latencyHistogramMicroseconds'].values()) == 1
+
+
+def test_merges_reports_of_several_runs():
+    # given
+    first_profiler = StageProfiler()
+    run_profiled(first_profiler, produce, double, collect)
+    second_profiler = StageProfiler()
+    run_profiled(second_profiler, produce, collect, total)
+    first_report = first_profiler.report()
+    second_report = second_profiler.report()
+
+    # when
+    merged_report = merge_reports([first_report, second_report])
+
+    # then
+    merged_profiles = {profile['name']: profile for profile in merged_report}
+    assert list(merged_profiles) == ['produce', 'double', 'collect', 'total']
+    assert merged_profiles['produce']['calls'] == 2
+    assert merged_profiles['produce']['itemsOut'] == 6
+    assert merged_profiles['collect']['itemsIn'] == 6
+    assert merged_profiles['produce']['seconds'] == round(
+        first_report[0]['seconds'] + second_report[0]['seconds'], 6
+    )
+    assert sum(merged_profiles['produce']['latencyHistogramMicroseconds'].values()) == 6
+    assert merged_profiles['double'] == first_report[1]
+
+
+def test_writes_report_per_volume_worker_and_in_total(tmp_path):
+    # given
+    volume_reports = []
+    for volume, worker in [(2, 'Worker-2'), (1, 'Worker-1'), (3, 'Worker-1')]:
+        profiler = StageProfiler()
+        run_profiled(profiler, produce, collect)
+        volume_reports.append(
+            {'volume': volume, 'worker': worker, 'stages': profiler.report()}
+        )
+    report_file = tmp_path / 'profile.json'
+
+    # when
+    write_report(str(report_file), [], volume_reports)
+
+    # then
+    report = json.loads(report_file.read_text())
+    assert [volume_report['volume'] for volume_report in report['volumes']] == [1, 2, 3]
+    assert [
+        (worker_report['worker'], worker_report['stages'][0]['calls'])
+        for worker_report in report['workers']
+    ] == [('Worker-1', 2), ('Worker-2', 1)]
+    assert report['allVolumes'][0]['itemsOut'] == 9